@@ -0,0 +1,44 @@
+# Compares the time to get the materials of a synthetic 1000-volume tag list
+# from neutronics_material_maker directly and through the memoised
+# MaterialLibrary, the way build_materials does for models with hundreds of
+# casing_N volumes of the same steel.
+# Needs neutronics_material_maker installed.
+
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from neutronics_material_maker import Material
+from openmc_dagmc_wrapper import MaterialLibrary
+
+tags = [f"casing_{i}" for i in range(1000)]
+nmm_keys = {tag: "SS_316L_N_IG" if i % 4 else "eurofer" for i, tag in enumerate(tags)}
+
+start = time.perf_counter()
+for tag in tags:
+    Material.from_library(nmm_keys[tag]).openmc_material
+uncached = time.perf_counter() - start
+
+library = MaterialLibrary()
+start = time.perf_counter()
+for tag in tags:
+    library.get(nmm_keys[tag])
+cached = time.perf_counter() - start
+
+with TemporaryDirectory() as cache_dir:
+    MaterialLibrary(cache_dir=Path(cache_dir)).get("eurofer")
+    MaterialLibrary(cache_dir=Path(cache_dir)).get("SS_316L_N_IG")
+    # a new session reads the on-disk store and never calls nmm
+    start = time.perf_counter()
+    library = MaterialLibrary(cache_dir=Path(cache_dir))
+    for tag in tags:
+        library.get(nmm_keys[tag])
+    from_disk = time.perf_counter() - start
+
+print(f"{len(tags)} volumes, {len(set(nmm_keys.values()))} nmm keys")
+for label, seconds in (
+        ("nmm for every volume", uncached),
+        ("MaterialLibrary", cached),
+        ("on-disk store, new session", from_disk)):
+    print(f"{label:>26}: {seconds:.3f} s")
+print(f"speed-up: {uncached / cached:.1f}x")
@@ -0,0 +1,66 @@
+# Compares the figure of merit FOM = 1 / (R^2 T) of analog D1S runs with runs
+# using neutron weight windows and combined neutron + decay photon weight
+# windows. R is the median relative error of the photon dose over the voxels
+# that scored and T the transport time.
+# Needs the dagmc.h5m written by make_torus.py in the working directory.
+
+import openmc
+from openmc_dagmc_wrapper import OpenmcDagmcWrapper, compare_runs
+
+major_radius = 500
+
+wrapper = OpenmcDagmcWrapper(
+    cross_sections="/home/jon/nuclear_data/endf-b8.0-hdf5/cross_sections.xml",
+    chain_file="/home/jon/nuclear_data/chain-endf-b8.0.xml",
+)
+wrapper.load_dagmc_geometry()
+source = openmc.IndependentSource()
+source.space = openmc.stats.CylindricalIndependent(
+    r=openmc.stats.Discrete([major_radius], [1.0]),
+    phi=openmc.stats.Uniform(0, 2 * 3.14159265),
+    z=openmc.stats.Discrete([0], [1.0]),
+)
+source.energy = openmc.stats.Discrete([14.06e6], [1.0])
+wrapper.dt_source = source
+wrapper.build_materials(
+    dag_tag_to_material={
+        "first_wall": [("eurofer", 1.0)],
+        "center_column": [("eurofer", 1.0)],
+        "bioshield": [("concrete_ordinary", 1.0)],
+    }
+)
+
+ww_mesh = wrapper.get_full_mesh(cube_volume=50**3, name="ww_mesh")
+wrapper.generate_neutron_ww(
+    fuel="dt", mesh=ww_mesh, output_ww="neutron_weight_windows.h5")
+# the output file holds the neutron and the decay photon windows
+wrapper.generate_photon_ww(
+    fuel="dt",
+    mesh=ww_mesh,
+    output_ww="combined_weight_windows.h5",
+    neutron_weight_window="neutron_weight_windows.h5",
+)
+
+
+runs = {
+    "analog": None,
+    "neutron ww": "neutron_weight_windows.h5",
+    "neutron + photon ww": "combined_weight_windows.h5",
+}
+outputs = {}
+for label, weight_window in runs.items():
+    output = f"statepoint_d1s_{label.replace(' ', '_').replace('+', 'and')}.h5"
+    wrapper.simulate_d1s(
+        fuel="dt",
+        output=output,
+        particles=20_000,
+        batches=10,
+        tally_mesh=wrapper.get_full_mesh(cube_volume=50**3, name="dose"),
+        weight_window=weight_window,
+    )
+    outputs[label] = output
+
+# each run wrote its statistics to <output>.fom.json
+for label in ("neutron ww", "neutron + photon ww"):
+    print(f"\n{label} against analog")
+    print(compare_runs(outputs["analog"], outputs[label]))
@@ -0,0 +1,64 @@
+# Compares transport speed of simulate_on_mesh with one tally per
+# (score, particle) pair and with consolidate=True.
+# Needs the dagmc.h5m written by make_torus.py in the working directory.
+
+import openmc
+from openmc_dagmc_wrapper import OpenmcDagmcWrapper
+
+major_radius = 500
+
+wrapper = OpenmcDagmcWrapper(
+    cross_sections="/home/jon/nuclear_data/endf-b8.0-hdf5/cross_sections.xml",
+    chain_file="/home/jon/nuclear_data/chain-endf-b8.0.xml",
+)
+wrapper.load_dagmc_geometry()
+source = openmc.IndependentSource()
+source.space = openmc.stats.CylindricalIndependent(
+    r=openmc.stats.Discrete([major_radius], [1.0]),
+    phi=openmc.stats.Uniform(0, 2 * 3.14159265),
+    z=openmc.stats.Discrete([0], [1.0]),
+)
+source.energy = openmc.stats.Discrete([14.06e6], [1.0])
+wrapper.dt_source = source
+wrapper.build_materials(
+    dag_tag_to_material={
+        "first_wall": [("eurofer", 1.0)],
+        "center_column": [("eurofer", 1.0)],
+        "bioshield": [("concrete_ordinary", 1.0)],
+    }
+)
+
+tallies = [
+    ("flux", "neutron"),
+    ("flux", "photon"),
+    ("heating", "neutron"),
+    ("heating", "photon"),
+    ("dose", "neutron"),
+    ("dose", "photon"),
+]
+particles = 20_000
+batches = 10
+
+results = {}
+for consolidate in (False, True):
+    meshes = [
+        wrapper.get_full_mesh(cube_volume=50**3, name="full"),
+        wrapper.get_component_mesh("first_wall", cube_volume=20**3, name="first_wall"),
+    ]
+    output = f"statepoint_consolidate_{consolidate}.h5"
+    wrapper.simulate_on_mesh(
+        fuel="dt",
+        tally_meshes=meshes,
+        tallies=tallies,
+        output=output,
+        particles=particles,
+        batches=batches,
+        consolidate=consolidate,
+    )
+    with openmc.StatePoint(output) as sp:
+        results[consolidate] = particles * batches / sp.runtime["active batches"]
+
+for consolidate, rate in results.items():
+    label = "consolidated" if consolidate else "separate tallies"
+    print(f"{label:>18}: {rate:,.0f} particles/s")
+print(f"speed-up: {results[True] / results[False]:.2f}x")
@@ -1,3 +1,29 @@
 from openmc_dagmc_wrapper.core import OpenmcDagmcWrapper
+from openmc_dagmc_wrapper.corrected_tallies import CorrectedTallies
+from openmc_dagmc_wrapper.fom import compare_runs, run_statistics
+from openmc_dagmc_wrapper.h5m_index import DagmcIndex
+from openmc_dagmc_wrapper.material_library import MaterialLibrary
+from openmc_dagmc_wrapper.mgxs_cache import MgxsCache
+from openmc_dagmc_wrapper.planning import MeshPlan, RunPlan, plan_mesh
+from openmc_dagmc_wrapper.result_cache import ResultCache
+from openmc_dagmc_wrapper.runner import RunConfig, SimulationSpec
+from openmc_dagmc_wrapper.session import OpenmcSession
+from openmc_dagmc_wrapper.statepoints import merge_statepoints
 
-__all__ = ["OpenmcDagmcWrapper"]
+__all__ = [
+    "OpenmcDagmcWrapper",
+    "CorrectedTallies",
+    "DagmcIndex",
+    "MaterialLibrary",
+    "MgxsCache",
+    "MeshPlan",
+    "RunPlan",
+    "plan_mesh",
+    "ResultCache",
+    "RunConfig",
+    "SimulationSpec",
+    "OpenmcSession",
+    "merge_statepoints",
+    "run_statistics",
+    "compare_runs",
+]
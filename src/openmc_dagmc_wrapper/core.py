@@ -1,33 +1,67 @@
 from pathlib import Path
 import gc
-import copy
 import openmc
-from neutronics_material_maker import Material
-import openmc_source_plotter as osp
-import cadquery as cq
-import dagmc_h5m_file_inspector as di
+from openmc.mixin import IDWarning
 import re
-from openmc.deplete import d1s
 import numpy as np
 import numpy.ma as ma
-import shutil
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
 import os
-import h5py
-import zarr
-import matplotlib.pyplot as plt
-import matplotlib.collections as mcoll
-from matplotlib.colors import LogNorm, BoundaryNorm
-from matplotlib.patches import Patch
-from matplotlib.lines import Line2D
-import matplotlib as mpl
-
-mpl.rcParams['font.size'] = 16
-mpl.rcParams['axes.titlesize'] = 18
-mpl.rcParams['axes.labelsize'] = 16
-mpl.rcParams['legend.fontsize'] = 14
-mpl.rcParams['xtick.labelsize'] = 14
-mpl.rcParams['ytick.labelsize'] = 14
-mpl.rcParams['legend.title_fontsize'] = 16
+import shutil
+import tempfile
+import warnings
+import xml.etree.ElementTree as ET
+
+from openmc_dagmc_wrapper.corrected_tallies import (
+    CHUNK_VOXELS, CorrectedTallies, voxel_chunks)
+from openmc_dagmc_wrapper.h5m_index import DagmcIndex
+from openmc_dagmc_wrapper.fom import (
+    DEFAULT_REL_ERR_THRESHOLD, copy_run_statistics, write_run_statistics)
+from openmc_dagmc_wrapper.hashing import hash_inputs
+from openmc_dagmc_wrapper.material_library import MaterialLibrary, nmm_version
+from openmc_dagmc_wrapper.mgxs_cache import MgxsCache
+from openmc_dagmc_wrapper.planning import (
+    BYTES_PER_BIN_IN_MEMORY, BYTES_PER_BIN_ON_DISK, DEFAULT_POSTPROCESS_MEMORY_GB,
+    MeshPlan, RunPlan, coarsen_mesh, format_bytes, mpi_ranks, plan_mesh, postprocess_bytes,
+    tally_bins, tally_memory_bytes)
+from openmc_dagmc_wrapper.runner import (
+    CAMPAIGN_METHODS, DEFAULT_CALIBRATION_PARTICLES, PLAN_METHODS, QueuedRun,
+    RunConfig, SimulationSpec, checkpoint_dir, latest_statepoint, link_or_copy,
+    prepare_sandbox, resolve_restart_file, run_in_sandbox, seeded_sandbox)
+from openmc_dagmc_wrapper.result_cache import ResultCache
+from openmc_dagmc_wrapper.session import OpenmcSession
+from openmc_dagmc_wrapper.statepoints import merge_statepoints
+
+# Heavy optional imports (matplotlib, zarr, h5py, neutronics_material_maker,
+# openmc_source_plotter, openmc.deplete) are done
+# inside the methods that need them so that importing the package stays cheap
+# for post-processing jobs that never plot or build materials.
+
+_RC_PARAMS = {
+    'font.size': 16,
+    'axes.titlesize': 18,
+    'axes.labelsize': 16,
+    'legend.fontsize': 14,
+    'xtick.labelsize': 14,
+    'ytick.labelsize': 14,
+    'legend.title_fontsize': 16,
+}
+_rc_params_applied = False
+
+
+def _pyplot():
+    """Import matplotlib.pyplot on first use and apply the package rcParams.
+
+    The rcParams are only applied once so that any later changes made by the
+    user are not overwritten by subsequent plotting calls.
+    """
+    global _rc_params_applied
+    import matplotlib as mpl
+    import matplotlib.pyplot as plt
+    if not _rc_params_applied:
+        mpl.rcParams.update(_RC_PARAMS)
+        _rc_params_applied = True
+    return plt
 
 
 def format_sci(value: float) -> str:
@@ -140,12 +174,204 @@ def calculate_time_since_last_pulse(
     return time_since_last_pulse
 
 
+def get_mesh_tally(
+        statepoint: openmc.StatePoint,
+        score: str,
+        particle: str,
+        mesh_name: str) -> openmc.Tally:
+    """Return the results of one simulate_on_mesh (score, particle, mesh) tally.
+
+    Reads the '{score}_{particle}_on_{mesh_name}' tally, or slices the
+    'mesh_scores_{particle}_on_{mesh_name}' or 'mesh_scores_on_{mesh_name}'
+    tally written with consolidate=True.
+
+    Args:
+        statepoint: Open statepoint of a simulate_on_mesh run.
+        score: 'flux', 'heating' or 'dose'.
+        particle: 'neutron' or 'photon'.
+        mesh_name: Name of the tally mesh.
+
+    Returns:
+        A tally with the mesh filter and a single score.
+    """
+    openmc_score = "flux" if score in ("flux", "dose") else score
+    try:
+        tally = statepoint.get_tally(name=f"{score}_{particle}_on_{mesh_name}")
+    except LookupError:
+        if score == "dose":
+            raise
+        try:
+            tally = statepoint.get_tally(
+                name=f"mesh_scores_{particle}_on_{mesh_name}")
+        except LookupError:
+            tally = statepoint.get_tally(name=f"mesh_scores_on_{mesh_name}")
+        return tally.get_slice(
+            scores=[openmc_score],
+            filters=[openmc.ParticleFilter],
+            filter_bins=[(particle,)])
+    return tally.get_slice(scores=[openmc_score])
+
+
+def _weight_window_path(weight_window: str | Path) -> Path:
+    path = Path(weight_window)
+    if not path.is_file():
+        raise FileNotFoundError(f"Weight window file not found: {path}")
+    return path.resolve()
+
+
+_BASIS_AXES = {'xy': (0, 1, 2), 'xz': (0, 2, 1), 'yz': (1, 2, 0)}
+
+
+def mesh_bounds(mesh) -> tuple[np.ndarray, np.ndarray]:
+    """Return the Cartesian (lower_left, upper_right) corners of a mesh in cm.
+
+    Args:
+        mesh: openmc.RegularMesh or openmc.CylindricalMesh.
+
+    Returns:
+        Tuple of two length-3 arrays.
+    """
+    if isinstance(mesh, openmc.CylindricalMesh):
+        origin = np.asarray(mesh.origin, dtype=float)
+        r_max = float(mesh.r_grid[-1])
+        lower_left = origin + [-r_max, -r_max, float(mesh.z_grid[0])]
+        upper_right = origin + [r_max, r_max, float(mesh.z_grid[-1])]
+        return lower_left, upper_right
+    return np.asarray(mesh.lower_left, dtype=float), np.asarray(mesh.upper_right, dtype=float)
+
+
+def mesh_axis_names(mesh) -> list[str]:
+    """Names of the three mesh index axes, ['x', 'y', 'z'] or ['r', 'phi', 'z']."""
+    if isinstance(mesh, openmc.CylindricalMesh):
+        return ['r', 'phi', 'z']
+    return ['x', 'y', 'z']
+
+
+def mesh_indices_at(mesh, coords) -> tuple[int, int, int]:
+    """Return the voxel indices containing a Cartesian point.
+
+    Args:
+        mesh: openmc.RegularMesh or openmc.CylindricalMesh.
+        coords: (x, y, z) position in cm.
+
+    Returns:
+        Tuple of the three voxel indices.
+    """
+    if not isinstance(mesh, openmc.CylindricalMesh):
+        return tuple(int(i) for i in mesh.get_indices_at_coords(coords))
+
+    x, y, z = np.asarray(coords, dtype=float) - np.asarray(mesh.origin, dtype=float)
+    local = (np.hypot(x, y), np.mod(np.arctan2(y, x), 2 * np.pi), z)
+    indices = []
+    for value, grid in zip(local, (mesh.r_grid, mesh.phi_grid, mesh.z_grid)):
+        i = int(np.searchsorted(grid, value, side='right')) - 1
+        if not 0 <= i < len(grid) - 1:
+            raise ValueError(f"Point {tuple(coords)} is outside the mesh {mesh.name!r}")
+        indices.append(i)
+    return tuple(indices)
+
+
+def mesh_slice(mesh, data: np.ndarray, basis: str, n_pixels: int = 500):
+    """Take a 2D slice of per-voxel mesh data for plotting.
+
+    RegularMesh data is sliced at the voxel layer nearest 0 along the axis
+    normal to basis. CylindricalMesh data is resampled onto a Cartesian
+    pixel grid in the plane through 0, so 'xz' and 'yz' show the R-Z
+    cross-section on both sides of the mesh axis and 'xy' shows the r-phi
+    plane. Pixels outside the cylindrical mesh are NaN.
+
+    Args:
+        mesh: openmc.RegularMesh or openmc.CylindricalMesh.
+        data: Array with one value per voxel, shape mesh.dimension.
+        basis: 'xy', 'xz' or 'yz'.
+        n_pixels: Pixels along the longer side of a resampled cylindrical
+            slice.
+
+    Returns:
+        Tuple of (data_2d, extent, position). data_2d is indexed
+        [horizontal, vertical], extent is [h_min, h_max, v_min, v_max] in cm
+        and position is the coordinate of the slice along the normal axis.
+    """
+    voxels, extent, position = mesh_slice_voxels(mesh, basis, n_pixels)
+    data = np.asarray(data).reshape(tuple(mesh.dimension)).ravel()
+    inside = voxels >= 0
+    if inside.all():
+        return data[voxels], extent, position
+    data_2d = np.full(voxels.shape, np.nan)
+    data_2d[inside] = data[voxels[inside]]
+    return data_2d, extent, position
+
+
+def mesh_slice_voxels(mesh, basis: str, n_pixels: int = 500):
+    """Flat voxel index of every pixel of the mesh_slice of a mesh.
+
+    Lets callers read only the voxels a slice shows, e.g. with
+    CorrectedTallies.timestep, instead of a whole timestep.
+
+    Args:
+        mesh: openmc.RegularMesh or openmc.CylindricalMesh.
+        basis: 'xy', 'xz' or 'yz'.
+        n_pixels: Pixels along the longer side of a resampled cylindrical
+            slice.
+
+    Returns:
+        Tuple of (voxels, extent, position) as for mesh_slice, voxels being
+        an integer array indexed [horizontal, vertical] of C-order indices
+        into data of shape mesh.dimension, -1 for pixels outside the mesh.
+    """
+    if basis not in _BASIS_AXES:
+        raise ValueError(f"basis must be 'xy', 'xz', or 'yz', got '{basis}'")
+    h, v, normal = _BASIS_AXES[basis]
+    lower_left, upper_right = mesh_bounds(mesh)
+    extent = [lower_left[h], upper_right[h], lower_left[v], upper_right[v]]
+    dimension = tuple(mesh.dimension)
+
+    if not isinstance(mesh, openmc.CylindricalMesh):
+        n = dimension[normal]
+        edges = np.linspace(lower_left[normal], upper_right[normal], n + 1)
+        centres = (edges[:-1] + edges[1:]) / 2
+        index = int(np.abs(centres).argmin())
+        voxels = np.take(
+            np.arange(int(np.prod(dimension))).reshape(dimension), index, axis=normal)
+        return voxels, extent, float(centres[index])
+
+    widths = (extent[1] - extent[0], extent[3] - extent[2])
+    pixel = max(widths) / n_pixels
+    h_edges = np.linspace(extent[0], extent[1], max(1, round(widths[0] / pixel)) + 1)
+    v_edges = np.linspace(extent[2], extent[3], max(1, round(widths[1] / pixel)) + 1)
+    hh, vv = np.meshgrid(
+        (h_edges[:-1] + h_edges[1:]) / 2,
+        (v_edges[:-1] + v_edges[1:]) / 2,
+        indexing='ij')
+
+    points = [np.zeros_like(hh) for _ in range(3)]
+    points[h], points[v] = hh, vv
+    x, y, z = (p - o for p, o in zip(points, mesh.origin))
+    local = (np.hypot(x, y), np.mod(np.arctan2(y, x), 2 * np.pi), z)
+
+    inside = np.ones(hh.shape, dtype=bool)
+    indices = []
+    for value, grid in zip(local, (mesh.r_grid, mesh.phi_grid, mesh.z_grid)):
+        i = np.searchsorted(grid, value, side='right') - 1
+        inside &= (i >= 0) & (i < len(grid) - 1)
+        indices.append(np.clip(i, 0, len(grid) - 2))
+
+    voxels = np.full(hh.shape, -1, dtype=np.int64)
+    voxels[inside] = np.ravel_multi_index(
+        tuple(i[inside] for i in indices), dimension)
+    return voxels, extent, 0.0
+
+
 class OpenmcDagmcWrapper:
     def __init__(
             self,
             cross_sections: str | Path,
             chain_file: str | Path,
-            material_map: dict | None = None):
+            material_map: dict | None = None,
+            material_cache_dir: str | Path | None = None,
+            run_config: RunConfig | None = None,
+            result_cache: ResultCache | None = None,
+            mgxs_cache_dir: str | Path | None = None):
         """Initialise the wrapper and set OpenMC global config paths.
 
         Args:
@@ -155,27 +381,113 @@ class OpenmcDagmcWrapper:
                 library keys. E.g. {'eurofer_97': 'eurofer', 'iron': 'Iron'}.
                 If a material name is not in the map, it is used directly as
                 the nmm library key.
+            material_cache_dir: Optional directory where nmm material
+                compositions are stored so that later sessions do not call
+                neutronics_material_maker again.
+            run_config: Default threads, MPI launcher and OpenMC executable
+                for every simulation. Can be changed later via
+                self.run_config.
+            result_cache: Optional ResultCache. Simulations whose model,
+                DAGMC file, cross sections and OpenMC version match a
+                cached run reuse its result instead of running again.
+            mgxs_cache_dir: Optional directory where generate_neutron_ww
+                stores multigroup cross sections per material composition,
+                so only new or changed materials are regenerated.
         """
         self.cross_sections = cross_sections
         self.chain_file = chain_file
-        openmc.config["cross_sections"] = str(cross_sections)
-        openmc.config["chain_file"] = str(chain_file)
+        # absolute paths so runs in sandbox directories find the data
+        openmc.config["cross_sections"] = str(Path(cross_sections).resolve())
+        openmc.config["chain_file"] = str(Path(chain_file).resolve())
         self.dagmc_filepath = 'dagmc.h5m'
         self.dd_source: openmc.Source = None
         self.dt_source: openmc.Source = None
         self.materials: openmc.Materials = None
         self.neutron_weight_windows = None
+        self.photon_weight_windows = None
         self.tungsten_armour_thickness = 0.02  # cm
         self.geometry = None
         # keyed by (mesh_name, basis)
         self._outline_cache: dict[tuple, list] = {}
         self.material_map: dict = material_map if material_map is not None else {}
+        self._dagmc_index: DagmcIndex | None = None
+        self.material_library = MaterialLibrary(cache_dir=material_cache_dir)
+        # shared DAGMCUniverse keyed by (path, size, mtime) of the h5m file
+        self._dagmc_universe: openmc.DAGMCUniverse | None = None
+        self._dagmc_universe_key: tuple | None = None
+        self._dagmc_material_names: list[str] | None = None
+        # bounding box of the geometry object it was computed from
+        self._bounding_box: openmc.BoundingBox | None = None
+        self._bounding_box_geometry: openmc.Geometry | None = None
+        self.run_config: RunConfig = run_config if run_config is not None else RunConfig()
+        self.result_cache: ResultCache | None = result_cache
+        self.mgxs_cache: MgxsCache | None = (
+            MgxsCache(mgxs_cache_dir) if mgxs_cache_dir is not None else None)
+        # relative error counted as converged in the run statistics
+        self.rel_err_threshold: float = DEFAULT_REL_ERR_THRESHOLD
+        # runs collected by run_campaign
+        self._queued_runs: list[QueuedRun] | None = None
+        # run plans collected by plan
+        self._planning: dict | None = None
+
+    @property
+    def dagmc_index(self) -> DagmcIndex:
+        """Per-volume metadata index of self.dagmc_filepath.
+
+        Built (or loaded from '<dagmc_filepath>.index.json') on first access
+        and rebuilt only when dagmc_filepath or the file on disk changes.
+        """
+        index = self._dagmc_index
+        if (
+            index is None
+            or index.filename != Path(self.dagmc_filepath)
+            or not index.is_current()
+        ):
+            index = DagmcIndex.load(self.dagmc_filepath)
+            self._dagmc_index = index
+        return index
+
+    @property
+    def dagmc_universe(self) -> openmc.DAGMCUniverse:
+        """DAGMCUniverse for self.dagmc_filepath shared by all wrapper methods.
+
+        Created on first access and recreated only when dagmc_filepath or the
+        file on disk (size or mtime) changes.
+        """
+        path = Path(self.dagmc_filepath)
+        stat = path.stat()
+        key = (path, stat.st_size, stat.st_mtime_ns)
+        if self._dagmc_universe is None or self._dagmc_universe_key != key:
+            # absolute so exported models run from any directory
+            self._dagmc_universe = openmc.DAGMCUniverse(
+                filename=str(path.resolve()),
+                auto_geom_ids=True)
+            self._dagmc_universe_key = key
+            self._dagmc_material_names = None
+        return self._dagmc_universe
+
+    @property
+    def dagmc_material_names(self) -> list[str]:
+        """Material tags of the shared DAGMCUniverse, read from the h5m once."""
+        universe = self.dagmc_universe
+        if self._dagmc_material_names is None:
+            self._dagmc_material_names = list(universe.material_names)
+        return self._dagmc_material_names
+
+    @property
+    def bounding_box(self) -> openmc.BoundingBox:
+        """Bounding box of self.geometry, computed once per loaded geometry."""
+        if self.geometry is None:
+            raise ValueError(
+                "No geometry loaded, call load_dagmc_geometry first")
+        if self._bounding_box_geometry is not self.geometry:
+            self._bounding_box = self.geometry.bounding_box
+            self._bounding_box_geometry = self.geometry
+        return self._bounding_box
 
     def load_dagmc_geometry(self):
         """Load the DAGMC h5m file into an OpenMC Geometry and store it on self.geometry."""
-        root = openmc.DAGMCUniverse(
-            filename=self.dagmc_filepath,
-            auto_geom_ids=True)
+        root = self.dagmc_universe
 
         dag_universe = root.bounded_universe(padding_distance=500)
 
@@ -221,6 +533,8 @@ class OpenmcDagmcWrapper:
             raise ValueError(
                 f'source {source_type} not recognized, must be "dd" or "dt"')
 
+        import openmc_source_plotter as osp
+
         fig = osp.plot_source_position(this=source_to_plot, n_samples=5_000)
         fig.update_layout(
             scene=dict(
@@ -253,6 +567,10 @@ class OpenmcDagmcWrapper:
             removed_mat_names: Optional set of material base names to exclude
                 from plots and legends. Defaults to {}.
         """
+        from matplotlib.patches import Patch
+        from matplotlib.lines import Line2D
+        plt = _pyplot()
+
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -283,7 +601,7 @@ class OpenmcDagmcWrapper:
             geometry=self.geometry,
             materials=self.materials,
             settings=settings)
-        bb = model.bounding_box
+        bb = self.bounding_box
 
         views = [
             ("xy", (0, 0, 0), None, "geometry_xy.png"),
@@ -389,7 +707,9 @@ class OpenmcDagmcWrapper:
 
         Looks up material_name in the user-provided material_map (which maps
         local names to nmm library keys). If no mapping exists, falls back to
-        using material_name directly as an nmm library key.
+        using material_name directly as an nmm library key. Compositions are
+        memoised in self.material_library, so each key is only built by nmm
+        once and every call returns a fresh clone.
 
         Args:
             material_name: Material name to look up.
@@ -402,7 +722,7 @@ class OpenmcDagmcWrapper:
         """
         nmm_key = self.material_map.get(material_name, material_name)
         try:
-            new_mat = Material.from_library(nmm_key).openmc_material
+            new_mat = self.material_library.get(nmm_key)
         except KeyError:
             raise ValueError(
                 f"Material '{material_name}' (nmm key '{nmm_key}') not found "
@@ -426,12 +746,11 @@ class OpenmcDagmcWrapper:
         Returns:
             An openmc.Material mixing the steel and tungsten by volume fraction.
         """
-        surface_areas = di.get_surface_area_by_material_name(
-            self.dagmc_filepath, material="first_wall"
-        )
+        index = self.dagmc_index
+        surface_areas = index.surface_areas_by_material_name("first_wall")
         tungsten_volume = self.tungsten_armour_thickness * min(surface_areas)
 
-        volumes = di.get_volumes_from_h5m_by_material_name(self.dagmc_filepath)
+        volumes = index.volumes_by_material_name()
         fw_vols = {
             k: v for k, v in volumes.items()
             if re.sub(r'_\d+$', '', k) == 'first_wall'
@@ -455,12 +774,16 @@ class OpenmcDagmcWrapper:
         mat.name = f"{steel_name}_with_tungsten_armour"
         return mat
 
-    def build_materials(self, dag_tag_to_material: dict):
+    def build_materials(
+            self,
+            dag_tag_to_material: dict,
+            snapshot_dir: str | Path | None = None):
         """Build OpenMC Materials from DAGMC geometry tags and material recipes.
 
         Reads volume information from the DAGMC h5m file and creates materials
         (single or mixed) for every DAGMC volume, assigning them to
-        self.materials.
+        self.materials. Each distinct recipe is mixed once and cloned per
+        volume.
 
         Args:
             dag_tag_to_material: Mapping from DAGMC material tag base name
@@ -475,14 +798,55 @@ class OpenmcDagmcWrapper:
                             ("cryogenic_copper", 0.211),
                         ],
                     }
+
+            snapshot_dir: Optional directory for materials XML snapshots.
+                The snapshot is keyed by a hash of dag_tag_to_material,
+                self.material_map, self.tungsten_armour_thickness, the nmm
+                version and the h5m file hash. If a matching snapshot exists
+                it is loaded instead of rebuilding the materials, with new
+                material ids so they cannot clash with materials already
+                made in this session. Otherwise the built materials are
+                written to it.
         """
-        root = openmc.DAGMCUniverse(
-            filename=self.dagmc_filepath,
-            auto_geom_ids=True)
-        volumes_by_dag_tag = di.get_volumes_from_h5m_by_material_name(
-            self.dagmc_filepath)
+        snapshot_path = None
+        if snapshot_dir is not None:
+            snapshot_key = hash_inputs({
+                'dag_tag_to_material': dag_tag_to_material,
+                'material_map': self.material_map,
+                'tungsten_armour_thickness': self.tungsten_armour_thickness,
+                'nmm_version': nmm_version(),
+                'dagmc_sha256': self.dagmc_index.sha256,
+            })
+            snapshot_path = Path(snapshot_dir) / f'materials_{snapshot_key[:16]}.xml'
+            if snapshot_path.is_file():
+                with warnings.catch_warnings():
+                    # the snapshot ids may already be taken in this session,
+                    # the loaded materials are only used to make clones
+                    warnings.simplefilter('ignore', IDWarning)
+                    loaded = openmc.Materials.from_xml(snapshot_path)
+                self.materials = openmc.Materials(mat.clone() for mat in loaded)
+                print(f'loaded materials snapshot {snapshot_path}')
+                return
+
+        volumes_by_dag_tag = self.dagmc_index.volumes_by_material_name()
+
+        # Each distinct recipe (and each tungsten armour mix) is built once,
+        # every DAGMC volume then gets its own clone so it stays a separate
+        # depletable material with its own volume.
+        armour_materials: dict[str, openmc.Material] = {}
+        recipe_materials: dict[tuple, openmc.Material] = {}
+
+        def component_material(name: str) -> openmc.Material:
+            if name.endswith('_with_tungsten_armour'):
+                steel_name = name.removesuffix('_with_tungsten_armour')
+                if steel_name not in armour_materials:
+                    armour_materials[steel_name] = self.make_tungsten_armour_material(
+                        steel_name)
+                return armour_materials[steel_name]
+            return self.get_material(name)
+
         materials = openmc.Materials()
-        for mat_name in root.material_names:
+        for mat_name in self.dagmc_material_names:
 
             mat_name_base = re.sub(r'_\d+$', '', mat_name)
 
@@ -490,26 +854,24 @@ class OpenmcDagmcWrapper:
                 raise ValueError(f'Unknown mat_name: {mat_name}')
 
             material_components = dag_tag_to_material[mat_name_base]
-            if len(material_components) == 1:
-                name = material_components[0][0]
-                if name.endswith('_with_tungsten_armour'):
-                    steel_name = name.removesuffix('_with_tungsten_armour')
-                    mat = self.make_tungsten_armour_material(steel_name)
+            recipe = tuple(tuple(comp) for comp in material_components)
+            recipe_mat = recipe_materials.get(recipe)
+            if recipe_mat is None:
+                if len(material_components) == 1:
+                    recipe_mat = component_material(material_components[0][0])
                 else:
-                    mat = self.get_material(name)
-            else:
-                multi_materials = [
-                    self.make_tungsten_armour_material(comp[0].removesuffix('_with_tungsten_armour'))
-                    if comp[0].endswith('_with_tungsten_armour')
-                    else self.get_material(comp[0])
-                    for comp in material_components
-                ]
-                fracs = [comp[1] for comp in material_components]
-                mat = openmc.Material.mix_materials(
-                    materials=multi_materials,
-                    fracs=fracs,
-                    percent_type='vo'
-                )
+                    multi_materials = [
+                        component_material(comp[0]) for comp in material_components
+                    ]
+                    fracs = [comp[1] for comp in material_components]
+                    recipe_mat = openmc.Material.mix_materials(
+                        materials=multi_materials,
+                        fracs=fracs,
+                        percent_type='vo'
+                    )
+                recipe_materials[recipe] = recipe_mat
+
+            mat = recipe_mat.clone()
             mat.volume = volumes_by_dag_tag[mat_name]
             mat.name = mat_name
             mat.depletable = True
@@ -517,6 +879,528 @@ class OpenmcDagmcWrapper:
             materials.append(mat)
         self.materials = materials
 
+        if snapshot_path is not None:
+            snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            # export to a unique temporary name then rename so concurrent
+            # jobs never read a partially written snapshot
+            with tempfile.NamedTemporaryFile(
+                    dir=snapshot_path.parent, prefix=f'.{snapshot_path.stem}.',
+                    suffix='.xml', delete=False) as tmp:
+                tmp_path = Path(tmp.name)
+            try:
+                materials.export_to_xml(tmp_path)
+                os.replace(tmp_path, snapshot_path)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            print(f'saved materials snapshot {snapshot_path}')
+
+    def _run_model(
+            self,
+            model: openmc.Model,
+            output: str | Path,
+            result: str = "statepoint",
+            threads: int | None = None,
+            mpi_args: list[str] | None = None,
+            checkpoint_interval: int | None = None,
+            resume_from: str | Path | None = None) -> Path:
+        """Run a model in its own temporary directory and move one file out.
+
+        The model is exported to model.xml in a fresh directory next to
+        output and OpenMC runs there as a subprocess, so concurrent runs
+        never see each other's files and the process working directory is
+        never changed. Only the requested result is moved, atomically, to
+        output and the directory is then removed. Inside run_campaign the
+        run is queued instead of executed.
+
+        With checkpoint_interval the run uses the fixed directory
+        '<output>.run' instead, writes a statepoint there every
+        checkpoint_interval batches and keeps it if the run fails. A run
+        that does not resume from that directory is refused while it holds
+        checkpoints.
+
+        With self.result_cache set, a cached result of an identical model is
+        copied to output instead of running, and new results are stored.
+
+        Relative error statistics and figures of merit of a new or cached
+        statepoint are written next to it as '<output>.fom.json' (see
+        fom.run_statistics and compare_runs).
+
+        Args:
+            model: The model to run.
+            output: Path the result is moved to.
+            result: 'statepoint' for the final statepoint file, or the name
+                of another file OpenMC writes (e.g. 'weight_windows.h5').
+            threads: Overrides self.run_config.threads for this run.
+            mpi_args: Overrides self.run_config.mpi_args for this run.
+            checkpoint_interval: Write a checkpoint statepoint every this
+                many batches.
+            resume_from: Statepoint, or run directory whose latest
+                statepoint is used, to restart the run from. The model must
+                be built with the same arguments as the interrupted run.
+
+        Returns:
+            The output path.
+        """
+        run_config = self.run_config.with_overrides(
+            threads=threads, mpi_args=mpi_args)
+
+        if self._planning is not None:
+            self._planning["plans"].append(self._plan_run(
+                model, output, run_config,
+                self._planning["calibration_particles"],
+                self._planning["n_fuels"], self._planning["max_memory_gb"]))
+            return Path(output)
+
+        restart_file = None
+        if resume_from is not None:
+            restart_file = resolve_restart_file(resume_from)
+
+        # keyed before checkpoint settings are added, they do not change results
+        cache_key = cache_inputs = None
+        if self.result_cache is not None:
+            cache_key, cache_inputs = self.result_cache.key(
+                model, self.dagmc_index.sha256, result)
+
+        run_dir = None
+        if checkpoint_interval is not None:
+            if checkpoint_interval < 1:
+                raise ValueError(
+                    f"checkpoint_interval must be at least 1, got {checkpoint_interval}")
+            settings = model.settings
+            last_batch = settings.batches
+            if settings.trigger_active:
+                last_batch = max(last_batch, settings.trigger_max_batches)
+            settings.statepoint = {"batches": list(
+                range(checkpoint_interval, last_batch + 1, checkpoint_interval))}
+            run_dir = checkpoint_dir(output)
+            # the highest batch statepoint in run_dir becomes the result, so
+            # a new run must not start next to an earlier run's checkpoints
+            resuming_here = (
+                restart_file is not None
+                and restart_file.parent == run_dir.resolve())
+            if not resuming_here and latest_statepoint(run_dir) is not None:
+                raise ValueError(
+                    f"{run_dir} holds checkpoints of an earlier run. Pass "
+                    f"resume_from='{run_dir}' to continue it, or remove the "
+                    "directory to start again")
+
+        run = QueuedRun(
+            sandbox=None, output=Path(output), result=result,
+            run_config=run_config, restart_file=restart_file,
+            persistent=run_dir is not None,
+            cache_key=cache_key, cache_inputs=cache_inputs)
+        if cache_key is not None and restart_file is None:
+            if self.result_cache.fetch(cache_key, output):
+                # the output may hold statistics of an earlier, different run
+                if result == "statepoint":
+                    self._write_run_statistics(output)
+                if self._queued_runs is not None:
+                    self._queued_runs.append(run)
+                return Path(output)
+
+        budgets = (
+            run_config.ram_budget_gb, run_config.disk_budget_gb,
+            run_config.walltime_budget_hours)
+        if any(b is not None for b in budgets):
+            calibration_particles = None
+            if run_config.walltime_budget_hours is not None:
+                calibration_particles = DEFAULT_CALIBRATION_PARTICLES
+            # calibrates only if the RAM and disk estimates pass
+            plan = self._plan_run(model, output, run_config, calibration_particles)
+            print(plan)
+            run_config.check_budgets(plan)
+
+        run.sandbox = prepare_sandbox(model, output, run_dir)
+        if self._queued_runs is not None:
+            self._queued_runs.append(run)
+            print(f"Queued {output}")
+            return Path(output)
+        run_in_sandbox(
+            run.sandbox, output, result, run_config, restart_file,
+            keep_on_failure=run.persistent)
+        self._store_result(run)
+        return Path(output)
+
+    def _plan_run(
+            self,
+            model: openmc.Model,
+            output: str | Path,
+            run_config: RunConfig,
+            calibration_particles: int | None = None,
+            n_fuels: int = 1,
+            max_memory_gb: float = DEFAULT_POSTPROCESS_MEMORY_GB) -> RunPlan:
+        """Estimate the memory, disk and (optionally) run time of a model.
+
+        The memory and disk estimates need no run. The calibration run
+        allocates the full tallies and writes a statepoint, so it is
+        skipped when those estimates already exceed the run_config
+        budgets.
+
+        Args:
+            model: The model to run.
+            output: Statepoint path of the run.
+            run_config: Launch settings and budgets, the MPI rank count is
+                read from run_config.mpi_args.
+            calibration_particles: If set, a one-batch run with this many
+                particles measures the transport rate and start-up time.
+            n_fuels: Number of D1S statepoints combined in post-processing.
+            max_memory_gb: max_memory_gb of correct_tallies_native.
+
+        Returns:
+            The RunPlan.
+        """
+        tallies = list(model.tallies or [])
+        n_bins = sum(tally_bins(t) for t in tallies)
+        d1s = any(
+            isinstance(f, openmc.ParentNuclideFilter)
+            for t in tallies for f in t.filters)
+        n_ranks = mpi_ranks(run_config.mpi_args)
+        tally_bytes = n_bins * BYTES_PER_BIN_IN_MEMORY
+        statepoint_bytes = n_bins * BYTES_PER_BIN_ON_DISK
+
+        settings = model.settings
+        batches = settings.batches
+        if settings.trigger_active:
+            batches = max(batches, settings.trigger_max_batches)
+
+        plan = RunPlan(
+            output=str(output),
+            n_bins=n_bins,
+            n_ranks=n_ranks,
+            tally_bytes=tally_bytes,
+            peak_ram_bytes=n_ranks * tally_bytes
+            + (statepoint_bytes if n_ranks > 1 else 0),
+            statepoint_bytes=statepoint_bytes,
+            postprocess_bytes=postprocess_bytes(n_bins, d1s, n_fuels, max_memory_gb),
+            particles=settings.particles * batches,
+        )
+        if calibration_particles is not None:
+            try:
+                run_config.check_budgets(plan)
+            except ValueError as e:
+                print(f"Skipping calibration run: {e}")
+                return plan
+            plan.particles_per_second, plan.init_seconds = self._calibrate(
+                model, output, run_config, calibration_particles)
+        return plan
+
+    def _calibrate(
+            self,
+            model: openmc.Model,
+            output: str | Path,
+            run_config: RunConfig,
+            particles: int) -> tuple[float, float]:
+        """Run one short batch of a model and return (particles/s, init seconds).
+
+        The run goes in a temporary directory next to output, like the
+        sandbox of the real run. The model settings are restored afterwards.
+        """
+        settings = model.settings
+        saved = (settings.particles, settings.batches, settings.statepoint)
+        triggers_on = bool(settings.trigger_active)
+        settings.particles = particles
+        settings.batches = 1
+        settings.statepoint = {}
+        if triggers_on:
+            settings.trigger_active = False
+
+        output_dir = Path(output).parent
+        output_dir.mkdir(parents=True, exist_ok=True)
+        calibration_dir = Path(
+            tempfile.mkdtemp(prefix=".openmc_calibrate_", dir=output_dir))
+        try:
+            print(f"Calibration run with {particles:,} particles ...")
+            calibration_output = calibration_dir / "calibration.h5"
+            sandbox = prepare_sandbox(model, calibration_output)
+            run_in_sandbox(sandbox, calibration_output, run_config=run_config)
+            with openmc.StatePoint(calibration_output) as sp:
+                runtime = sp.runtime
+        finally:
+            shutil.rmtree(calibration_dir, ignore_errors=True)
+            settings.particles, settings.batches, settings.statepoint = saved
+            if triggers_on:
+                settings.trigger_active = True
+
+        return (
+            particles / runtime["active batches"],
+            runtime["total initialization"])
+
+    def plan(
+            self,
+            method: str,
+            calibrate: bool = False,
+            calibration_particles: int = DEFAULT_CALIBRATION_PARTICLES,
+            n_fuels: int = 1,
+            max_memory_gb: float = DEFAULT_POSTPROCESS_MEMORY_GB,
+            **kwargs) -> list[RunPlan]:
+        """Estimate the resources of a simulate_* call without running it.
+
+        The model is built exactly as simulate_<method>(**kwargs) would
+        build it (including auto_coarsen), then the tally memory per MPI
+        rank and in total, statepoint size and post-processing RAM are
+        reported. With calibrate=True a one-batch run measures the
+        transport rate to estimate the run time, unless the memory or disk
+        estimates are already over the self.run_config budgets.
+
+        Args:
+            method: 'instant_dose', 'on_mesh', 'fused' or 'd1s'.
+            calibrate: Run a short calibration to estimate the run time.
+            calibration_particles: Particles in the calibration batch.
+            n_fuels: Number of D1S statepoints that correct_tallies_native
+                will combine, for the post-processing estimate.
+            max_memory_gb: max_memory_gb that correct_tallies_native will
+                use, for the post-processing estimate.
+            **kwargs: Arguments for simulate_<method>.
+
+        Returns:
+            A RunPlan per OpenMC run the call would make. Plans over the
+            self.run_config budgets are reported with a warning, the
+            actual simulate_* call would refuse them.
+        """
+        if method not in PLAN_METHODS:
+            raise ValueError(
+                f"method must be one of {PLAN_METHODS}, got '{method}'")
+
+        self._planning = {
+            "plans": [],
+            "calibration_particles": calibration_particles if calibrate else None,
+            "n_fuels": n_fuels,
+            "max_memory_gb": max_memory_gb,
+        }
+        try:
+            getattr(self, f"simulate_{method}")(**kwargs)
+            plans = self._planning["plans"]
+        finally:
+            self._planning = None
+
+        run_config = self.run_config.with_overrides(mpi_args=kwargs.get("mpi_args"))
+        for run_plan in plans:
+            print(run_plan)
+            try:
+                run_config.check_budgets(run_plan)
+            except ValueError as e:
+                print(f"WARNING: {e}")
+        return plans
+
+    def _store_result(self, run: QueuedRun):
+        """Record statistics of a finished run and add it to self.result_cache, if any."""
+        if run.result == "statepoint":
+            self._write_run_statistics(run.output)
+        if self.result_cache is not None and run.cache_key is not None:
+            self.result_cache.store(run.cache_key, run.output, run.cache_inputs)
+
+    def _write_run_statistics(self, statepoint: str | Path):
+        """Write '<statepoint>.fom.json', see fom.run_statistics."""
+        try:
+            path = write_run_statistics(statepoint, self.rel_err_threshold)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"WARNING: could not write run statistics of {statepoint}: {e}")
+            return
+        print(f"Run statistics saved to {path}")
+
+    def run_campaign(
+            self,
+            specs: list[SimulationSpec],
+            max_workers: int | None = None,
+            threads: int | None = None,
+            executor: Executor | None = None):
+        """Run a batch of simulations concurrently, e.g. DD and DT side by side.
+
+        Every model is built and exported in this process first, one spec at
+        a time, then the OpenMC runs are shared out over a process pool.
+        This is a generator: iterate over it to run the campaign. If a run
+        fails or iteration stops early, the runs that have not started are
+        cancelled and their sandboxes removed.
+
+        Args:
+            specs: SimulationSpec per job, e.g.
+                SimulationSpec('d1s', dict(fuel='dt', output='d1s_dt.h5', ...)).
+            max_workers: Number of simultaneous OpenMC runs. Defaults to the
+                number of specs.
+            threads: OpenMP threads per job for specs that set neither
+                SimulationSpec.threads nor a threads argument of their
+                runner, overriding self.run_config.threads. Defaults to
+                self.run_config.threads, else the node's cores divided by
+                max_workers.
+            executor: Optional concurrent.futures executor to use instead of
+                a new ProcessPoolExecutor.
+
+        Yields:
+            (spec, statepoint_path) tuples in the order the jobs finish.
+        """
+        for spec in specs:
+            if spec.method not in CAMPAIGN_METHODS:
+                raise ValueError(
+                    f"method must be one of {CAMPAIGN_METHODS}, got '{spec.method}'")
+
+        self._queued_runs = []
+        jobs = []
+        try:
+            for spec in specs:
+                n_queued = len(self._queued_runs)
+                getattr(self, f"simulate_{spec.method}")(**spec.kwargs)
+                jobs.extend((spec, run) for run in self._queued_runs[n_queued:])
+        except BaseException:
+            for run in self._queued_runs:
+                run.discard()
+            raise
+        finally:
+            self._queued_runs = None
+
+        outputs = [run.output.resolve() for _, run in jobs]
+        dupes = {str(o) for o in outputs if outputs.count(o) > 1}
+        if dupes:
+            for _, run in jobs:
+                run.discard()
+            raise ValueError(f"Several specs write the same output: {dupes}")
+
+        # results already taken from the result cache
+        cached = [(spec, run) for spec, run in jobs if run.sandbox is None]
+        jobs = [(spec, run) for spec, run in jobs if run.sandbox is not None]
+
+        max_workers = max_workers or max(1, len(jobs))
+        default_threads = max(1, (os.cpu_count() or 1) // max_workers)
+
+        owns_executor = executor is None
+        if owns_executor:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+        futures = {}
+        try:
+            for spec, run in jobs:
+                job_threads = (
+                    spec.threads or spec.kwargs.get("threads") or threads
+                    or run.run_config.threads or default_threads)
+                future = executor.submit(
+                    run_in_sandbox, run.sandbox, run.output, run.result,
+                    run.run_config.with_overrides(threads=job_threads),
+                    run.restart_file, run.persistent)
+                futures[future] = (spec, run)
+            print(
+                f"Running {len(futures)} simulations, {max_workers} at a time ...")
+            for spec, run in cached:
+                yield spec, run.output
+            for future in as_completed(futures):
+                spec, run = futures[future]
+                output = future.result()
+                self._store_result(run)
+                yield spec, output
+        finally:
+            for future, (_, run) in futures.items():
+                # queued runs that never started leave their sandbox behind
+                if future.cancel():
+                    run.discard()
+            if owns_executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    def run_split(
+            self,
+            method: str,
+            n_runs: int,
+            seed: int = 1,
+            max_workers: int | None = None,
+            threads: int | None = None,
+            executor: Executor | None = None,
+            keep_parts: bool = False,
+            **kwargs) -> Path:
+        """Split one simulation into independent runs with different seeds.
+
+        The model is built once by simulate_<method>(**kwargs) and run
+        n_runs times with seeds seed, seed + 1, ... Each run has the
+        particles and batches given in kwargs. The statepoints are merged
+        with merge_statepoints into the runner's output, which then holds
+        n_runs times the batches of one run and is read like any other
+        statepoint (correct_tallies_native, plot_dose_born_from_maps,
+        find_dominant_nuclides).
+
+        Runs go to a local ProcessPoolExecutor by default. Any executor
+        with a concurrent.futures style submit, e.g. one that submits to a
+        cluster scheduler, can be passed instead. Its workers must see the
+        output directory, where the run directories are created.
+
+        Args:
+            method: 'instant_dose', 'on_mesh' or 'd1s'.
+            n_runs: Number of independent runs.
+            seed: Seed of the first run.
+            max_workers: Simultaneous runs of the local pool. Defaults to
+                n_runs.
+            threads: OpenMP threads per run. Defaults to self.run_config
+                threads, else the node's cores divided by max_workers.
+            executor: Optional executor to use instead of a local pool.
+            keep_parts: Keep the per-seed statepoints
+                ('<output stem>.seed<seed><suffix>') after merging.
+            **kwargs: Arguments for simulate_<method>.
+
+        Returns:
+            Path to the merged statepoint.
+        """
+        if method not in CAMPAIGN_METHODS:
+            raise ValueError(
+                f"method must be one of {CAMPAIGN_METHODS}, got '{method}'")
+        if n_runs < 1:
+            raise ValueError(f"n_runs must be at least 1, got {n_runs}")
+        if kwargs.get("checkpoint_interval") is not None or kwargs.get("resume_from") is not None:
+            raise ValueError(
+                "checkpoint_interval and resume_from are not supported in run_split")
+
+        # a cached single run must not stand in for the split runs
+        result_cache, self.result_cache = self.result_cache, None
+        self._queued_runs = []
+        try:
+            getattr(self, f"simulate_{method}")(**kwargs)
+            (run,) = self._queued_runs
+        except BaseException:
+            for queued in self._queued_runs:
+                queued.discard()
+            raise
+        finally:
+            self._queued_runs = None
+            self.result_cache = result_cache
+
+        output = run.output
+        parts = []
+        try:
+            for i in range(n_runs):
+                part = output.with_name(f"{output.stem}.seed{seed + i}{output.suffix}")
+                parts.append((part, seeded_sandbox(
+                    run.sandbox / "model.xml", part, seed + i)))
+        except BaseException:
+            for _, sandbox in parts:
+                shutil.rmtree(sandbox, ignore_errors=True)
+            raise
+        finally:
+            run.discard()
+
+        max_workers = max_workers or n_runs
+        default_threads = max(1, (os.cpu_count() or 1) // max_workers)
+        run_config = run.run_config.with_overrides(
+            threads=threads or run.run_config.threads or default_threads)
+
+        owns_executor = executor is None
+        if owns_executor:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+        futures = []
+        try:
+            print(f"Running {n_runs} seeds, {max_workers} at a time ...")
+            for part, sandbox in parts:
+                futures.append(executor.submit(
+                    run_in_sandbox, sandbox, part, "statepoint", run_config))
+            # result() only, so executors without as_completed support work
+            part_paths = [future.result() for future in futures]
+        finally:
+            for future, (_, sandbox) in zip(futures, parts):
+                if future.cancel():
+                    shutil.rmtree(sandbox, ignore_errors=True)
+            if owns_executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        merge_statepoints(part_paths, output)
+        self._write_run_statistics(output)
+        if not keep_parts:
+            for part in part_paths:
+                Path(part).unlink(missing_ok=True)
+        return output
+
     def generate_neutron_ww(
         self,
         fuel: str,
@@ -528,8 +1412,29 @@ class OpenmcDagmcWrapper:
         random_ray_inactive: int = 100,
         multigroup_nparticles: int = 300,
         distance_active: float = 20_000.0,
+        method: str = "fw_cadis",
+        magic_particles: int = 100_000,
+        magic_batches: int = 10,
+        max_iterations: int = 5,
+        target_nonzero_fraction: float = 0.9,
+        cache: ResultCache | None = None,
+        threads: int | None = None,
+        mpi_args: list[str] | None = None,
     ) -> openmc.WeightWindows:
-        """Generate neutron weight windows using FW-CADIS and Random Ray.
+        """Generate neutron weight windows using FW-CADIS and Random Ray, or MAGIC.
+
+        With method='magic' no multigroup conversion or random ray solve is
+        done. Short continuous-energy runs are repeated instead, each with
+        the windows of the previous one applied and a MAGIC
+        WeightWindowGenerator refining them, until target_nonzero_fraction
+        of the mesh voxels have weight windows or max_iterations is
+        reached. This is slower to reach deep into a shield but works on
+        geometries random ray struggles with.
+
+        With a cache, the weight windows are stored under a hash of the
+        geometry, materials, source, DAGMC file, mesh and generator
+        settings. A later call with the same inputs copies the stored
+        weight_windows file to output_ww and skips the generation.
 
         Args:
             fuel: 'dd' or 'dt' — selects the neutron source.
@@ -541,6 +1446,20 @@ class OpenmcDagmcWrapper:
             random_ray_inactive: Number of inactive batches for Random Ray.
             multigroup_nparticles: Particles for multigroup XS generation.
             distance_active: Active distance for Random Ray.
+            method: 'fw_cadis' (random ray) or 'magic' (iterative
+                continuous-energy runs). The random ray and multigroup
+                arguments only apply to 'fw_cadis', the magic and iteration
+                arguments only to 'magic'.
+            magic_particles: Particles per batch of each MAGIC iteration.
+            magic_batches: Batches of each MAGIC iteration.
+            max_iterations: Maximum number of MAGIC iterations.
+            target_nonzero_fraction: Fraction of mesh voxels with nonzero
+                weight windows at which the MAGIC iterations stop.
+            cache: ResultCache for the weight windows. Defaults to
+                self.result_cache.
+            threads: OpenMP threads, overrides self.run_config.threads.
+            mpi_args: MPI launcher arguments (e.g. ['-n', '4']), overrides
+                self.run_config.mpi_args.
 
         Returns:
             The generated openmc.WeightWindows object.
@@ -559,23 +1478,86 @@ class OpenmcDagmcWrapper:
         else:
             raise ValueError(f"fuel must be 'dd' or 'dt', got '{fuel}'")
 
-        rr_model = copy.deepcopy(model)
-
-        rr_model.tallies = openmc.Tallies()
-        rr_model.plots = openmc.Plots()
+        if method == "fw_cadis":
+            generator_settings = {
+                "groups": "CASMO-2",
+                "multigroup_nparticles": multigroup_nparticles,
+                "random_ray_particles": random_ray_particles,
+                "random_ray_batches": random_ray_batches,
+                "random_ray_inactive": random_ray_inactive,
+                "distance_active": distance_active,
+            }
+        elif method == "magic":
+            generator_settings = {
+                "particles": magic_particles,
+                "batches": magic_batches,
+                "max_iterations": max_iterations,
+                "target_nonzero_fraction": target_nonzero_fraction,
+            }
+        else:
+            raise ValueError(
+                f"method must be 'fw_cadis' or 'magic', got '{method}'")
+
+        cache = cache if cache is not None else self.result_cache
+        if cache is not None:
+            mesh_xml = mesh.to_xml_element()
+            mesh_xml.attrib.pop("id", None)
+            cache_key, cache_inputs = cache.key(
+                model, self.dagmc_index.sha256, "weight_windows.h5",
+                extra={
+                    "mesh": ET.tostring(mesh_xml, encoding="unicode"),
+                    method: generator_settings,
+                })
+            if cache.fetch(cache_key, output_ww):
+                weight_window = openmc.hdf5_to_wws(output_ww)[0]
+                self.neutron_weight_windows = weight_window
+                return weight_window
+
+        if method == "magic":
+            magic_model = openmc.Model(
+                geometry=self.geometry,
+                materials=self.materials,
+                settings=self._fixed_source_settings(
+                    fuel, magic_particles, magic_batches,
+                    photon_transport=False),
+            )
+            weight_window = self._magic_weight_windows(
+                magic_model, mesh, "neutron", output_ww, max_iterations, [],
+                target_nonzero_fraction, threads=threads, mpi_args=mpi_args)
+            if cache is not None:
+                cache.store(cache_key, output_ww, cache_inputs)
+            self.neutron_weight_windows = weight_window
+            return weight_window
+
+        # The conversion rewrites materials and settings, so it gets cloned
+        # materials and its own settings. The geometry refers to materials
+        # by name and is shared instead of deep-copying the whole model.
+        rr_settings = openmc.Settings()
+        rr_settings.run_mode = "fixed source"
+        rr_settings.source = model.settings.source
         # Photon transport is not supported in multigroup
-        rr_model.settings.photon_transport = False
-
+        rr_settings.photon_transport = False
         # Temporary settings for multigroup generation
-        rr_model.settings.batches = 2
-        rr_model.settings.particles = 1
+        rr_settings.batches = 2
+        rr_settings.particles = 1
+        rr_model = openmc.Model(
+            geometry=self.geometry,
+            materials=openmc.Materials([mat.clone() for mat in self.materials]),
+            settings=rr_settings,
+        )
 
+        mgxs_path = Path(output_mg).resolve()
+        if self.mgxs_cache is not None:
+            self.mgxs_cache.build_library(
+                rr_model, mgxs_path, groups="CASMO-2",
+                method="stochastic_slab", nparticles=multigroup_nparticles)
         rr_model.convert_to_multigroup(
             method="stochastic_slab",
             groups="CASMO-2",
             nparticles=multigroup_nparticles,
-            overwrite_mgxs_library=True,
-            mgxs_path=output_mg,
+            # an existing library is only reused when it comes from the cache
+            overwrite_mgxs_library=self.mgxs_cache is None,
+            mgxs_path=str(mgxs_path),
         )
 
         rr_model.convert_to_random_ray()
@@ -602,20 +1584,163 @@ class OpenmcDagmcWrapper:
             particle_type="neutron",
         )
 
-        ww_file = Path("weight_windows.h5")
-        if ww_file.exists():
-            ww_file.unlink()
-
-        rr_model.run()
-        print("Written weight_windows.h5 file")
-        shutil.move("weight_windows.h5", Path(output_ww))
-        print(f"Saved {output_ww}")
+        self._run_model(
+            rr_model, output_ww, result="weight_windows.h5",
+            threads=threads, mpi_args=mpi_args)
+        if cache is not None:
+            cache.store(cache_key, output_ww, cache_inputs)
 
         weight_windows = openmc.hdf5_to_wws(output_ww)
         weight_window = weight_windows[0]
         self.neutron_weight_windows = weight_window
         return weight_window
 
+    def generate_photon_ww(
+        self,
+        fuel: str,
+        mesh: openmc.RegularMesh,
+        output_ww: str = "photon_weight_windows.h5",
+        particles: int = 100_000,
+        batches: int = 10,
+        iterations: int = 3,
+        target_nonzero_fraction: float | None = None,
+        decay_photons: bool = True,
+        neutron_weight_window: openmc.WeightWindows | str | Path | None = None,
+        threads: int | None = None,
+        mpi_args: list[str] | None = None,
+    ) -> openmc.WeightWindows:
+        """Generate photon weight windows with iterative MAGIC.
+
+        Random ray transports neutrons only, so photon weight windows come
+        from continuous-energy runs instead. Each iteration runs the model
+        with the photon weight windows of the previous iteration applied
+        and a MAGIC WeightWindowGenerator that derives new ones from the
+        photon flux, so the windows reach further into the shield with
+        every iteration.
+
+        With decay_photons the runs use D1S decay photons, giving windows
+        for simulate_d1s. Otherwise they follow prompt photons, for
+        simulate_on_mesh and simulate_instant_dose.
+
+        Args:
+            fuel: 'dd' or 'dt' — selects the neutron source.
+            mesh: Regular mesh for the weight windows.
+            output_ww: Output path for the weight_windows HDF5 file.
+            particles: Particles per batch of each iteration.
+            batches: Batches of each iteration.
+            iterations: Number of MAGIC iterations.
+            target_nonzero_fraction: Optional fraction of mesh voxels with
+                nonzero weight windows at which the iterations stop before
+                reaching iterations.
+            decay_photons: Transport D1S decay photons instead of prompt
+                photons.
+            neutron_weight_window: Optional neutron weight windows (e.g.
+                from generate_neutron_ww) applied during the iterations.
+                OpenMC writes them to output_ww with the photon windows,
+                so output_ww then holds combined neutron and photon weight
+                windows that the simulate methods accept directly.
+            threads: OpenMP threads, overrides self.run_config.threads.
+            mpi_args: MPI launcher arguments (e.g. ['-n', '4']), overrides
+                self.run_config.mpi_args.
+
+        Returns:
+            The photon openmc.WeightWindows of the last iteration.
+        """
+        settings = self._fixed_source_settings(
+            fuel, particles, batches, photon_transport=True)
+        settings.use_decay_photons = decay_photons
+        model = openmc.Model(
+            geometry=self.geometry,
+            materials=self.materials,
+            settings=settings,
+        )
+        fixed = [neutron_weight_window] if neutron_weight_window is not None else []
+        weight_window = self._magic_weight_windows(
+            model, mesh, "photon", output_ww, iterations, fixed,
+            target_nonzero_fraction, threads=threads, mpi_args=mpi_args)
+        self.photon_weight_windows = weight_window
+        return weight_window
+
+    def _magic_weight_windows(
+            self,
+            model: openmc.Model,
+            mesh: openmc.RegularMesh,
+            particle_type: str,
+            output_ww: str | Path,
+            iterations: int,
+            fixed_weight_windows: list,
+            target_nonzero_fraction: float | None = None,
+            threads: int | None = None,
+            mpi_args: list[str] | None = None) -> openmc.WeightWindows:
+        """Refine weight windows of one particle type with repeated MAGIC runs.
+
+        fixed_weight_windows (objects or file paths) are applied unchanged
+        in every iteration alongside the windows being refined. The
+        iterations stop early once target_nonzero_fraction of the mesh
+        voxels have a positive lower bound in some energy group.
+        """
+        if self._queued_runs is not None or self._planning is not None:
+            raise ValueError(
+                "MAGIC weight window generation needs the result of each "
+                "iteration and cannot run inside run_campaign or plan")
+        if iterations < 1:
+            raise ValueError(f"iterations must be at least 1, got {iterations}")
+        if target_nonzero_fraction is not None and not 0 < target_nonzero_fraction <= 1:
+            raise ValueError(
+                "target_nonzero_fraction must be in (0, 1], got "
+                f"{target_nonzero_fraction}")
+
+        settings = model.settings
+        weight_window = None
+        # intermediate windows are not worth caching, the callers cache the
+        # final ones
+        result_cache, self.result_cache = self.result_cache, None
+        try:
+            for iteration in range(1, iterations + 1):
+                settings.weight_window_generators = openmc.WeightWindowGenerator(
+                    method="magic",
+                    mesh=mesh,
+                    max_realizations=settings.batches,
+                    particle_type=particle_type,
+                )
+                windows = list(fixed_weight_windows)
+                if weight_window is not None:
+                    windows.append(weight_window)
+                applied_ids = set()
+                if windows:
+                    self._apply_weight_window(settings, windows)
+                    applied_ids = {ww.id for ww in settings.weight_windows}
+
+                print(
+                    f"MAGIC iteration {iteration}/{iterations} for "
+                    f"{particle_type} weight windows ...")
+                self._run_model(
+                    model, output_ww, result="weight_windows.h5",
+                    threads=threads, mpi_args=mpi_args)
+
+                # the file also holds the windows that were applied, including
+                # the previous iteration's, the generated one has a new id
+                matches = [
+                    ww for ww in openmc.hdf5_to_wws(str(output_ww))
+                    if ww.particle_type == particle_type]
+                generated = [ww for ww in matches if ww.id not in applied_ids]
+                weight_window = (generated or matches)[-1]
+                # fresh id and the caller's mesh, so the next model.xml has no
+                # duplicate ids
+                weight_window.id = None
+                weight_window.mesh = mesh
+
+                n_voxels = int(np.prod(mesh.dimension))
+                bounds = np.asarray(weight_window.lower_ww_bounds).reshape(n_voxels, -1)
+                nonzero_fraction = np.count_nonzero((bounds > 0).any(axis=1)) / n_voxels
+                print(f"  {nonzero_fraction:.1%} of voxels have weight windows")
+                if (target_nonzero_fraction is not None
+                        and nonzero_fraction >= target_nonzero_fraction):
+                    break
+        finally:
+            self.result_cache = result_cache
+        return weight_window
+
     def plot_weight_window(
         self,
         weight_window_file: str,
@@ -629,6 +1754,9 @@ class OpenmcDagmcWrapper:
             output: Output PNG path.
             title: Plot title.
         """
+        from matplotlib.colors import LogNorm
+        plt = _pyplot()
+
         weight_windows = openmc.hdf5_to_wws(weight_window_file)
         ww = weight_windows[0]
         ww_mesh = ww.mesh
@@ -652,13 +1780,13 @@ class OpenmcDagmcWrapper:
             materials=self.materials)
         ax2 = temp_model.plot(
             outline="only",
-            extent=temp_model.bounding_box.extent["xy"],
+            extent=self.bounding_box.extent["xy"],
             axes=ax,
             pixels=10_000_000,
             color_by="material",
             origin=(
-                temp_model.bounding_box.center[0],
-                temp_model.bounding_box.center[1],
+                self.bounding_box.center[0],
+                self.bounding_box.center[1],
                 0,
             ),
         )
@@ -669,36 +1797,18 @@ class OpenmcDagmcWrapper:
         print(f"Saved {output}")
         plt.close(fig)
 
-    def simulate_instant_dose(
-        self,
-        fuel: str,
-        tally_mesh: openmc.RegularMesh,
-        output: str = "statepoint_instant_dose.h5",
-        particles: int = 300_000,
-        batches: int = 200,
-        weight_window: openmc.WeightWindows | None = None,
-    ) -> str:
-        """Run a fixed-source simulation to tally instantaneous neutron and photon dose.
-
-        Creates two mesh tallies ('neutrons_dose_on_mesh' and 'photons_dose_on_mesh')
-        using ICRP dose coefficients (ISO geometry, cubic interpolation) and flux scores.
-
-        Args:
-            fuel: 'dd' or 'dt' — selects the neutron source.
-            tally_mesh: Mesh over which dose is tallied.
-            output: Path to save the resulting statepoint file.
-            particles: Number of particles per batch.
-            batches: Number of batches.
-            weight_window: Optional weight windows for variance reduction.
-
-        Returns:
-            Path to the saved statepoint file.
-        """
+    def _fixed_source_settings(
+            self,
+            fuel: str,
+            particles: int,
+            batches: int,
+            photon_transport: bool) -> openmc.Settings:
+        """Fixed-source settings with the DD or DT source selected by fuel."""
         settings = openmc.Settings()
         settings.particles = particles
         settings.batches = batches
         settings.run_mode = "fixed source"
-        settings.photon_transport = True
+        settings.photon_transport = photon_transport
         settings.output = {"tallies": False, "summary": False}
 
         if fuel == "dd":
@@ -707,14 +1817,145 @@ class OpenmcDagmcWrapper:
             settings.source = self.dt_source
         else:
             raise ValueError(f"fuel must be 'dd' or 'dt', got '{fuel}'")
+        return settings
 
-        if weight_window is not None:
-            settings.weight_windows_on = True
-            settings.weight_window_checkpoints = {
-                "collision": True, "surface": True}
-            settings.survival_biasing = False
+    def _apply_weight_window(
+            self,
+            settings: openmc.Settings,
+            weight_window: openmc.WeightWindows | str | Path | list | None):
+        """Switch on weight windows given as objects or HDF5 file paths.
+
+        A single path is passed to OpenMC as weight_windows_file, so the
+        bounds are read from HDF5 by OpenMC instead of being written into
+        model.xml. A list, e.g. neutron and photon weight windows, is
+        combined into settings.weight_windows, with the files in it loaded.
+        """
+        if weight_window is None:
+            return
+        settings.weight_windows_on = True
+        settings.weight_window_checkpoints = {
+            "collision": True, "surface": True}
+        settings.survival_biasing = False
+        if isinstance(weight_window, (str, Path)):
+            settings.weight_windows_file = str(_weight_window_path(weight_window))
+        elif isinstance(weight_window, (list, tuple)):
+            windows = []
+            for item in weight_window:
+                if isinstance(item, (str, Path)):
+                    loaded = openmc.hdf5_to_wws(str(_weight_window_path(item)))
+                    # ids from another run can clash with ids of this session
+                    for ww in loaded:
+                        ww.id = None
+                        ww.mesh.id = None
+                    windows.extend(loaded)
+                else:
+                    windows.append(item)
+            particle_types = [ww.particle_type for ww in windows]
+            for particle_type in set(particle_types):
+                if particle_types.count(particle_type) > 1:
+                    raise ValueError(
+                        f"More than one {particle_type} weight window given")
+            settings.weight_windows = windows
+        else:
             settings.weight_windows = weight_window
 
+    def _add_convergence_triggers(
+            self,
+            tallies: openmc.Tallies,
+            settings: openmc.Settings,
+            target_rel_error: float | None,
+            max_batches: int | None = None,
+            trigger_tallies: list[str] | None = None,
+            roi_mesh: openmc.MeshBase | None = None):
+        """Stop a run once the selected tallies reach a relative error.
+
+        Adds OpenMC rel_err triggers and enables them in settings. The
+        settings' batches become the minimum number of batches, after which
+        OpenMC checks the triggers and runs more batches, up to
+        max_batches, until they are met. Voxels that scored nothing are
+        ignored. With roi_mesh, each selected tally is duplicated on that
+        mesh as '{name}_roi' and only the copy gets the trigger, so the
+        precision is judged over the region of interest only.
+
+        Call it before _enforce_memory_budget so the ROI copies are
+        counted in the tally memory.
+
+        Args:
+            tallies: Tallies of the model, ROI copies are appended.
+            settings: Settings of the model.
+            target_rel_error: Relative error to reach in every scoring bin,
+                e.g. 0.05. None leaves the tallies and settings unchanged.
+            max_batches: Batch cap. Defaults to five times settings.batches.
+            trigger_tallies: Names of the tallies to converge. Defaults to
+                all tallies.
+            roi_mesh: Optional mesh covering the region of interest.
+        """
+        if target_rel_error is None:
+            return
+        if target_rel_error <= 0:
+            raise ValueError(
+                f"target_rel_error must be positive, got {target_rel_error}")
+        if max_batches is None:
+            max_batches = 5 * settings.batches
+        if max_batches < settings.batches:
+            raise ValueError(
+                f"max_batches ({max_batches}) must be at least batches "
+                f"({settings.batches})")
+
+        names = [t.name for t in tallies]
+        if trigger_tallies is None:
+            trigger_tallies = names
+        unknown = set(trigger_tallies) - set(names)
+        if unknown:
+            raise ValueError(
+                f"Tallies {sorted(unknown)} not found, available tallies: {names}")
+
+        selected = [t for t in list(tallies) if t.name in trigger_tallies]
+        if roi_mesh is not None:
+            roi_filter = openmc.MeshFilter(roi_mesh)
+            roi_tallies = []
+            for tally in selected:
+                # MeshBornFilter subclasses MeshFilter and is kept as it is
+                if not any(type(f) is openmc.MeshFilter for f in tally.filters):
+                    raise ValueError(
+                        f"Tally '{tally.name}' has no MeshFilter to restrict "
+                        "to roi_mesh")
+                roi_tally = openmc.Tally(name=f"{tally.name}_roi")
+                roi_tally.filters = [
+                    roi_filter if type(f) is openmc.MeshFilter else f
+                    for f in tally.filters]
+                roi_tally.nuclides = tally.nuclides
+                roi_tally.scores = tally.scores
+                roi_tallies.append(roi_tally)
+                tallies.append(roi_tally)
+            selected = roi_tallies
+
+        for tally in selected:
+            tally.triggers = [openmc.Trigger(
+                "rel_err", target_rel_error, ignore_zeros=True)]
+
+        settings.trigger_active = True
+        settings.trigger_max_batches = max_batches
+        print(
+            f"Converging {', '.join(t.name for t in selected)} to "
+            f"{target_rel_error:.1%} relative error, "
+            f"{settings.batches} to {max_batches} batches")
+
+    def make_instant_dose_tallies(
+            self,
+            tally_mesh: openmc.RegularMesh | openmc.CylindricalMesh) -> list[openmc.Tally]:
+        """Create the neutron and photon dose mesh tallies of simulate_instant_dose.
+
+        The tallies are named 'neutrons_dose_on_mesh' and
+        'photons_dose_on_mesh' and use ICRP dose coefficients (ISO geometry,
+        cubic interpolation) with flux scores.
+
+        Args:
+            tally_mesh: Mesh over which dose is tallied.
+
+        Returns:
+            List of the two tallies.
+        """
         mesh_filter = openmc.MeshFilter(tally_mesh)
 
         # Neutron dose tally
@@ -745,23 +1986,281 @@ class OpenmcDagmcWrapper:
         ]
         photon_dose_tally.scores = ["flux"]
 
-        my_tallies = openmc.Tallies([neutron_dose_tally, photon_dose_tally])
+        return [neutron_dose_tally, photon_dose_tally]
+
+    def make_mesh_tallies(
+            self,
+            tally_meshes: list[openmc.MeshBase] | openmc.MeshBase,
+            tallies: list[tuple[str, str]],
+            consolidate: bool = False) -> list[openmc.Tally]:
+        """Create the (score, particle) mesh tallies of simulate_on_mesh.
+
+        One tally per (score, particle, mesh) combination, named
+        '{score}_{particle}_on_{mesh.name}'.
+
+        With consolidate=True the flux and heating pairs of each mesh are
+        scored by a single tally named 'mesh_scores_on_{mesh.name}', with a
+        ParticleFilter holding every requested particle and every requested
+        score, so each event does one mesh lookup for all of them. Only the
+        requested pairs are scored: if the particles do not ask for the
+        same scores (e.g. neutron flux and photon heating), each particle
+        gets its own 'mesh_scores_{particle}_on_{mesh.name}' tally instead.
+        Dose needs a per-particle EnergyFunctionFilter, so dose pairs keep
+        their own tallies. Filters are shared between tallies.
+        get_mesh_tally reads every layout.
+
+        Args:
+            tally_meshes: Mesh or list of meshes with unique names.
+            tallies: List of (score, particle) tuples, score is 'flux',
+                'heating' or 'dose' and particle is 'neutron' or 'photon'.
+            consolidate: Merge the flux and heating tallies of each mesh.
+
+        Returns:
+            List of tallies.
+        """
+        valid_scores = {"flux", "heating", "dose"}
+        valid_particles = {"neutron", "photon"}
+        for score, particle in tallies:
+            if score not in valid_scores:
+                raise ValueError(
+                    f"score must be one of {valid_scores}, got '{score}'")
+            if particle not in valid_particles:
+                raise ValueError(
+                    f"particle must be one of {valid_particles}, got '{particle}'")
+
+        if isinstance(tally_meshes, openmc.MeshBase):
+            tally_meshes = [tally_meshes]
+
+        mesh_names = [m.name for m in tally_meshes]
+        dupes = {n for n in mesh_names if mesh_names.count(n) > 1}
+        if dupes:
+            raise ValueError(f"Duplicate mesh names: {dupes}")
+
+        def dose_filter(particle):
+            energy_bins, dose_coeffs = openmc.data.dose_coefficients(
+                particle=particle, geometry="ISO"
+            )
+            return openmc.EnergyFunctionFilter(
+                energy=energy_bins,
+                y=dose_coeffs,
+                interpolation="cubic")
+
+        openmc_tallies = []
+        if consolidate:
+            # particles asking for the same flux/heating scores share a tally
+            groups = {}
+            for particle in ("neutron", "photon"):
+                scores = tuple(
+                    s for s in ("flux", "heating") if (s, particle) in tallies)
+                if scores:
+                    groups.setdefault(scores, []).append(particle)
+            dose_particles = [
+                p for p in ("neutron", "photon") if ("dose", p) in tallies]
+            particle_filters = {
+                tuple(p): openmc.ParticleFilter(p) for p in groups.values()}
+            particle_filters.update(
+                {(p,): openmc.ParticleFilter(p) for p in dose_particles})
+            dose_filters = {p: dose_filter(p) for p in dose_particles}
+
+            for mesh in tally_meshes:
+                mesh_filter = openmc.MeshFilter(mesh)
+                for scores, particles in groups.items():
+                    name = f"mesh_scores_on_{mesh.name}"
+                    if len(groups) > 1:
+                        name = f"mesh_scores_{particles[0]}_on_{mesh.name}"
+                    tally = openmc.Tally(name=name)
+                    tally.filters = [mesh_filter, particle_filters[tuple(particles)]]
+                    tally.scores = list(scores)
+                    openmc_tallies.append(tally)
+                for particle in dose_particles:
+                    tally = openmc.Tally(name=f"dose_{particle}_on_{mesh.name}")
+                    tally.filters = [
+                        mesh_filter,
+                        particle_filters[(particle,)],
+                        dose_filters[particle]]
+                    tally.scores = ["flux"]
+                    openmc_tallies.append(tally)
+            return openmc_tallies
+
+        for mesh in tally_meshes:
+            mesh_filter = openmc.MeshFilter(mesh)
+            for score, particle in tallies:
+                tally = openmc.Tally(name=f"{score}_{particle}_on_{mesh.name}")
+                filters = [mesh_filter, openmc.ParticleFilter(particle)]
+
+                if score == "dose":
+                    filters.append(dose_filter(particle))
+                    tally.scores = ["flux"]
+                elif score == "flux":
+                    tally.scores = ["flux"]
+                elif score == "heating":
+                    tally.scores = ["heating"]
+
+                tally.filters = filters
+                openmc_tallies.append(tally)
+
+        return openmc_tallies
+
+    def open_session(
+        self,
+        fuel: str,
+        tallies: list[openmc.Tally],
+        particles: int = 300_000,
+        batches: int = 200,
+        photon_transport: bool = True,
+        weight_window: openmc.WeightWindows | str | Path | list | None = None,
+        directory: str | Path | None = None,
+        threads: int | None = None,
+        output_dir: str | Path | None = None,
+    ) -> OpenmcSession:
+        """Open an in-process OpenMC session for repeated runs of one source.
+
+        Geometry, cross sections and the source are loaded once. Each
+        OpenmcSession.run then changes particles, batches, seed and which
+        of the tallies are scored, and OpenmcSession.set_mesh changes the
+        bounds and resolution of a RegularMesh the tallies score on, for
+        example:
+
+            tallies = (wrapper.make_instant_dose_tallies(mesh)
+                       + wrapper.make_mesh_tallies(mesh, [("heating", "neutron")]))
+            with wrapper.open_session("dt", tallies) as session:
+                session.run("dose.h5", tallies=["neutrons_dose_on_mesh",
+                                                "photons_dose_on_mesh"])
+                session.set_mesh(mesh.name, finer_mesh)
+                session.run("heating.h5", tallies=["heating_neutron_on_mesh"],
+                            particles=10_000)
+
+        The source cannot be replaced in a session and only one session can
+        be open per process, so runs for the other fuel need a new session
+        after this one is closed. D1S runs and MPI are not supported in a
+        session, use simulate_d1s and run_config instead.
+
+        Args:
+            fuel: 'dd' or 'dt' — selects the neutron source.
+            tallies: Every tally the session can score.
+            particles: Default number of particles per batch.
+            batches: Default number of batches.
+            photon_transport: Whether to transport photons.
+            weight_window: Optional weight windows for variance reduction,
+                the path of a weight_windows HDF5 file (e.g. from
+                generate_neutron_ww), or a list of these to combine neutron
+                and photon windows.
+            directory: Working directory for the session files. If None a
+                temporary directory is created in output_dir and removed
+                on close.
+            threads: OpenMP threads, defaults to self.run_config.threads.
+            output_dir: Directory the session's statepoints will be saved
+                to. Defaults to the current directory.
+
+        Returns:
+            An unopened OpenmcSession, use it as a context manager or call
+            open and close.
+        """
+        settings = self._fixed_source_settings(
+            fuel, particles, batches, photon_transport)
+
+        self._apply_weight_window(settings, weight_window)
+
+        names = [t.name for t in tallies]
+        dupes = {n for n in names if names.count(n) > 1}
+        if dupes:
+            raise ValueError(f"Duplicate tally names: {dupes}")
 
         model = openmc.Model(
             geometry=self.geometry,
             materials=self.materials,
             settings=settings,
-            tallies=my_tallies,
+            tallies=openmc.Tallies(tallies),
         )
+        if threads is None:
+            threads = self.run_config.threads
+        return OpenmcSession(
+            model, directory=directory, threads=threads, output_dir=output_dir)
+
+    def simulate_instant_dose(
+        self,
+        fuel: str,
+        tally_mesh: openmc.RegularMesh | openmc.CylindricalMesh,
+        output: str = "statepoint_instant_dose.h5",
+        particles: int = 300_000,
+        batches: int = 200,
+        weight_window: openmc.WeightWindows | str | Path | list | None = None,
+        memory_budget_gb: float | None = None,
+        auto_coarsen: bool = False,
+        target_rel_error: float | None = None,
+        max_batches: int | None = None,
+        trigger_tallies: list[str] | None = None,
+        roi_mesh: openmc.MeshBase | None = None,
+        checkpoint_interval: int | None = None,
+        resume_from: str | Path | None = None,
+        threads: int | None = None,
+        mpi_args: list[str] | None = None,
+    ) -> str:
+        """Run a fixed-source simulation to tally instantaneous neutron and photon dose.
+
+        Creates two mesh tallies ('neutrons_dose_on_mesh' and 'photons_dose_on_mesh')
+        using ICRP dose coefficients (ISO geometry, cubic interpolation) and flux scores.
+
+        Args:
+            fuel: 'dd' or 'dt' — selects the neutron source.
+            tally_mesh: RegularMesh or CylindricalMesh over which dose is
+                tallied.
+            output: Path to save the resulting statepoint file.
+            particles: Number of particles per batch.
+            batches: Number of batches.
+            weight_window: Optional weight windows for variance reduction,
+                the path of a weight_windows HDF5 file (e.g. from
+                generate_neutron_ww), or a list of these to combine neutron
+                and photon windows.
+            memory_budget_gb: Optional RAM budget in GB for the tallies. The
+                run is refused if the tallies need more than this.
+            auto_coarsen: If True, coarsen tally_mesh in place to fit
+                memory_budget_gb instead of refusing the run.
+            target_rel_error: Optional relative error (e.g. 0.05) at which
+                the run stops early. batches is then the minimum number of
+                batches.
+            max_batches: Batch cap when target_rel_error is set. Defaults
+                to five times batches.
+            trigger_tallies: Names of the tallies that must reach
+                target_rel_error. Defaults to all tallies.
+            roi_mesh: Optional mesh over the region of interest, only
+                voxels on it are checked against target_rel_error.
+            checkpoint_interval: Write a checkpoint statepoint every this
+                many batches to the run directory '<output>.run', which is
+                kept if the run fails.
+            resume_from: Restart from a checkpoint statepoint, or from the
+                latest one in a run directory such as '<output>.run'. Use
+                the same arguments as the interrupted run.
+            threads: OpenMP threads, overrides self.run_config.threads.
+            mpi_args: MPI launcher arguments (e.g. ['-n', '4']), overrides
+                self.run_config.mpi_args.
 
-        # Clean old statepoint files
-        for f in Path(".").glob("statepoint.*.h5"):
-            f.unlink(missing_ok=True)
+        Returns:
+            Path to the saved statepoint file.
+        """
+        settings = self._fixed_source_settings(
+            fuel, particles, batches, photon_transport=True)
+
+        self._apply_weight_window(settings, weight_window)
+
+        my_tallies = openmc.Tallies(self.make_instant_dose_tallies(tally_mesh))
+        self._add_convergence_triggers(
+            my_tallies, settings, target_rel_error, max_batches,
+            trigger_tallies, roi_mesh)
+        self._enforce_memory_budget(
+            my_tallies, [tally_mesh], memory_budget_gb, auto_coarsen)
+
+        model = openmc.Model(
+            geometry=self.geometry,
+            materials=self.materials,
+            settings=settings,
+            tallies=my_tallies,
+        )
 
         print("Running instant dose simulation ...")
-        statepoint = model.run()
-        shutil.move(statepoint, Path(output))
-        print(f"Statepoint saved to {output}")
+        self._run_model(
+            model, output, threads=threads, mpi_args=mpi_args,
+            checkpoint_interval=checkpoint_interval, resume_from=resume_from)
         return output
 
     def plot_instant_dose(
@@ -784,6 +2283,9 @@ class OpenmcDagmcWrapper:
             basis: Plotting basis, 'xy', 'xz', or 'yz'.
             contour_levels: Dose contour levels in mSv/pulse (default [0.1, 10.0]).
         """
+        from matplotlib.colors import LogNorm
+        plt = _pyplot()
+
         if contour_levels is None:
             contour_levels = [0.1, 10.0]
 
@@ -796,33 +2298,17 @@ class OpenmcDagmcWrapper:
                 tally_slice = tally.get_slice(scores=["flux"])
                 data = tally_slice.get_reshaped_data(
                     expand_dims=True, value=value
-                ).squeeze()
-
-                if basis == "xy":
-                    z_values = mesh.centroids[0][0][:, 2]
-                    closest_idx = int(np.abs(z_values).argmin())
-                    data_2d = data[:, :, closest_idx]
-                elif basis == "xz":
-                    y_values = mesh.centroids[0][:, 0, 1]
-                    closest_idx = int(np.abs(y_values).argmin())
-                    data_2d = data[:, closest_idx, :]
-                elif basis == "yz":
-                    x_values = mesh.centroids[:, 0, 0][:, 0]
-                    closest_idx = int(np.abs(x_values).argmin())
-                    data_2d = data[closest_idx, :, :]
-                else:
-                    raise ValueError(
-                        f"basis must be 'xy', 'xz', or 'yz', got '{basis}'")
+                ).reshape(tuple(mesh.dimension))
 
                 if value == "mean":
+                    # per-voxel volumes, CylindricalMesh voxels are not uniform
                     pico_to_milli = 1e-9
-                    mesh_voxel_volume = mesh.volumes[0][0][0]
-                    data_2d = (
-                        data_2d * neutrons_per_pulse * pico_to_milli
-                    ) / mesh_voxel_volume
+                    data = (
+                        data * neutrons_per_pulse * pico_to_milli
+                    ) / mesh.volumes
 
+                data_2d, extent, _ = mesh_slice(mesh, data, basis)
                 data_2d = np.rot90(data_2d, -3)
-                extent = mesh.bounding_box.extent[basis]
                 meter_extent = [v / 100 for v in extent]
                 return data_2d, meter_extent
 
@@ -833,7 +2319,7 @@ class OpenmcDagmcWrapper:
                 if len(positive) == 0:
                     norm = None
                 else:
-                    norm = LogNorm(vmin=np.min(positive), vmax=np.max(data_2d))
+                    norm = LogNorm(vmin=np.min(positive), vmax=np.nanmax(data_2d))
             else:
                 norm = None
 
@@ -871,12 +2357,12 @@ class OpenmcDagmcWrapper:
             temp_model = openmc.Model(
                 geometry=self.geometry, materials=self.materials
             )
-            cm_extent = temp_model.bounding_box.extent[basis]
+            cm_extent = self.bounding_box.extent[basis]
             ax2 = temp_model.plot(
                 outline="only",
                 origin=(
-                    temp_model.bounding_box.center[0],
-                    temp_model.bounding_box.center[1],
+                    self.bounding_box.center[0],
+                    self.bounding_box.center[1],
                     0,
                 ),
                 extent=cm_extent,
@@ -938,11 +2424,23 @@ class OpenmcDagmcWrapper:
     def simulate_on_mesh(
         self,
         fuel: str,
-        tally_meshes: list[openmc.RegularMesh] | openmc.RegularMesh,
+        tally_meshes: list[openmc.MeshBase] | openmc.MeshBase,
         tallies: list[tuple[str, str]],
         output: str = "statepoint.h5",
         particles: int = 300_000,
         batches: int = 200,
+        consolidate: bool = False,
+        weight_window: openmc.WeightWindows | str | Path | list | None = None,
+        memory_budget_gb: float | None = None,
+        auto_coarsen: bool = False,
+        target_rel_error: float | None = None,
+        max_batches: int | None = None,
+        trigger_tallies: list[str] | None = None,
+        roi_mesh: openmc.MeshBase | None = None,
+        checkpoint_interval: int | None = None,
+        resume_from: str | Path | None = None,
+        threads: int | None = None,
+        mpi_args: list[str] | None = None,
     ) -> str:
         """Run a fixed-source simulation with multiple scores on one or more meshes.
 
@@ -957,91 +2455,219 @@ class OpenmcDagmcWrapper:
 
         Args:
             fuel: 'dd' or 'dt' — selects the neutron source.
-            tally_meshes: Mesh or list of meshes over which tallies are scored.
+            tally_meshes: Mesh or list of meshes (RegularMesh or
+                CylindricalMesh) over which tallies are scored.
             tallies: List of (score, particle) tuples, e.g.
                 [('flux', 'neutron'), ('heating', 'photon'), ('dose', 'neutron')].
             output: Path to save the resulting statepoint file.
             particles: Number of particles per batch.
             batches: Number of batches.
+            consolidate: Score all flux and heating pairs of a mesh in one
+                tally (see make_mesh_tallies) to cut the per-event filter
+                work. plot_mesh_tally reads both layouts.
+            weight_window: Optional weight windows for variance reduction:
+                an object, the path of a weight_windows HDF5 file, or a
+                list of these to combine neutron windows (generate_neutron_ww)
+                with photon windows (generate_photon_ww with
+                decay_photons=False).
+            memory_budget_gb: Optional RAM budget in GB for the tallies. The
+                run is refused if the tallies need more than this.
+            auto_coarsen: If True, coarsen the meshes in place to fit
+                memory_budget_gb instead of refusing the run.
+            target_rel_error: Optional relative error (e.g. 0.05) at which
+                the run stops early. batches is then the minimum number of
+                batches.
+            max_batches: Batch cap when target_rel_error is set. Defaults
+                to five times batches.
+            trigger_tallies: Names of the tallies that must reach
+                target_rel_error. Defaults to all tallies.
+            roi_mesh: Optional mesh over the region of interest, only
+                voxels on it are checked against target_rel_error.
+            checkpoint_interval: Write a checkpoint statepoint every this
+                many batches to the run directory '<output>.run', which is
+                kept if the run fails.
+            resume_from: Restart from a checkpoint statepoint, or from the
+                latest one in a run directory such as '<output>.run'. Use
+                the same arguments as the interrupted run.
+            threads: OpenMP threads, overrides self.run_config.threads.
+            mpi_args: MPI launcher arguments (e.g. ['-n', '4']), overrides
+                self.run_config.mpi_args.
 
         Returns:
             Path to the saved statepoint file.
         """
-        valid_scores = {"flux", "heating", "dose"}
-        valid_particles = {"neutron", "photon"}
-        for score, particle in tallies:
-            if score not in valid_scores:
-                raise ValueError(
-                    f"score must be one of {valid_scores}, got '{score}'")
-            if particle not in valid_particles:
-                raise ValueError(
-                    f"particle must be one of {valid_particles}, got '{particle}'")
+        settings = self._fixed_source_settings(
+            fuel, particles, batches,
+            photon_transport=any(p == "photon" for _, p in tallies))
+        self._apply_weight_window(settings, weight_window)
 
-        if isinstance(tally_meshes, openmc.RegularMesh):
+        if isinstance(tally_meshes, openmc.MeshBase):
             tally_meshes = [tally_meshes]
+        openmc_tallies = openmc.Tallies(
+            self.make_mesh_tallies(tally_meshes, tallies, consolidate))
 
-        mesh_names = [m.name for m in tally_meshes]
-        dupes = {n for n in mesh_names if mesh_names.count(n) > 1}
-        if dupes:
-            raise ValueError(f"Duplicate mesh names: {dupes}")
+        self._add_convergence_triggers(
+            openmc_tallies, settings, target_rel_error, max_batches,
+            trigger_tallies, roi_mesh)
+        self._enforce_memory_budget(
+            openmc_tallies, tally_meshes, memory_budget_gb, auto_coarsen)
 
-        settings = openmc.Settings()
-        settings.particles = particles
-        settings.batches = batches
-        settings.run_mode = "fixed source"
-        settings.photon_transport = any(p == "photon" for _, p in tallies)
-        settings.output = {"tallies": False, "summary": False}
+        model = openmc.Model(
+            geometry=self.geometry,
+            materials=self.materials,
+            settings=settings,
+            tallies=openmc_tallies,
+        )
 
-        if fuel == "dd":
-            settings.source = self.dd_source
-        elif fuel == "dt":
-            settings.source = self.dt_source
-        else:
-            raise ValueError(f"fuel must be 'dd' or 'dt', got '{fuel}'")
+        scores = sorted({s for s, _ in tallies})
+        particles_list = sorted({p for _, p in tallies})
+        label = ", ".join(scores) + " (" + " + ".join(particles_list) + ")"
+        print(f"Running {label} simulation ...")
+        self._run_model(
+            model, output, threads=threads, mpi_args=mpi_args,
+            checkpoint_interval=checkpoint_interval, resume_from=resume_from)
+        return output
+
+    def simulate_fused(
+        self,
+        fuel: str,
+        instant_dose_mesh: openmc.RegularMesh | openmc.CylindricalMesh | None = None,
+        tally_meshes: list[openmc.MeshBase] | openmc.MeshBase | None = None,
+        tallies: list[tuple[str, str]] | None = None,
+        instant_dose_output: str = "statepoint_instant_dose.h5",
+        on_mesh_output: str = "statepoint.h5",
+        particles: int = 300_000,
+        batches: int = 200,
+        weight_window: openmc.WeightWindows | str | Path | list | None = None,
+        consolidate: bool = False,
+        memory_budget_gb: float | None = None,
+        auto_coarsen: bool = False,
+        target_rel_error: float | None = None,
+        max_batches: int | None = None,
+        trigger_tallies: list[str] | None = None,
+        roi_mesh: openmc.MeshBase | None = None,
+        checkpoint_interval: int | None = None,
+        resume_from: str | Path | None = None,
+        threads: int | None = None,
+        mpi_args: list[str] | None = None,
+    ) -> dict[str, str]:
+        """Score the simulate_instant_dose and simulate_on_mesh tallies in one run.
+
+        All tallies share a single transport of the fuel's source, instead
+        of one transport per runner. The statepoint is then saved under the
+        output name of each runner, so plot_instant_dose and plot_mesh_tally
+        read it as if the runners had been called separately. Both files
+        hold every tally of the run, and the plotters pick theirs by name.
+        The second file is a hard link to the first where the filesystem
+        allows it, so the statepoint is not stored twice, and each file
+        gets its own '.fom.json' run statistics.
+
+        Args:
+            fuel: 'dd' or 'dt' — selects the neutron source.
+            instant_dose_mesh: Mesh for the simulate_instant_dose tallies. If
+                None no instant dose tallies are scored.
+            tally_meshes: Mesh or list of meshes for the simulate_on_mesh
+                tallies.
+            tallies: List of (score, particle) tuples scored on every mesh of
+                tally_meshes, as in simulate_on_mesh.
+            instant_dose_output: Statepoint path for the instant dose tallies.
+            on_mesh_output: Statepoint path for the on-mesh tallies.
+            particles: Number of particles per batch.
+            batches: Number of batches.
+            weight_window: Optional weight windows for variance reduction,
+                the path of a weight_windows HDF5 file (e.g. from
+                generate_neutron_ww), or a list of these to combine neutron
+                and photon windows.
+            consolidate: Merge the flux and heating tallies of each mesh,
+                as in simulate_on_mesh.
+            memory_budget_gb: Optional RAM budget in GB for all tallies
+                together. The run is refused if they need more than this.
+            auto_coarsen: If True, coarsen the meshes in place to fit
+                memory_budget_gb instead of refusing the run.
+            target_rel_error: Optional relative error (e.g. 0.05) at which
+                the run stops early. batches is then the minimum number of
+                batches.
+            max_batches: Batch cap when target_rel_error is set. Defaults
+                to five times batches.
+            trigger_tallies: Names of the tallies that must reach
+                target_rel_error. Defaults to all tallies.
+            roi_mesh: Optional mesh over the region of interest, only
+                voxels on it are checked against target_rel_error.
+            checkpoint_interval: Write a checkpoint statepoint every this
+                many batches to the run directory '<output>.run', which is
+                kept if the run fails.
+            resume_from: Restart from a checkpoint statepoint, or from the
+                latest one in a run directory such as '<output>.run'. Use
+                the same arguments as the interrupted run.
+            threads: OpenMP threads, overrides self.run_config.threads.
+            mpi_args: MPI launcher arguments (e.g. ['-n', '4']), overrides
+                self.run_config.mpi_args.
+
+        Returns:
+            Dict mapping 'instant_dose' and/or 'on_mesh' to the saved
+            statepoint paths.
+        """
+        if (tally_meshes is None) != (tallies is None):
+            raise ValueError("tally_meshes and tallies must be given together")
+        if instant_dose_mesh is None and tally_meshes is None:
+            raise ValueError(
+                "Nothing to tally, give instant_dose_mesh and/or "
+                "tally_meshes with tallies")
+        if self._queued_runs is not None:
+            raise ValueError("simulate_fused cannot be queued in run_campaign")
 
         openmc_tallies = []
-        for mesh in tally_meshes:
-            mesh_filter = openmc.MeshFilter(mesh)
-            for score, particle in tallies:
-                tally = openmc.Tally(name=f"{score}_{particle}_on_{mesh.name}")
-                filters = [mesh_filter, openmc.ParticleFilter(particle)]
+        meshes = []
+        outputs = {}
+        if instant_dose_mesh is not None:
+            openmc_tallies += self.make_instant_dose_tallies(instant_dose_mesh)
+            meshes.append(instant_dose_mesh)
+            outputs["instant_dose"] = instant_dose_output
+        if tally_meshes is not None:
+            if isinstance(tally_meshes, openmc.MeshBase):
+                tally_meshes = [tally_meshes]
+            openmc_tallies += self.make_mesh_tallies(
+                tally_meshes, tallies, consolidate)
+            meshes += [m for m in tally_meshes if m is not instant_dose_mesh]
+            outputs["on_mesh"] = on_mesh_output
+
+        if len(set(outputs.values())) < len(outputs):
+            raise ValueError(
+                "instant_dose_output and on_mesh_output must be different paths")
 
-                if score == "dose":
-                    energy_bins, dose_coeffs = openmc.data.dose_coefficients(
-                        particle=particle, geometry="ISO"
-                    )
-                    filters.append(
-                        openmc.EnergyFunctionFilter(
-                            energy=energy_bins,
-                            y=dose_coeffs,
-                            interpolation="cubic"))
-                    tally.scores = ["flux"]
-                elif score == "flux":
-                    tally.scores = ["flux"]
-                elif score == "heating":
-                    tally.scores = ["heating"]
+        photon_transport = instant_dose_mesh is not None or any(
+            p == "photon" for _, p in tallies)
+        settings = self._fixed_source_settings(
+            fuel, particles, batches, photon_transport)
 
-                tally.filters = filters
-                openmc_tallies.append(tally)
+        self._apply_weight_window(settings, weight_window)
+
+        my_tallies = openmc.Tallies(openmc_tallies)
+        self._add_convergence_triggers(
+            my_tallies, settings, target_rel_error, max_batches,
+            trigger_tallies, roi_mesh)
+        self._enforce_memory_budget(
+            my_tallies, meshes, memory_budget_gb, auto_coarsen)
 
         model = openmc.Model(
             geometry=self.geometry,
             materials=self.materials,
             settings=settings,
-            tallies=openmc.Tallies(openmc_tallies),
+            tallies=my_tallies,
         )
 
-        for f in Path(".").glob("statepoint.*.h5"):
-            f.unlink(missing_ok=True)
-
-        scores = sorted({s for s, _ in tallies})
-        particles_list = sorted({p for _, p in tallies})
-        label = ", ".join(scores) + " (" + " + ".join(particles_list) + ")"
-        print(f"Running {label} simulation ...")
-        statepoint = model.run()
-        shutil.move(statepoint, Path(output))
-        print(f"Statepoint saved to {output}")
-        return output
+        print(f"Running fused simulation ({', '.join(outputs)}) ...")
+        first, *others = outputs.values()
+        self._run_model(
+            model, first, threads=threads, mpi_args=mpi_args,
+            checkpoint_interval=checkpoint_interval, resume_from=resume_from)
+        if self._planning is not None:
+            return outputs
+        for other in others:
+            link_or_copy(first, other)
+            copy_run_statistics(first, other)
+            print(f"Statepoint saved to {other}")
+        return outputs
 
     def plot_mesh_tally(
         self,
@@ -1058,7 +2684,8 @@ class OpenmcDagmcWrapper:
 
         Extracts a slice through the mesh centre (z=0 for xy, y=0 for xz,
         x=0 for yz), scales by neutrons_per_pulse and voxel volume, and
-        overlays the geometry outline.
+        overlays the geometry outline. CylindricalMesh tallies are resampled
+        onto the slice plane (see mesh_slice).
 
         Args:
             statepoint_filename: Path to the statepoint file.
@@ -1073,8 +2700,9 @@ class OpenmcDagmcWrapper:
                 '{score}_{particle}_{mesh_name}_{basis}.png'.
             basis: Slice orientation, 'xy', 'xz', or 'yz'.
         """
-        # Determine the OpenMC score string used in the tally
-        openmc_score = "flux" if score in ("flux", "dose") else score
+        import matplotlib.collections as mcoll
+        from matplotlib.colors import BoundaryNorm
+        plt = _pyplot()
 
         if score == "flux" and particle == "total":
             raise ValueError(
@@ -1093,61 +2721,36 @@ class OpenmcDagmcWrapper:
         }
         cbar_unit = unit_map[(score, particle)]
 
-        def _read_tally(sp, tally_name):
-            tally = sp.get_tally(name=tally_name)
-            mesh = tally.find_filter(openmc.MeshFilter).mesh
-            tally_slice = tally.get_slice(scores=[openmc_score])
+        def _read_tally(sp, particle):
+            tally_slice = get_mesh_tally(sp, score, particle, mesh_name)
+            mesh = tally_slice.find_filter(openmc.MeshFilter).mesh
             mean = tally_slice.get_reshaped_data(
                 expand_dims=True, value="mean"
-            ).squeeze()
+            ).reshape(tuple(mesh.dimension))
             rel_err = tally_slice.get_reshaped_data(
                 expand_dims=True, value="rel_err"
-            ).squeeze()
+            ).reshape(tuple(mesh.dimension))
             return mean, rel_err, mesh
 
         with openmc.StatePoint(statepoint_filename) as sp:
             if particle == "total":
-                mean_n, rel_err_n, mesh = _read_tally(
-                    sp, f"{score}_neutron_on_{mesh_name}"
-                )
-                mean_p, rel_err_p, _ = _read_tally(
-                    sp, f"{score}_photon_on_{mesh_name}"
-                )
+                mean_n, rel_err_n, mesh = _read_tally(sp, "neutron")
+                mean_p, rel_err_p, _ = _read_tally(sp, "photon")
                 mean = mean_n + mean_p
                 rel_err = np.sqrt(rel_err_n**2 + rel_err_p**2)
             else:
-                tally_name = f"{score}_{particle}_on_{mesh_name}"
-                mean, rel_err, mesh = _read_tally(sp, tally_name)
-
-            if basis == "xy":
-                z_values = mesh.centroids[0][0][:, 2]
-                closest_idx = int(np.abs(z_values).argmin())
-                mean_2d = mean[:, :, closest_idx]
-                rel_err_2d = rel_err[:, :, closest_idx]
-            elif basis == "xz":
-                y_values = mesh.centroids[0][:, 0, 1]
-                closest_idx = int(np.abs(y_values).argmin())
-                mean_2d = mean[:, closest_idx, :]
-                rel_err_2d = rel_err[:, closest_idx, :]
-            elif basis == "yz":
-                x_values = mesh.centroids[:, 0, 0][:, 0]
-                closest_idx = int(np.abs(x_values).argmin())
-                mean_2d = mean[closest_idx, :, :]
-                rel_err_2d = rel_err[closest_idx, :, :]
-            else:
-                raise ValueError(
-                    f"basis must be 'xy', 'xz', or 'yz', got '{basis}'")
-
-            mesh_voxel_volume = mesh.volumes[0][0][0]
-            extent = mesh.bounding_box.extent[basis]
-            mesh_ll = mesh.lower_left
-            mesh_ur = mesh.upper_right
+                mean, rel_err, mesh = _read_tally(sp, particle)
 
-        # Scale: tally mean → physical units per pulse
+        # Scale: tally mean → physical units per pulse, using per-voxel
+        # volumes as CylindricalMesh voxels are not uniform
         if score == "dose":
-            mean_2d = (mean_2d * neutrons_per_pulse * 1e-9) / mesh_voxel_volume
+            mean = (mean * neutrons_per_pulse * 1e-9) / mesh.volumes
         else:  # flux or heating
-            mean_2d = (mean_2d * neutrons_per_pulse) / mesh_voxel_volume
+            mean = (mean * neutrons_per_pulse) / mesh.volumes
+
+        mean_2d, extent, _ = mesh_slice(mesh, mean, basis)
+        rel_err_2d, _, _ = mesh_slice(mesh, rel_err, basis)
+        mesh_ll, mesh_ur = mesh_bounds(mesh)
 
         mean_2d = ma.masked_invalid(np.rot90(mean_2d, -3))
         rel_err_2d = ma.masked_invalid(np.rot90(rel_err_2d, -3))
@@ -1285,9 +2888,19 @@ class OpenmcDagmcWrapper:
         output: str,
         particles: int,
         batches: int,
-        tally_mesh: openmc.Tally,
+        tally_mesh: openmc.RegularMesh | openmc.CylindricalMesh,
         born_mesh: openmc.RegularMesh = None,
-        weight_window: openmc.WeightWindows | None = None,
+        weight_window: openmc.WeightWindows | str | Path | list | None = None,
+        memory_budget_gb: float | None = None,
+        auto_coarsen: bool = False,
+        target_rel_error: float | None = None,
+        max_batches: int | None = None,
+        trigger_tallies: list[str] | None = None,
+        roi_mesh: openmc.MeshBase | None = None,
+        checkpoint_interval: int | None = None,
+        resume_from: str | Path | None = None,
+        threads: int | None = None,
+        mpi_args: list[str] | None = None,
     ):
         """Run a D1S (Decay-In-Storage) shutdown dose rate simulation.
 
@@ -1300,16 +2913,44 @@ class OpenmcDagmcWrapper:
             output: Path to save the resulting statepoint file.
             particles: Number of particles per batch.
             batches: Number of batches.
-            tally_mesh: Mesh over which photon dose is scored.
+            tally_mesh: RegularMesh or CylindricalMesh over which photon
+                dose is scored.
             born_mesh: Optional secondary mesh for MeshBornFilter to track
                 where dose-producing photons originate.
-            weight_window: Optional weight windows (currently unused —
-                photon WW via FW-CADIS is not yet supported).
+            weight_window: Optional weight windows for variance reduction:
+                an object, the path of a weight_windows HDF5 file, or a
+                list of these to combine neutron windows (generate_neutron_ww)
+                with decay photon windows (generate_photon_ww).
+            memory_budget_gb: Optional RAM budget in GB for the tally,
+                including the ParentNuclideFilter and MeshBornFilter bins.
+                The run is refused if the tally needs more than this.
+            auto_coarsen: If True, coarsen tally_mesh (and born_mesh) in
+                place to fit memory_budget_gb instead of refusing the run.
+            target_rel_error: Optional relative error (e.g. 0.05) at which
+                the run stops early. batches is then the minimum number of
+                batches.
+            max_batches: Batch cap when target_rel_error is set. Defaults
+                to five times batches.
+            trigger_tallies: Names of the tallies that must reach
+                target_rel_error. Defaults to all tallies.
+            roi_mesh: Optional mesh over the region of interest, only
+                voxels on it are checked against target_rel_error.
+            checkpoint_interval: Write a checkpoint statepoint every this
+                many batches to the run directory '<output>.run', which is
+                kept if the run fails.
+            resume_from: Restart from a checkpoint statepoint, or from the
+                latest one in a run directory such as '<output>.run'. Use
+                the same arguments as the interrupted run.
+            threads: OpenMP threads, overrides self.run_config.threads.
+            mpi_args: MPI launcher arguments (e.g. ['-n', '4']), overrides
+                self.run_config.mpi_args.
 
         Returns:
             Tuple of (openmc.Model, list[str]) — the model that was run and
             the sorted list of radionuclide names.
         """
+        from openmc.deplete import d1s
+
         settings = openmc.Settings()
         settings.particles = particles
         settings.batches = batches
@@ -1317,6 +2958,7 @@ class OpenmcDagmcWrapper:
         settings.photon_transport = True
         settings.output = {"tallies": False, "summary": False}
         settings.use_decay_photons = True
+        self._apply_weight_window(settings, weight_window)
 
         if fuel == 'dd':
             settings.source = self.dd_source
@@ -1366,29 +3008,138 @@ class OpenmcDagmcWrapper:
         print(f"Radionuclides: {len(radionuclides)}")
         d1s.prepare_tallies(model=model, nuclides=radionuclides)
 
-        if born_mesh is not None:
-            n_scoring = int(np.prod(tally_mesh.dimension))
-            n_born = int(np.prod(born_mesh.dimension))
-            mem_mb = n_scoring * n_born * len(radionuclides) * 8 / 1e6
-            print(f"Estimated tally memory: {mem_mb:.0f} MB  (before std_dev)")
-
-        # Clean old statepoint files before running
-        for f in Path(".").glob("statepoint.*.h5"):
-            f.unlink(missing_ok=True)
+        meshes = [tally_mesh] if born_mesh is None else [tally_mesh, born_mesh]
+        self._add_convergence_triggers(
+            model.tallies, settings, target_rel_error, max_batches,
+            trigger_tallies, roi_mesh)
+        self._enforce_memory_budget(
+            model.tallies, meshes, memory_budget_gb, auto_coarsen)
 
         print("Running D1S simulation ...")
-        statepoint = model.run()
-        shutil.move(statepoint, Path(output))
-        print(f"Statepoint saved to {output}")
+        self._run_model(
+            model, output, threads=threads, mpi_args=mpi_args,
+            checkpoint_interval=checkpoint_interval, resume_from=resume_from)
 
         self._last_model = model
         self._last_radionuclides = radionuclides
         return model, radionuclides
 
+    def _enforce_memory_budget(
+            self,
+            tallies,
+            meshes: list,
+            memory_budget_gb: float | None,
+            auto_coarsen: bool):
+        """Print the tally memory estimate and refuse or coarsen over-budget runs.
+
+        Args:
+            tallies: Tallies that will be run.
+            meshes: Meshes used by the tallies, coarsened in place when
+                auto_coarsen is True. Meshes of other MeshFilters of the
+                tallies, such as the roi_mesh copies added by
+                _add_convergence_triggers, are coarsened with them.
+            memory_budget_gb: RAM budget in GB, None only prints the estimate.
+            auto_coarsen: Coarsen the meshes instead of raising.
+        """
+        mem = tally_memory_bytes(tallies)
+        print(f"Estimated tally memory: {format_bytes(mem)} (value, sum and sum_sq)")
+        if memory_budget_gb is None:
+            return
+
+        budget = memory_budget_gb * 1024 ** 3
+        meshes = list(meshes)
+        for tally in tallies:
+            for tally_filter in tally.filters:
+                if (isinstance(tally_filter, openmc.MeshFilter)
+                        and not any(tally_filter.mesh is m for m in meshes)):
+                    meshes.append(tally_filter.mesh)
+        while mem > budget:
+            if not auto_coarsen:
+                raise ValueError(
+                    f"Tallies need {format_bytes(mem)}, more than the "
+                    f"{memory_budget_gb} GB budget. Use a coarser mesh or "
+                    "set auto_coarsen=True")
+            # tally bins scale with the product of all mesh voxel counts
+            factor = (budget / mem) ** (1 / len(meshes))
+            changed = [coarsen_mesh(mesh, factor) for mesh in meshes]
+            if not any(changed):
+                raise ValueError(
+                    f"Tallies need {format_bytes(mem)} with single-voxel "
+                    f"meshes, more than the {memory_budget_gb} GB budget")
+            # MeshFilter bins are set from the mesh when it is assigned
+            for tally in tallies:
+                for tally_filter in tally.filters:
+                    if isinstance(tally_filter, openmc.MeshFilter):
+                        tally_filter.mesh = tally_filter.mesh
+            mem = tally_memory_bytes(tallies)
+            print(
+                "Coarsened meshes to "
+                + ", ".join(f"{m.name} {tuple(m.dimension)}" for m in meshes)
+                + f", tally memory {format_bytes(mem)}")
+
+    def plan_mesh(
+            self,
+            memory_budget_gb: float,
+            component_name: str | None = None,
+            tally_type: str = 'dose',
+            n_nuclides: int | None = None,
+            born_mesh: openmc.RegularMesh | None = None,
+            cube_volume: float | None = None,
+            n_fuels: int = 1,
+            max_memory_gb: float = DEFAULT_POSTPROCESS_MEMORY_GB) -> MeshPlan:
+        """Choose mesh dimensions that fit a RAM budget for a tally type.
+
+        Args:
+            memory_budget_gb: RAM budget in GB for the tally while running.
+            component_name: Optional DAGMC material tag, the mesh covers this
+                component instead of the full geometry.
+            tally_type: One of 'flux', 'heating', 'dose', 'instant_dose' or 'd1s'.
+            n_nuclides: Number of ParentNuclideFilter bins for 'd1s'. If None
+                the radionuclides of the current geometry and materials are
+                counted with the depletion chain.
+            born_mesh: Optional mesh used in a MeshBornFilter.
+            cube_volume: Requested volume per voxel in cm^3, coarsened if it
+                does not fit. If None the finest mesh that fits is planned.
+            n_fuels: Number of D1S statepoints combined in post-processing.
+            max_memory_gb: max_memory_gb passed to correct_tallies_native.
+
+        Returns:
+            A MeshPlan with the dimension, tally size (including sum and
+            sum_sq) and post-processing RAM estimates.
+        """
+        if component_name is None:
+            bb = self.bounding_box
+        else:
+            bb_ll_ur = self.dagmc_index.bounding_box(component_name)
+            bb = openmc.BoundingBox(
+                lower_left=bb_ll_ur[0],
+                upper_right=bb_ll_ur[1])
+
+        if tally_type == 'd1s' and n_nuclides is None:
+            from openmc.deplete import d1s
+            model = openmc.Model(geometry=self.geometry, materials=self.materials)
+            n_nuclides = len(d1s.get_radionuclides(
+                model, chain_file=openmc.config["chain_file"]))
+
+        plan = plan_mesh(
+            bounding_box=bb,
+            memory_budget_gb=memory_budget_gb,
+            tally_type=tally_type,
+            n_nuclides=n_nuclides or 1,
+            born_mesh=born_mesh,
+            cube_volume=cube_volume,
+            n_fuels=n_fuels,
+            max_memory_gb=max_memory_gb,
+        )
+        print(plan)
+        return plan
+
     def get_full_mesh(
             self,
             cube_volume: float,
-            name: str = "full_ww_mesh") -> openmc.RegularMesh:
+            name: str = "full_ww_mesh",
+            memory_budget_gb: float | None = None,
+            **plan_kwargs) -> openmc.RegularMesh:
         """Create a regular mesh spanning the full geometry bounding box.
 
         The number of voxels is chosen so each has approximately the given
@@ -1397,50 +3148,119 @@ class OpenmcDagmcWrapper:
         Args:
             cube_volume: Target volume per voxel in cm^3.
             name: Name assigned to the mesh.
+            memory_budget_gb: Optional RAM budget in GB, the mesh is
+                coarsened to fit (see plan_mesh).
+            **plan_kwargs: tally_type, n_nuclides, born_mesh or n_fuels
+                passed to plan_mesh when memory_budget_gb is set.
 
         Returns:
             An openmc.RegularMesh covering the entire geometry.
         """
-        full_ww_mesh = openmc.RegularMesh().from_domain(
-            domain=self.geometry,
-            dimension=int(self.geometry.bounding_box.volume // (cube_volume**3)),
-            name=name
+        if memory_budget_gb is None:
+            dimension = max(1, int(self.bounding_box.volume // cube_volume))
+        else:
+            dimension = self.plan_mesh(
+                memory_budget_gb, cube_volume=cube_volume, **plan_kwargs).dimension
+        return openmc.RegularMesh.from_domain(
+            domain=self.bounding_box,
+            dimension=dimension,
+            name=name,
         )
-        return full_ww_mesh
 
     def get_component_mesh(
             self,
             component_name: str,
             cube_volume: float,
-            name: str | None = None) -> openmc.RegularMesh:
+            name: str | None = None,
+            memory_budget_gb: float | None = None,
+            **plan_kwargs) -> openmc.RegularMesh:
         """Create a regular mesh covering a single DAGMC component's bounding box.
 
         Args:
             component_name: DAGMC material tag name (e.g. 'casing_0').
             cube_volume: Target volume per voxel in cm^3.
             name: Optional mesh name (defaults to '<component_name>_mesh').
+            memory_budget_gb: Optional RAM budget in GB, the mesh is
+                coarsened to fit (see plan_mesh).
+            **plan_kwargs: tally_type, n_nuclides, born_mesh or n_fuels
+                passed to plan_mesh when memory_budget_gb is set.
 
         Returns:
             An openmc.RegularMesh bounding the named component.
         """
-        bb_ll_ur = di.get_bounding_box_from_h5m(
-            self.dagmc_filepath, component_name)
+        bb_ll_ur = self.dagmc_index.bounding_box(component_name)
         bb = openmc.BoundingBox(
             lower_left=bb_ll_ur[0],
             upper_right=bb_ll_ur[1])
+        if memory_budget_gb is None:
+            dimension = max(1, int(bb.volume // cube_volume))
+        else:
+            dimension = self.plan_mesh(
+                memory_budget_gb,
+                component_name=component_name,
+                cube_volume=cube_volume,
+                **plan_kwargs).dimension
         return openmc.RegularMesh.from_domain(
             domain=bb,
-            dimension=int(bb.volume // cube_volume),
+            dimension=dimension,
             name=name or f"{component_name}_mesh",
         )
 
+    def get_cylindrical_mesh(
+            self,
+            dimension: tuple[int, int, int],
+            component_name: str | None = None,
+            r_min: float = 0.0,
+            name: str | None = None) -> openmc.CylindricalMesh:
+        """Create a cylindrical mesh about the z axis for toroidal geometry.
+
+        The mesh axis passes through the centre of the bounding box in x and
+        y, and the mesh spans the box radially and in z, so no voxels are
+        spent on the corners of a Cartesian box. Use a single phi bin for an
+        axisymmetric R-Z tally.
+
+        Args:
+            dimension: Number of (r, phi, z) voxels.
+            component_name: Optional DAGMC material tag, the mesh covers this
+                component instead of the full geometry.
+            r_min: Inner radius in cm, e.g. to skip the central column.
+            name: Optional mesh name (defaults to '<component_name>_cyl_mesh'
+                or 'full_cyl_mesh').
+
+        Returns:
+            An openmc.CylindricalMesh covering the geometry or component.
+        """
+        if component_name is None:
+            lower_left = self.bounding_box.lower_left
+            upper_right = self.bounding_box.upper_right
+        else:
+            lower_left, upper_right = self.dagmc_index.bounding_box(component_name)
+        lower_left = np.asarray(lower_left, dtype=float)
+        upper_right = np.asarray(upper_right, dtype=float)
+
+        center = (lower_left + upper_right) / 2
+        r_max = float(np.max((upper_right - lower_left)[:2]) / 2)
+        if not 0 <= r_min < r_max:
+            raise ValueError(f"r_min must be in [0, {r_max}), got {r_min}")
+
+        n_r, n_phi, n_z = dimension
+        return openmc.CylindricalMesh(
+            r_grid=np.linspace(r_min, r_max, n_r + 1),
+            phi_grid=np.linspace(0, 2 * np.pi, n_phi + 1),
+            z_grid=np.linspace(lower_left[2], upper_right[2], n_z + 1),
+            origin=(center[0], center[1], 0.0),
+            name=name or (
+                f"{component_name}_cyl_mesh" if component_name else "full_cyl_mesh"),
+        )
+
     def correct_tallies_native(
         self,
         timesteps_and_source_rates: list,
         statepoint_d1s_dd: str | None = None,
         statepoint_d1s_dt: str | None = None,
         output: str = 'corrected_d1s_tallies_native.zarr',
-        max_memory_gb: float = 4.0,
+        max_memory_gb: float = DEFAULT_POSTPROCESS_MEMORY_GB,
+        sparse: bool = False,
     ):
         """Native OpenMC version of correct_tallies using standard Python API.
 
@@ -1464,7 +3284,15 @@ class OpenmcDagmcWrapper:
         max_memory_gb : float
             Approximate RAM budget in GB for the result chunks. The tally matrix
             itself is additional and cannot be avoided. Default 4.0 GB.
+        sparse : bool
+            If True, only voxels that are nonzero in any tally matrix are
+            stored: a zarr group with a (n_timesteps, n_active) 'values'
+            array and the flat 'index' of the active voxels. Read either
+            layout with CorrectedTallies. Default False (dense array).
         """
+        import zarr
+        from openmc.deplete import d1s
+
         # Determine which shot types are needed
         shot_types = set(entry[2] for entry in timesteps_and_source_rates)
         needs_dd = 'dd' in shot_types
@@ -1518,12 +3346,13 @@ class OpenmcDagmcWrapper:
         # ------------------------------------------------------------------
 
         def extract_tally_matrix(tally: openmc.Tally):
-            """Return (tally_matrix, mesh_shape, nuclides_list).
+            """Return (tally_matrix, mesh_shape, nuclides_list, mesh).
 
             tally_matrix has shape (n_nuclides, n_voxels), float64.
             """
             nuc_filter = tally.find_filter(openmc.ParentNuclideFilter)
             nuclides_list = list(nuc_filter.bins)
+            mesh = tally.find_filter(openmc.MeshFilter).mesh
             rows = []
             single_shape = None
             for nuc in nuclides_list:
@@ -1533,16 +3362,21 @@ class OpenmcDagmcWrapper:
                 )
                 arr = sl.get_reshaped_data(
                     value='mean', expand_dims=True).squeeze()
+                if arr.size == np.prod(mesh.dimension):
+                    # keep single-bin axes, e.g. one phi bin of an
+                    # axisymmetric CylindricalMesh
+                    arr = arr.reshape(tuple(mesh.dimension))
                 if single_shape is None:
                     single_shape = arr.shape
                 rows.append(arr.ravel())
                 del sl
             tally_matrix = np.stack(rows, axis=0)  # (n_nuclides, n_voxels)
-            return tally_matrix, single_shape, nuclides_list
+            return tally_matrix, single_shape, nuclides_list, mesh
 
         tally_matrix_dt = None
         tally_matrix_dd = None
         mesh_shape = None
+        mesh = None
         nuclides_list = None
         nuclides_list_dd = None
         nuclides_list_dt = None
@@ -1551,7 +3385,7 @@ class OpenmcDagmcWrapper:
             print("Extracting DT tally data from statepoint...")
             with openmc.StatePoint(statepoint_d1s_dt) as sp:
                 tally_dt = sp.get_tally(name="photon_dose_on_mesh")
-                tally_matrix_dt, mesh_shape, nuclides_list_dt = extract_tally_matrix(
+                tally_matrix_dt, mesh_shape, nuclides_list_dt, mesh = extract_tally_matrix(
                     tally_dt)
             nuclides_list = nuclides_list_dt
             gc.collect()
@@ -1560,7 +3394,7 @@ class OpenmcDagmcWrapper:
             print("Extracting DD tally data from statepoint...")
             with openmc.StatePoint(statepoint_d1s_dd) as sp:
                 tally_dd = sp.get_tally(name="photon_dose_on_mesh")
-                tally_matrix_dd, mesh_shape, nuclides_list_dd = extract_tally_matrix(
+                tally_matrix_dd, mesh_shape, nuclides_list_dd, mesh = extract_tally_matrix(
                     tally_dd)
             nuclides_list = nuclides_list_dd
             gc.collect()
@@ -1625,18 +3459,55 @@ class OpenmcDagmcWrapper:
         # ------------------------------------------------------------------
 
         full_shape = (n_timesteps_out, *mesh_shape)
-        print(f"Pre-allocating Zarr array with shape {full_shape}...")
-        zarr_store = zarr.open(
-            output,
-            mode='w',
-            shape=full_shape,
-            chunks=(1, *mesh_shape),
-            dtype='float64',
-        )
+        if sparse:
+            # voxels that are zero in every tally matrix stay zero at every
+            # timestep, so only the nonzero union is multiplied and stored
+            active = np.zeros(n_voxels, dtype=bool)
+            for tally_matrix in (tally_matrix_dt, tally_matrix_dd):
+                if tally_matrix is not None:
+                    for row in tally_matrix:
+                        active |= np.nan_to_num(row, nan=0.0, posinf=0.0, neginf=0.0) != 0
+            active_index = np.flatnonzero(active)
+            del active
+            if needs_dt:
+                tally_matrix_dt = tally_matrix_dt[:, active_index]
+            if needs_dd:
+                tally_matrix_dd = tally_matrix_dd[:, active_index]
+            gc.collect()
+            n_columns = len(active_index)
+            print(
+                f"Sparse output: {n_columns:,} of {n_voxels:,} voxels active "
+                f"({n_columns / max(1, n_voxels):.1%})")
+
+            zarr_root = zarr.open_group(output, mode='w')
+            zarr_store = zarr_root.zeros(
+                name='values',
+                shape=(n_timesteps_out, n_columns),
+                chunks=(1, max(1, min(n_columns, CHUNK_VOXELS))),
+                dtype='float64',
+            )
+            zarr_index = zarr_root.zeros(
+                name='index',
+                shape=(n_columns,),
+                chunks=(max(1, n_columns),),
+                dtype='int64',
+            )
+            zarr_index[:] = active_index
+        else:
+            n_columns = n_voxels
+            print(f"Pre-allocating Zarr array with shape {full_shape}...")
+            zarr_store = zarr.open(
+                output,
+                mode='w',
+                shape=full_shape,
+                chunks=(1, *voxel_chunks(mesh_shape)),
+                dtype='float64',
+            )
+            zarr_root = zarr_store
 
         # Choose timestep chunk size to stay within memory budget
         budget_bytes = max_memory_gb * (1024 ** 3)
-        chunk_t = max(1, int(budget_bytes / (n_voxels * 8)))
+        chunk_t = max(1, int(budget_bytes / (max(1, n_columns) * 8)))
         chunk_t = min(chunk_t, n_timesteps_out)
         print(
             f"Processing {n_timesteps_out} timesteps in chunks of {chunk_t} "
@@ -1652,15 +3523,18 @@ class OpenmcDagmcWrapper:
 
             # (chunk_size, n_voxels) = (chunk_size, n_nuclides) @ (n_nuclides, n_voxels)
             result_flat = np.zeros(
-                (chunk_end - chunk_start, n_voxels), dtype=np.float64)
+                (chunk_end - chunk_start, n_columns), dtype=np.float64)
 
             if needs_dt:
                 result_flat += factor_matrix_dt[chunk_start:chunk_end] @ tally_matrix_dt
             if needs_dd:
                 result_flat += factor_matrix_dd[chunk_start:chunk_end] @ tally_matrix_dd
 
-            result_chunk = result_flat.reshape(
-                chunk_end - chunk_start, *mesh_shape)
+            if sparse:
+                result_chunk = result_flat
+            else:
+                result_chunk = result_flat.reshape(
+                    chunk_end - chunk_start, *mesh_shape)
             result_chunk = np.nan_to_num(
                 result_chunk, nan=0.0, posinf=0.0, neginf=0.0)
 
@@ -1673,9 +3547,11 @@ class OpenmcDagmcWrapper:
         print(f"Zarr array written to {output}")
         print(f"Shape: {zarr_store.shape}, dtype: {zarr_store.dtype}")
 
-        zarr_store.attrs['dims'] = ['timestep', 'x', 'y', 'z']
-        zarr_store.attrs['timestep_indices'] = timestep_indices
-        zarr_store.attrs['shape'] = list(zarr_store.shape)
+        zarr_root.attrs['dims'] = ['timestep', *mesh_axis_names(mesh)]
+        zarr_root.attrs['mesh_type'] = type(mesh).__name__
+        zarr_root.attrs['timestep_indices'] = timestep_indices
+        zarr_root.attrs['shape'] = list(full_shape)
+        zarr_root.attrs['layout'] = 'sparse' if sparse else 'dense'
 
         print(f"Metadata written to {output}")
 
@@ -1683,9 +3559,9 @@ class OpenmcDagmcWrapper:
         self,
         output: str,
         timesteps_and_source_rates: list,
-        volume_normalization: float,
+        volume_normalization: float | None,
         corrected_d1s_tallies_files: list,
-        mesh: openmc.RegularMesh,
+        mesh: openmc.RegularMesh | openmc.CylindricalMesh,
         locations: list | None = None,
         labels: list | None = None,
         x_scale: str = "symlog",
@@ -1702,8 +3578,13 @@ class OpenmcDagmcWrapper:
             timesteps_and_source_rates: List of (duration_s, source_rate, phase)
                 tuples defining the irradiation and cooling schedule.
             volume_normalization: Mesh voxel volume (cm^3) for unit conversion.
-            corrected_d1s_tallies_files: List of zarr file paths, each with
-                shape (timesteps, x, y, z) in units of pSv-cm^3/s.
+                If None, each voxel is divided by its own volume from
+                mesh.volumes (required for CylindricalMesh, whose voxel
+                volumes are not uniform).
+            corrected_d1s_tallies_files: List of zarr file paths (dense or
+                sparse, see correct_tallies_native), each with shape
+                (timesteps, x, y, z) or (timesteps, r, phi, z) in units of
+                pSv-cm^3/s.
             mesh: The mesh used in the D1S simulation (for coordinate lookups).
             locations: List of (x, y, z) coordinates in cm to plot
                 individual dose traces for.
@@ -1712,6 +3593,8 @@ class OpenmcDagmcWrapper:
             x_scale: Matplotlib x-axis scale ('symlog', 'linear', or 'log').
             y_scale: Matplotlib y-axis scale ('log' or 'linear').
         """
+        plt = _pyplot()
+
         # multiplication by pico_to_milli converts from (pico) pSv to (milli)
         # mSv
         pico_to_milli = 1e-9
@@ -1740,8 +3623,13 @@ class OpenmcDagmcWrapper:
 
         if locations is None:
             locations = []
-        location_indexes = [
-            mesh.get_indices_at_coords(loc) for loc in locations]
+        location_indexes = [mesh_indices_at(mesh, loc) for loc in locations]
+
+        if volume_normalization is None:
+            volume_normalization = mesh.volumes
+        location_volumes = [
+            np.broadcast_to(volume_normalization, tuple(mesh.dimension))[index]
+            for index in location_indexes]
 
         # Validate labels parameter
         if labels is not None and len(labels) != len(
@@ -1752,19 +3640,18 @@ class OpenmcDagmcWrapper:
 
         for file_idx, corrected_d1s_tallies_file in enumerate(
                 corrected_d1s_tallies_files):
-            # Open zarr file directly (no dask dependency needed)
-            zarr_data = zarr.open(corrected_d1s_tallies_file, mode='r')
+            # dense or sparse store, read without a dask dependency
+            zarr_data = CorrectedTallies(corrected_d1s_tallies_file)
 
             # zarr_data has shape (timesteps, x, y, z) - no radionuclides
             # dimension
-            n_timesteps = zarr_data.shape[0]
+            n_timesteps = len(zarr_data)
 
             max_dose_in_timesteps = []
             for t_idx in range(n_timesteps):
                 # Load one timestep at a time to minimize memory usage
-                dose_t = zarr_data[t_idx, :, :, :]
-                max_val = float(np.max(dose_t)) * pico_to_milli * \
-                    seconds_to_hours / volume_normalization
+                max_val = zarr_data.max_value(t_idx, volume_normalization) * \
+                    pico_to_milli * seconds_to_hours
                 max_dose_in_timesteps.append(max_val)
 
             # Use custom label if provided, otherwise use default
@@ -1782,13 +3669,8 @@ class OpenmcDagmcWrapper:
 
             for i, (location, location_index) in enumerate(
                     zip(locations, location_indexes)):
-                location_doses = []
-                for t_idx in range(n_timesteps):
-                    # Access specific location for this timestep
-                    dose_at_location = float(
-                        zarr_data[t_idx, location_index[0], location_index[1], location_index[2]])
-                    dose_at_location *= pico_to_milli * seconds_to_hours / volume_normalization
-                    location_doses.append(dose_at_location)
+                location_doses = zarr_data.voxel_values(location_index) * \
+                    pico_to_milli * seconds_to_hours / location_volumes[i]
 
                 ax1.plot(
                     time_in_days,
@@ -1858,7 +3740,7 @@ class OpenmcDagmcWrapper:
         output_dir: str,
         timesteps_and_source_rates: list,
         corrected_d1s_tallies_file: str,
-        mesh: openmc.RegularMesh,
+        mesh: openmc.RegularMesh | openmc.CylindricalMesh,
         basis: str = 'xy',
         plot_center: list | None = None,
         plot_width: float | None = None,
@@ -1874,15 +3756,21 @@ class OpenmcDagmcWrapper:
             output_dir: Directory to write output PNGs into.
             timesteps_and_source_rates: List of (duration_s, source_rate, phase)
                 tuples defining the irradiation and cooling schedule.
-            corrected_d1s_tallies_file: Path to the zarr store with shape
-                (timesteps, x, y, z) in units of pSv-cm^3/s.
-            mesh: The mesh used in the D1S simulation.
+            corrected_d1s_tallies_file: Path to the zarr store (dense or
+                sparse) with shape (timesteps, x, y, z) or
+                (timesteps, r, phi, z) in units of pSv-cm^3/s.
+            mesh: The mesh used in the D1S simulation. CylindricalMesh
+                results are resampled onto the slice plane (see mesh_slice).
             basis: Slice orientation, 'xy', 'xz', or 'yz'.
             plot_center: Optional (x, y), (x, z), or (y, z) centre in metres
                 for a zoomed view.
             plot_width: Width of zoomed view in metres (requires plot_center).
             plot_height: Height of zoomed view in metres (requires plot_center).
         """
+        import matplotlib.collections as mcoll
+        from matplotlib.colors import LogNorm
+        plt = _pyplot()
+
         # multiplication by pico_to_milli converts from (pico) pSv to (milli)
         # mSv
         pico_to_milli = 1e-9
@@ -1890,37 +3778,30 @@ class OpenmcDagmcWrapper:
 
         timesteps = [item[0] for item in timesteps_and_source_rates]
 
-        mesh_z_values = mesh.centroids[1, 1, :][:, 2]
-        closest_mesh_index_to_z0 = np.abs(mesh_z_values).argmin()
-        mesh_z_value = mesh_z_values[closest_mesh_index_to_z0]
-        print('mesh_z_value for slice:', mesh_z_value)
-
-        mesh_y_values = mesh.centroids[1, :, 1][:, 1]
-        closest_mesh_index_to_y0 = np.abs(mesh_y_values).argmin()
-        mesh_y_value = mesh_y_values[closest_mesh_index_to_y0]
-        print('mesh_y_value for slice:', mesh_y_value)
-
-        mesh_x_values = mesh.centroids[:, 1, 1][:, 0]
-        closest_mesh_index_to_x0 = np.abs(mesh_x_values).argmin()
-        mesh_x_value = mesh_x_values[closest_mesh_index_to_x0]
-        print('mesh_x_value for slice:', mesh_x_value)
-
-        # divided by mesh element volume converts from mSv-cm3 to mSv
-        volume_normalization = mesh.volumes[0][0][0]
-
-        meter_scaled_extent = [
-            i / 100 for i in self.geometry.bounding_box.extent[basis]]
-
+        # divided by mesh element volume converts from mSv-cm3 to mSv, per
+        # voxel as CylindricalMesh voxels are not uniform
+        volume_normalization = mesh.volumes
+        volume_slice, mesh_extent, _ = mesh_slice(mesh, volume_normalization, basis)
+        slice_voxels, _, _ = mesh_slice_voxels(mesh, basis)
+        h_axis, v_axis, _ = _BASIS_AXES[basis]
+
+        # geometry plot origin in cm (OpenMC internal units), the voxel
+        # centres nearest 0 for a RegularMesh
+        lower_left, upper_right = mesh_bounds(mesh)
+        origin_cm = [0.0, 0.0, 0.0]
+        if not isinstance(mesh, openmc.CylindricalMesh):
+            for axis in range(3):
+                edges = np.linspace(
+                    lower_left[axis], upper_right[axis], mesh.dimension[axis] + 1)
+                centres = (edges[:-1] + edges[1:]) / 2
+                origin_cm[axis] = float(centres[np.abs(centres).argmin()])
+        print('slice origin [cm]:', origin_cm)
+
+        meter_scaled_extent = [i / 100 for i in mesh_extent]
         print('meter_scaled_extent:', meter_scaled_extent)
-        print(
-            'mesh.bounding_box.extent[basis]:',
-            mesh.bounding_box.extent[basis])
-
-        # Origin coordinates for geometry plot are in cm (OpenMC internal
-        # units)
-        origin_x_cm = mesh_x_value
-        origin_y_cm = mesh_y_value
-        origin_z_cm = mesh_z_value
+        # the dose is drawn over the mesh, the unzoomed view still frames
+        # the whole geometry
+        geometry_extent = [i / 100 for i in self.bounding_box.extent[basis]]
 
         zoom_enabled = (
             plot_center is not None
@@ -1931,41 +3812,15 @@ class OpenmcDagmcWrapper:
         plot_extent = meter_scaled_extent
         geom_width_cm = None
         if zoom_enabled:
-            if basis == 'xy':
-                center_x, center_y = plot_center
-                x_coords_m = mesh_x_values / 100
-                y_coords_m = mesh_y_values / 100
-                x_min = center_x - plot_width / 2
-                x_max = center_x + plot_width / 2
-                y_min = center_y - plot_height / 2
-                y_max = center_y + plot_height / 2
-                origin_x_cm = center_x * 100
-                origin_y_cm = center_y * 100
-            elif basis == 'xz':
-                center_x, center_z = plot_center
-                x_coords_m = mesh_x_values / 100
-                z_coords_m = mesh_z_values / 100
-                x_min = center_x - plot_width / 2
-                x_max = center_x + plot_width / 2
-                y_min = center_z - plot_height / 2
-                y_max = center_z + plot_height / 2
-                origin_x_cm = center_x * 100
-                origin_z_cm = center_z * 100
-            elif basis == 'yz':
-                center_y, center_z = plot_center
-                y_coords_m = mesh_y_values / 100
-                z_coords_m = mesh_z_values / 100
-                x_min = center_y - plot_width / 2
-                x_max = center_y + plot_width / 2
-                y_min = center_z - plot_height / 2
-                y_max = center_z + plot_height / 2
-                origin_y_cm = center_y * 100
-                origin_z_cm = center_z * 100
-            else:
-                raise ValueError(
-                    f"Unsupported basis '{basis}'. Expected 'xy', 'xz', or 'yz'.")
-
-            # Clamp to geometry bounds to avoid empty ranges
+            center_h, center_v = plot_center
+            x_min = center_h - plot_width / 2
+            x_max = center_h + plot_width / 2
+            y_min = center_v - plot_height / 2
+            y_max = center_v + plot_height / 2
+            origin_cm[h_axis] = center_h * 100
+            origin_cm[v_axis] = center_v * 100
+
+            # Clamp to mesh bounds to avoid empty ranges
             x_min = max(x_min, meter_scaled_extent[0])
             x_max = min(x_max, meter_scaled_extent[1])
             y_min = max(y_min, meter_scaled_extent[2])
@@ -1974,23 +3829,28 @@ class OpenmcDagmcWrapper:
             plot_extent = [x_min, x_max, y_min, y_max]
             geom_width_cm = (plot_width * 100, plot_height * 100)
 
-        da = zarr.open(corrected_d1s_tallies_file, mode='r')
-        scaled_max_tally_value_all_timesteps = float(
-            np.max(da)) * pico_to_milli * seconds_to_hours / volume_normalization
+            # slice pixel centres in metres along the two plot axes
+            h_edges = np.linspace(
+                meter_scaled_extent[0], meter_scaled_extent[1], volume_slice.shape[0] + 1)
+            v_edges = np.linspace(
+                meter_scaled_extent[2], meter_scaled_extent[3], volume_slice.shape[1] + 1)
+            h_coords_m = (h_edges[:-1] + h_edges[1:]) / 2
+            v_coords_m = (v_edges[:-1] + v_edges[1:]) / 2
+            x_idx = np.where(
+                (h_coords_m >= plot_extent[0]) & (h_coords_m <= plot_extent[1]))[0]
+            y_idx = np.where(
+                (v_coords_m >= plot_extent[2]) & (v_coords_m <= plot_extent[3]))[0]
+
+        da = CorrectedTallies(corrected_d1s_tallies_file)
+        scaled_max_tally_value_all_timesteps = max(
+            da.max_value(t_idx, volume_normalization)
+            for t_idx in range(len(da))) * pico_to_milli * seconds_to_hours
 
         # Determine origin for geometry outline based on basis
-        if basis == 'xy':
-            _geom_origin = (origin_x_cm, origin_y_cm, origin_z_cm)
-        elif basis == 'yz':
-            _geom_origin = (
-                origin_x_cm,
-                origin_y_cm,
-                origin_z_cm) if zoom_enabled else None
-        else:  # xz
-            _geom_origin = (
-                origin_x_cm,
-                origin_y_cm,
-                origin_z_cm) if zoom_enabled else None
+        if basis == 'xy' or zoom_enabled:
+            _geom_origin = tuple(origin_cm)
+        else:
+            _geom_origin = None
 
         # Cache geometry outline — render once and reuse across all timesteps
         print("Caching geometry outline (rendering once)...")
@@ -2046,56 +3906,23 @@ class OpenmcDagmcWrapper:
             fig, ax1 = plt.subplots(figsize=(10, 8))
 
             t_idx = i_cool - 1
-            if basis == 'xy':
-                data_slice = da[t_idx, :, :, closest_mesh_index_to_z0]
-            elif basis == 'xz':
-                data_slice = da[t_idx, :, closest_mesh_index_to_y0, :]
-            elif basis == 'yz':
-                data_slice = da[t_idx, closest_mesh_index_to_x0, :, :]
-
-            data_slice = np.squeeze(data_slice)
-
-            if zoom_enabled:
-                if basis == 'xy':
-                    x_mask = (
-                        x_coords_m >= plot_extent[0]) & (
-                        x_coords_m <= plot_extent[1])
-                    y_mask = (
-                        y_coords_m >= plot_extent[2]) & (
-                        y_coords_m <= plot_extent[3])
-                    x_idx = np.where(x_mask)[0]
-                    y_idx = np.where(y_mask)[0]
-                elif basis == 'xz':
-                    x_mask = (
-                        x_coords_m >= plot_extent[0]) & (
-                        x_coords_m <= plot_extent[1])
-                    z_mask = (
-                        z_coords_m >= plot_extent[2]) & (
-                        z_coords_m <= plot_extent[3])
-                    x_idx = np.where(x_mask)[0]
-                    y_idx = np.where(z_mask)[0]
-                else:  # basis == 'yz'
-                    y_mask = (
-                        y_coords_m >= plot_extent[0]) & (
-                        y_coords_m <= plot_extent[1])
-                    z_mask = (
-                        z_coords_m >= plot_extent[2]) & (
-                        z_coords_m <= plot_extent[3])
-                    x_idx = np.where(y_mask)[0]
-                    y_idx = np.where(z_mask)[0]
-
-                if len(x_idx) > 0 and len(y_idx) > 0:
-                    data_slice = data_slice[x_idx[0]                                            :x_idx[-1] + 1, y_idx[0]:y_idx[-1] + 1]
-
-            data_slice = (data_slice * pico_to_milli *
-                          seconds_to_hours) / volume_normalization
-
-            max_dose_in_timestep_slice = max(data_slice.flatten())
+            # only the voxels on the slice are read from the store
+            data_slice = da.timestep(t_idx, slice_voxels)
+            data_slice = data_slice / volume_slice
+
+            if zoom_enabled and len(x_idx) > 0 and len(y_idx) > 0:
+                data_slice = data_slice[x_idx[0]:x_idx[-1] + 1, y_idx[0]:y_idx[-1] + 1]
+
+            data_slice = data_slice * pico_to_milli * seconds_to_hours
+
+            max_dose_in_timestep_slice = float(np.nanmax(data_slice))
 
             data_slice = np.rot90(data_slice, 1)
 
-            # Create a masked array to make 0 values appear white in the plot
-            masked_data = ma.masked_where(data_slice == 0, data_slice)
+            # Create a masked array to make 0 values (and pixels outside a
+            # CylindricalMesh) appear white in the plot
+            masked_data = ma.masked_where(
+                (data_slice == 0) | np.isnan(data_slice), data_slice)
 
             # create a plot of the mean flux values
             cmap = plt.get_cmap('viridis').copy()
@@ -2173,6 +4000,9 @@ class OpenmcDagmcWrapper:
                     linewidths=_coll_data['linewidths'],
                     zorder=_coll_data['zorder'],
                 ))
+            if not zoom_enabled:
+                ax1.set_xlim(geometry_extent[0], geometry_extent[1])
+                ax1.set_ylim(geometry_extent[2], geometry_extent[3])
             time_in_seconds = sum(timesteps[1:i_cool])
 
             time_since_last_pulse = calculate_time_since_last_pulse(
@@ -2227,8 +4057,8 @@ class OpenmcDagmcWrapper:
 
     def plot_dose_born_from_maps(
         self,
-        scoring_mesh: openmc.RegularMesh,
-        born_mesh: openmc.RegularMesh,
+        scoring_mesh: openmc.RegularMesh | openmc.CylindricalMesh,
+        born_mesh: openmc.RegularMesh | openmc.CylindricalMesh,
         radionuclides: list,
         timesteps_and_source_rates: list,
         statepoint_path: str,
@@ -2242,8 +4072,26 @@ class OpenmcDagmcWrapper:
         """Plot dose and born-from contribution maps for all cooling timesteps.
 
         Produces a 3-panel figure (geometry | dose map | born-from map) for each
-        cooling timestep, saved as numbered PNGs in output_dir.
+        cooling timestep, saved as numbered PNGs in output_dir. A
+        RegularMesh dose map is the xz layer through the mesh centre in y
+        and its born-from map is summed along y. A CylindricalMesh dose map
+        is the R-Z plane through y=0 taken with mesh_slice, and its born-from
+        map is summed over phi and drawn on both sides of the mesh axis.
         """
+        for mesh in (scoring_mesh, born_mesh):
+            if not isinstance(mesh, (openmc.RegularMesh, openmc.CylindricalMesh)):
+                raise ValueError(
+                    "plot_dose_born_from_maps needs RegularMesh or "
+                    f"CylindricalMesh meshes, got {type(mesh).__name__}")
+
+        import h5py
+        from openmc.deplete import d1s
+        import matplotlib.collections as mcoll
+        from matplotlib.colors import LogNorm
+        from matplotlib.patches import Patch
+        from matplotlib.lines import Line2D
+        plt = _pyplot()
+
         out = Path(output_dir)
         out.mkdir(parents=True, exist_ok=True)
 
@@ -2254,16 +4102,13 @@ class OpenmcDagmcWrapper:
                 materials=self.materials)
 
         # ── Mesh dimensions ──────────────────────────────────────────────────
-        nx_s, ny_s, nz_s = scoring_mesh.dimension
-        n_scoring = int(np.prod(scoring_mesh.dimension))
-        nx_b, ny_b, nz_b = born_mesh.dimension
-        n_born = int(np.prod(born_mesh.dimension))
+        scoring_dimension = tuple(scoring_mesh.dimension)
+        n_scoring = int(np.prod(scoring_dimension))
+        born_dimension = tuple(born_mesh.dimension)
+        n_born = int(np.prod(born_dimension))
 
-        sx_min, sy_min, sz_min = scoring_mesh.lower_left
-        sx_max, sy_max, sz_max = scoring_mesh.upper_right
-        dx_s = (sx_max - sx_min) / nx_s
-        dy_s = (sy_max - sy_min) / ny_s
-        dz_s = (sz_max - sz_min) / nz_s
+        (sx_min, sy_min, sz_min), (sx_max, sy_max, sz_max) = mesh_bounds(scoring_mesh)
+        born_lower_left, born_upper_right = mesh_bounds(born_mesh)
 
         scoring_extent = [
             sx_min / 100,
@@ -2271,17 +4116,45 @@ class OpenmcDagmcWrapper:
             sz_min / 100,
             sz_max / 100]
         born_extent = [
-            born_mesh.lower_left[0] / 100, born_mesh.upper_right[0] / 100,
-            born_mesh.lower_left[2] / 100, born_mesh.upper_right[2] / 100,
+            born_lower_left[0] / 100, born_upper_right[0] / 100,
+            born_lower_left[2] / 100, born_upper_right[2] / 100,
         ]
 
         pico_to_milli = 1e-9
         seconds_to_hours = 3600
-        volume_norm = scoring_mesh.volumes[0][0][0]
+        # per voxel in tally bin order (first mesh index fastest), as
+        # CylindricalMesh voxels are not uniform
+        scoring_volumes = np.asarray(scoring_mesh.volumes).ravel(order='F')
+        centroids = np.asarray(scoring_mesh.centroids)
+
+        # Fixed xz slice through mesh centre y, or through y=0 for the R-Z
+        # plane of a CylindricalMesh
+        if isinstance(scoring_mesh, openmc.CylindricalMesh):
+            slice_y_cm = 0.0
+        else:
+            slice_y_cm = (sy_min + sy_max) / 2
+
+        def dose_slice(dose_per_voxel):
+            """xz slice of per-voxel values in tally bin order, indexed [z, x]."""
+            if isinstance(scoring_mesh, openmc.CylindricalMesh):
+                data, _, _ = mesh_slice(
+                    scoring_mesh,
+                    dose_per_voxel.reshape(scoring_dimension, order='F'), 'xz')
+                return data.T
+            dose_3d = dose_per_voxel.reshape(scoring_dimension[::-1])
+            if scoring_dimension[2] == 1:
+                return dose_3d[0]
+            return dose_3d[:, scoring_dimension[1] // 2, :]
+
+        def born_map(born_per_voxel):
+            """Born-from values projected on the xz plane, indexed [z, x]."""
+            if isinstance(born_mesh, openmc.CylindricalMesh):
+                born = born_per_voxel.reshape(born_dimension, order='F')
+                born = np.broadcast_to(born.sum(axis=1, keepdims=True), born.shape)
+                data, _, _ = mesh_slice(born_mesh, born, 'xz')
+                return data.T
+            return born_per_voxel.reshape(born_dimension[::-1]).sum(axis=1)
 
-        # Fixed xz slice through mesh centre y
-        slice_y_cm = (sy_min + sy_max) / 2
-        slice_iy = ny_s // 2
         origin_cm = ((sx_min + sx_max) / 2, slice_y_cm, (sz_min + sz_max) / 2)
         width_cm = ((sx_max - sx_min), (sz_max - sz_min))
 
@@ -2437,29 +4310,23 @@ class OpenmcDagmcWrapper:
             data_2d = (raw_mean @ tcf_vector).reshape(n_scoring, n_born)
 
             # 3-D dose map and peak
-            dose_per_scoring = data_2d.sum(axis=1)
-            dose_3d = dose_per_scoring.reshape(nz_s, ny_s, nx_s)
+            dose_per_scoring = data_2d.sum(axis=1) / scoring_volumes
 
             peak_flat = np.argmax(dose_per_scoring)
-            peak_iz, peak_iy, peak_ix = np.unravel_index(
-                np.argmax(dose_3d), dose_3d.shape)
-            peak_x_cm = sx_min + (peak_ix + 0.5) * dx_s
-            peak_y_cm = sy_min + (peak_iy + 0.5) * dy_s
-            peak_z_cm = sz_min + (peak_iz + 0.5) * dz_s
+            peak_x_cm, peak_y_cm, peak_z_cm = centroids[
+                np.unravel_index(peak_flat, scoring_dimension, order='F')]
 
-            # xz slice at fixed y-index
-            dose_slice_xz = dose_3d[peak_iz, :,
-                                    :] if nz_s == 1 else dose_3d[:, slice_iy, :]
+            # xz slice at fixed y
+            dose_slice_xz = dose_slice(dose_per_scoring)
 
-            # Born-from at peak dose, summed along y
-            born_3d = data_2d[peak_flat, :].reshape(nz_b, ny_b, nx_b)
-            born_map_xz = born_3d.sum(axis=1)
+            # Born-from at peak dose, summed along y (or phi)
+            born_map_xz = born_map(data_2d[peak_flat, :])
 
             # Convert to mSv/h
-            dose_mSv = (dose_slice_xz * pico_to_milli *
-                        seconds_to_hours) / volume_norm
-            masked_dose = ma.masked_where(dose_mSv == 0, dose_mSv)
-            max_dose = float(dose_mSv.max())
+            dose_mSv = dose_slice_xz * pico_to_milli * seconds_to_hours
+            masked_dose = ma.masked_where(
+                (dose_mSv == 0) | np.isnan(dose_mSv), dose_mSv)
+            max_dose = float(np.nanmax(dose_mSv))
 
             print(
                 f"  Peak at ({peak_x_cm/100:.2f}m, {peak_y_cm/100:.2f}m, {peak_z_cm/100:.2f}m)"
@@ -2606,7 +4473,7 @@ class OpenmcDagmcWrapper:
             plt.savefig(filename, dpi=dpi, bbox_inches='tight')
             print(f"  Saved {filename}")
             plt.close(fig)
-            del data_2d, dose_per_scoring, dose_3d, born_3d, born_map_xz
+            del data_2d, dose_per_scoring, born_map_xz
             del dose_slice_xz, dose_mSv, masked_dose, fig
             gc.collect()
 
@@ -2645,6 +4512,9 @@ class OpenmcDagmcWrapper:
         Returns:
             dict with keys: nuclide_names, time_days, pct_by_nuclide, significant.
         """
+        from openmc.deplete import Chain, d1s
+        plt = _pyplot()
+
         # ── Step 1: Load statepoint, extract metadata & per-nuclide spatial sums ──
         print("Opening statepoint ...")
         sp = openmc.StatePoint(statepoint_path)
@@ -2772,7 +4642,7 @@ class OpenmcDagmcWrapper:
 
         pathway_labels = {}
         if material_nuclides:
-            chain = openmc.deplete.Chain.from_xml(str(self.chain_file))
+            chain = Chain.from_xml(str(self.chain_file))
             for target in significant:
                 routes = []
                 for nuclide in chain.nuclides:
@@ -2875,10 +4745,12 @@ class OpenmcDagmcWrapper:
             dict keyed by target nuclide, each value a list of dicts with
             keys: parent, reaction, in_materials.
         """
+        from openmc.deplete import Chain
+
         if dag_tag_to_material is not None and self.materials is None:
             self.build_materials(dag_tag_to_material)
 
-        chain = openmc.deplete.Chain.from_xml(str(self.chain_file))
+        chain = Chain.from_xml(str(self.chain_file))
 
         material_nuclides = None
         if self.materials is not None:
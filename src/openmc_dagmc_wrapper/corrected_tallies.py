@@ -0,0 +1,146 @@
+from pathlib import Path
+
+import numpy as np
+
+# voxels per stored chunk of a timestep, so reading a plot slice does not
+# decompress the whole timestep
+CHUNK_VOXELS = 2 ** 20
+
+
+def voxel_chunks(mesh_shape: tuple) -> tuple:
+    """Chunk shape of one dense timestep holding at most about CHUNK_VOXELS.
+
+    The mesh is split along its leading axes, whole trailing axes are kept.
+    """
+    chunks = list(mesh_shape)
+    for axis in range(len(chunks)):
+        rest = int(np.prod(chunks[axis + 1:]))
+        chunks[axis] = max(1, min(chunks[axis], CHUNK_VOXELS // max(1, rest)))
+        if int(np.prod(chunks)) <= CHUNK_VOXELS:
+            break
+    return tuple(chunks)
+
+
+class CorrectedTallies:
+    """Reader for the zarr store written by correct_tallies_native.
+
+    Handles the dense layout, a (n_timesteps, *mesh_shape) array, and the
+    sparse layout, a group holding a (n_timesteps, n_active) 'values' array
+    and the sorted flat 'index' of the active voxels. Sparse timesteps are
+    rebuilt as dense arrays on demand, one timestep at a time, or only at
+    the voxels a plot slice shows.
+
+    Args:
+        path: Path to the zarr store.
+    """
+
+    def __init__(self, path: str | Path):
+        import zarr
+
+        self.path = Path(path)
+        store = zarr.open(str(path), mode='r')
+        self.attrs = dict(store.attrs)
+        self.sparse = isinstance(store, zarr.Group)
+        if self.sparse:
+            self._values = store['values']
+            self.index = np.asarray(store['index'][:], dtype=np.int64)
+            self.shape = tuple(self.attrs['shape'])
+        else:
+            self._values = store
+            self.index = None
+            self.shape = tuple(store.shape)
+
+    @property
+    def mesh_shape(self) -> tuple:
+        """Shape of one timestep, the mesh dimension."""
+        return self.shape[1:]
+
+    @property
+    def n_active(self) -> int:
+        """Number of stored voxels (all voxels for a dense store)."""
+        if self.sparse:
+            return len(self.index)
+        return int(np.prod(self.mesh_shape))
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def timestep(self, t_idx: int, voxels: np.ndarray | None = None) -> np.ndarray:
+        """Return one timestep as a dense array of shape mesh_shape.
+
+        Args:
+            t_idx: Timestep index.
+            voxels: Optional integer array of flat voxel indices, -1 for
+                none, e.g. from mesh_slice_voxels. Only these voxels are
+                read and the result has the shape of voxels, NaN where the
+                index is -1.
+        """
+        if voxels is not None:
+            voxels = np.asarray(voxels)
+            inside = voxels >= 0
+            wanted, inverse = np.unique(voxels[inside], return_inverse=True)
+            values = np.full(voxels.shape, np.nan)
+            values[inside] = self._read_voxels(t_idx, wanted)[inverse]
+            return values
+        if not self.sparse:
+            return np.asarray(self._values[t_idx])
+        dense = np.zeros(int(np.prod(self.mesh_shape)), dtype=np.float64)
+        dense[self.index] = self._values[t_idx]
+        return dense.reshape(self.mesh_shape)
+
+    def _read_voxels(self, t_idx: int, flat: np.ndarray) -> np.ndarray:
+        """Values of one timestep at sorted unique flat voxel indices."""
+        if flat.size == 0:
+            return np.zeros(0)
+        if not self.sparse:
+            coords = np.unravel_index(flat, self.mesh_shape)
+            return np.asarray(
+                self._values.vindex[(np.full(flat.size, t_idx), *coords)],
+                dtype=np.float64)
+        values = np.zeros(flat.size)
+        pos = np.searchsorted(self.index, flat)
+        found = pos < len(self.index)
+        found[found] = self.index[pos[found]] == flat[found]
+        if found.any():
+            values[found] = self._values.oindex[t_idx, pos[found]]
+        return values
+
+    def max_value(self, t_idx: int, volume_normalization=1.0) -> float:
+        """Maximum of one timestep divided by the voxel volume.
+
+        Args:
+            t_idx: Timestep index.
+            volume_normalization: Scalar voxel volume or per-voxel array of
+                shape mesh_shape.
+
+        Returns:
+            The maximum normalised value, inactive voxels count as zero.
+        """
+        if not self.sparse:
+            return float(np.max(self.timestep(t_idx) / volume_normalization))
+        values = np.asarray(self._values[t_idx])
+        if np.ndim(volume_normalization):
+            values = values / np.asarray(volume_normalization).ravel()[self.index]
+        else:
+            values = values / volume_normalization
+        if self.n_active < np.prod(self.mesh_shape):
+            return float(np.max(values, initial=0.0))
+        return float(np.max(values))
+
+    def voxel_values(self, indices) -> np.ndarray:
+        """Return the values of one voxel for every timestep.
+
+        Args:
+            indices: Voxel indices, one per mesh axis.
+
+        Returns:
+            Array of length n_timesteps.
+        """
+        indices = tuple(int(i) for i in indices)
+        if not self.sparse:
+            return np.asarray(self._values[(slice(None), *indices)])
+        flat = np.ravel_multi_index(indices, self.mesh_shape)
+        pos = int(np.searchsorted(self.index, flat))
+        if pos < len(self.index) and self.index[pos] == flat:
+            return np.asarray(self._values[:, pos])
+        return np.zeros(len(self))
@@ -0,0 +1,247 @@
+from pathlib import Path
+import json
+import os
+
+import numpy as np
+
+# relative error below which a tally bin counts as converged
+DEFAULT_REL_ERR_THRESHOLD = 0.1
+
+# tally result rows read at a time, keeps RAM flat for multi-GB D1S tallies
+_READ_CHUNK_BYTES = 256 * 1024 ** 2
+
+
+def statistics_path(statepoint: str | Path) -> Path:
+    """Path of the run statistics written next to a statepoint."""
+    statepoint = Path(statepoint)
+    return statepoint.with_name(f'{statepoint.name}.fom.json')
+
+
+def run_statistics(
+        statepoint: str | Path,
+        threshold: float = DEFAULT_REL_ERR_THRESHOLD) -> dict:
+    """Relative error statistics and figures of merit of a statepoint.
+
+    For every tally with results, the relative errors of the bins that
+    scored are summarised by their median and 95th percentile, and the
+    fraction of all bins below threshold is counted, bins that did not
+    score counting as above it. The figure of merit is 1 / (R^2 T) with R
+    the median relative error and T the transport time, so runs of the
+    same model with different variance reduction or mesh settings can be
+    compared: a higher figure of merit reaches a given error sooner.
+
+    Args:
+        statepoint: Statepoint file to read.
+        threshold: Relative error counted as converged.
+
+    Returns:
+        Dict with the statepoint name, 'statepoint_stamp' (its size and
+        modification time, see statepoint_stamp), 'transport_seconds',
+        'total_seconds', 'n_realizations', 'threshold' and per tally name
+        under 'tallies': 'n_bins', 'n_scored', 'median_rel_err',
+        'p95_rel_err', 'fraction_below' and 'fom' (None if no bin scored).
+    """
+    import h5py
+
+    statepoint = Path(statepoint)
+    stamp = statepoint_stamp(statepoint)
+    with h5py.File(statepoint, 'r') as f:
+        runtime = {name: float(f['runtime'][name][()]) for name in f['runtime']}
+        transport_seconds = runtime.get(
+            'transport', runtime.get('active batches', runtime.get('total')))
+        tallies = {}
+        for group_name in f['tallies']:
+            group = f['tallies'][group_name]
+            # internal tallies are written without results
+            if not group_name.startswith('tally ') or 'results' not in group:
+                continue
+            name = group['name'][()].decode() if 'name' in group else ''
+            rel_err = _rel_errors(group['results'], int(group['n_realizations'][()]))
+            n_bins = int(np.prod(group['results'].shape[:-1]))
+            tallies[name or group_name] = _summarise(
+                rel_err, n_bins, threshold, transport_seconds)
+        n_realizations = int(f['n_realizations'][()])
+
+    return {
+        'statepoint': statepoint.name,
+        'statepoint_stamp': stamp,
+        'transport_seconds': transport_seconds,
+        'total_seconds': runtime.get('total'),
+        'n_realizations': n_realizations,
+        'threshold': threshold,
+        'tallies': tallies,
+    }
+
+
+def statepoint_stamp(statepoint: str | Path) -> dict:
+    """Size and modification time of a statepoint, to tell if statistics are stale."""
+    stat = Path(statepoint).stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def write_run_statistics(
+        statepoint: str | Path,
+        threshold: float = DEFAULT_REL_ERR_THRESHOLD) -> Path:
+    """Write run_statistics of a statepoint to '<statepoint>.fom.json'.
+
+    Returns:
+        The path of the JSON file.
+    """
+    stats = run_statistics(statepoint, threshold)
+    path = statistics_path(statepoint)
+    _write_json(path, stats)
+    return path
+
+
+def copy_run_statistics(statepoint: str | Path, other: str | Path) -> Path | None:
+    """Write the '.fom.json' of statepoint for other, a copy of the same run.
+
+    The statistics are computed again if those of statepoint are stale.
+
+    Returns:
+        The path of the JSON file written, or None if statepoint has no
+        statistics file.
+    """
+    source = statistics_path(statepoint)
+    if not source.is_file():
+        return None
+    stats = json.loads(source.read_text())
+    if stats.get('statepoint_stamp') != statepoint_stamp(statepoint):
+        return write_run_statistics(other, stats['threshold'])
+    stats['statepoint'] = Path(other).name
+    stats['statepoint_stamp'] = statepoint_stamp(other)
+    path = statistics_path(other)
+    _write_json(path, stats)
+    return path
+
+
+def _write_json(path: Path, data: dict):
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        tmp_path.write_text(json.dumps(data, indent=2))
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def load_run_statistics(
+        run: str | Path,
+        threshold: float | None = None) -> dict:
+    """Read run statistics from a '.fom.json' file or a statepoint.
+
+    A '.fom.json' file is used when it was written with the same threshold
+    and its statepoint is missing or unchanged since (same size and
+    modification time), otherwise the statistics are computed from the
+    statepoint. For a statepoint, its '.fom.json' file is used the same way.
+    """
+    run = Path(run)
+    if run.name.endswith('.fom.json'):
+        path = run
+        run = run.with_name(run.name[:-len('.fom.json')])
+    else:
+        path = statistics_path(run)
+    if path.is_file():
+        stats = json.loads(path.read_text())
+        current = (
+            not run.is_file()
+            or stats.get('statepoint_stamp') == statepoint_stamp(run))
+        if current and (threshold is None or stats['threshold'] == threshold):
+            return stats
+    if threshold is None:
+        threshold = DEFAULT_REL_ERR_THRESHOLD
+    return run_statistics(run, threshold)
+
+
+def compare_runs(
+        baseline: str | Path,
+        candidate: str | Path,
+        threshold: float | None = None) -> str:
+    """Report how the relative errors and figures of merit of two runs compare.
+
+    Tallies are matched by name. The FOM ratio is candidate over
+    baseline, so a ratio above 1 means the candidate converges faster,
+    e.g. a weight window that paid off.
+
+    Args:
+        baseline: Statepoint or '.fom.json' file of the reference run.
+        candidate: Statepoint or '.fom.json' file of the run to compare.
+        threshold: Relative error counted as converged. Defaults to the
+            threshold the statistics files were written with.
+
+    Returns:
+        The report text.
+    """
+    base = load_run_statistics(baseline, threshold)
+    cand = load_run_statistics(candidate, threshold)
+
+    lines = [
+        f"baseline:  {base['statepoint']} ({base['transport_seconds']:.1f} s transport, "
+        f"{base['n_realizations']} realizations)",
+        f"candidate: {cand['statepoint']} ({cand['transport_seconds']:.1f} s transport, "
+        f"{cand['n_realizations']} realizations)",
+        f"{'tally':<40} {'median R':>17} {'p95 R':>17} "
+        f"{'R < ' + str(cand['threshold']):>15} {'FOM ratio':>10}",
+    ]
+
+    def pair(a, b, fmt):
+        return f"{_format(a, fmt)} -> {_format(b, fmt)}"
+
+    for name in base['tallies']:
+        if name not in cand['tallies']:
+            lines.append(f"{name:<40} only in baseline")
+            continue
+        a, b = base['tallies'][name], cand['tallies'][name]
+        ratio = None
+        if a['fom'] and b['fom'] is not None:
+            ratio = b['fom'] / a['fom']
+        lines.append(
+            f"{name:<40} {pair(a['median_rel_err'], b['median_rel_err'], '.4f'):>17} "
+            f"{pair(a['p95_rel_err'], b['p95_rel_err'], '.4f'):>17} "
+            f"{pair(a['fraction_below'], b['fraction_below'], '.0%'):>15} "
+            f"{_format(ratio, '.2f'):>10}")
+    for name in cand['tallies']:
+        if name not in base['tallies']:
+            lines.append(f"{name:<40} only in candidate")
+    return '\n'.join(lines)
+
+
+def _format(value, fmt):
+    return '-' if value is None else format(value, fmt)
+
+
+def _rel_errors(results, n: int) -> np.ndarray:
+    """Relative errors of the bins with a nonzero mean, a block of rows at a time."""
+    n_rows = results.shape[0]
+    if n_rows == 0 or n < 2:
+        return np.empty(0)
+    row_bytes = max(1, results.dtype.itemsize * results.size // n_rows)
+    step = max(1, _READ_CHUNK_BYTES // row_bytes)
+    rel_err = []
+    for start in range(0, n_rows, step):
+        block = results[start:min(start + step, n_rows)]
+        mean = block[..., 0] / n
+        variance = (block[..., 1] / n - mean ** 2) / (n - 1)
+        scored = mean != 0
+        std_dev = np.sqrt(np.maximum(variance[scored], 0))
+        rel_err.append(std_dev / np.abs(mean[scored]))
+    return np.concatenate(rel_err)
+
+
+def _summarise(rel_err: np.ndarray, n_bins: int, threshold: float, seconds) -> dict:
+    if rel_err.size == 0:
+        return {
+            'n_bins': n_bins, 'n_scored': 0, 'median_rel_err': None,
+            'p95_rel_err': None, 'fraction_below': 0.0, 'fom': None}
+    median = float(np.median(rel_err))
+    fom = None
+    if median > 0 and seconds:
+        fom = 1 / (median ** 2 * seconds)
+    return {
+        'n_bins': n_bins,
+        'n_scored': int(rel_err.size),
+        'median_rel_err': median,
+        'p95_rel_err': float(np.percentile(rel_err, 95)),
+        'fraction_below': float(np.count_nonzero(rel_err < threshold) / n_bins),
+        'fom': fom,
+    }
@@ -0,0 +1,366 @@
+from pathlib import Path
+import json
+import os
+
+import numpy as np
+
+from openmc_dagmc_wrapper.hashing import file_sha256
+
+INDEX_FORMAT_VERSION = 1
+
+# MOAB set flag, the set contents are stored as (start handle, count) pairs
+_RANGE_COMPRESSED = 0x8
+
+
+def default_index_path(filename: str | Path) -> Path:
+    """Return the on-disk index location for an h5m file ('<name>.index.json')."""
+    filename = Path(filename)
+    return filename.with_name(filename.name + '.index.json')
+
+
+class DagmcIndex:
+    """Per-volume metadata of a DAGMC h5m file.
+
+    Holds the material tag, geometric volume, bounding surface areas and
+    axis-aligned bounding box of every DAGMC volume so that callers do not
+    re-read the h5m file for each lookup. Instances are normally obtained
+    with DagmcIndex.load, which reuses an index saved next to the h5m file
+    when the file size, mtime or SHA-256 hash show it is still current.
+
+    Args:
+        filename: Path to the DAGMC h5m file.
+        size: File size in bytes when the index was built.
+        mtime_ns: File modification time (ns) when the index was built.
+        sha256: Hex SHA-256 digest of the file contents.
+        volumes: Mapping of DAGMC volume id to a dict with keys 'material',
+            'volume', 'surface_areas' and 'bounding_box'.
+    """
+
+    def __init__(
+            self,
+            filename: str | Path,
+            size: int,
+            mtime_ns: int,
+            sha256: str,
+            volumes: dict):
+        self.filename = Path(filename)
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.sha256 = sha256
+        self.volumes = volumes
+
+    @classmethod
+    def from_h5m(
+            cls,
+            filename: str | Path,
+            sha256: str | None = None) -> 'DagmcIndex':
+        """Build the index by reading the h5m file.
+
+        The file is opened once and every quantity is read for all volumes
+        from that handle: the triangles of each surface are measured once
+        and shared by the two volumes on either side of it.
+
+        Args:
+            filename: Path to the DAGMC h5m file.
+            sha256: Optional precomputed SHA-256 of the file, avoids hashing
+                the file a second time.
+
+        Returns:
+            A new DagmcIndex.
+        """
+        import h5py
+
+        filename = Path(filename)
+        if not filename.is_file():
+            raise FileNotFoundError(
+                f"DAGMC file {filename} does not exist")
+
+        stat = filename.stat()
+        print(f'indexing DAGMC file {filename}')
+
+        with h5py.File(filename, 'r') as f:
+            volumes = _read_volumes(f)
+
+        if sha256 is None:
+            sha256 = file_sha256(filename)
+
+        return cls(
+            filename=filename,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha256=sha256,
+            volumes=volumes,
+        )
+
+    @classmethod
+    def load(
+            cls,
+            filename: str | Path,
+            index_path: str | Path | None = None,
+            save: bool = True) -> 'DagmcIndex':
+        """Return an index for filename, reusing a saved one when still valid.
+
+        A saved index is reused without hashing when the file size and mtime
+        are unchanged. If only the mtime differs (e.g. the file was copied or
+        touched) the file is hashed and the index is reused when the hash
+        matches. Otherwise the h5m file is re-indexed.
+
+        Args:
+            filename: Path to the DAGMC h5m file.
+            index_path: Where the index is stored. Defaults to
+                '<filename>.index.json' next to the h5m file.
+            save: Write the (re)built index to index_path.
+
+        Returns:
+            A DagmcIndex for the current file contents.
+        """
+        filename = Path(filename)
+        index_path = Path(index_path) if index_path else default_index_path(filename)
+        stat = filename.stat()
+
+        sha256 = None
+        saved = cls._read(index_path, filename)
+        if saved is not None and saved.size == stat.st_size:
+            if saved.mtime_ns == stat.st_mtime_ns:
+                return saved
+            sha256 = file_sha256(filename)
+            if sha256 == saved.sha256:
+                saved.mtime_ns = stat.st_mtime_ns
+                if save:
+                    saved.save(index_path)
+                return saved
+
+        index = cls.from_h5m(filename, sha256=sha256)
+        if save:
+            index.save(index_path)
+        return index
+
+    @classmethod
+    def _read(cls, index_path: Path, filename: Path) -> 'DagmcIndex | None':
+        if not index_path.is_file():
+            return None
+        try:
+            data = json.loads(index_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get('format_version') != INDEX_FORMAT_VERSION:
+            return None
+        return cls(
+            filename=filename,
+            size=data['size'],
+            mtime_ns=data['mtime_ns'],
+            sha256=data['sha256'],
+            volumes={int(k): v for k, v in data['volumes'].items()},
+        )
+
+    def save(self, index_path: str | Path | None = None):
+        """Write the index as JSON, replacing any existing file atomically.
+
+        Args:
+            index_path: Output path. Defaults to '<filename>.index.json'.
+        """
+        index_path = Path(index_path) if index_path else default_index_path(self.filename)
+        data = {
+            'format_version': INDEX_FORMAT_VERSION,
+            'filename': self.filename.name,
+            'size': self.size,
+            'mtime_ns': self.mtime_ns,
+            'sha256': self.sha256,
+            'volumes': {str(k): v for k, v in self.volumes.items()},
+        }
+        tmp_path = index_path.with_name(f'.{index_path.name}.{os.getpid()}.tmp')
+        try:
+            tmp_path.write_text(json.dumps(data))
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            print(f'WARNING: could not save DAGMC index to {index_path}: {e}')
+
+    def is_current(self) -> bool:
+        """True if the h5m file size and mtime still match the index."""
+        try:
+            stat = self.filename.stat()
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    @property
+    def material_names(self) -> list[str]:
+        """Sorted list of the DAGMC material tags (without the 'mat:' prefix)."""
+        return sorted({v['material'] for v in self.volumes.values()})
+
+    def _volume_ids_for_material(self, material: str) -> list[int]:
+        vol_ids = [
+            vol_id for vol_id, v in self.volumes.items()
+            if v['material'] == material
+        ]
+        if not vol_ids:
+            raise ValueError(
+                f"No volumes found for material {material!r}. "
+                f"Available materials: {self.material_names}")
+        return vol_ids
+
+    def volumes_by_material_name(self) -> dict[str, float]:
+        """Geometric volume per material tag, summed over all its cells."""
+        volumes: dict[str, float] = {}
+        for v in self.volumes.values():
+            volumes[v['material']] = volumes.get(v['material'], 0.0) + v['volume']
+        return volumes
+
+    def surface_areas_by_material_name(self, material: str) -> list[float]:
+        """Areas of every DAGMC surface bounding the cells of a material tag."""
+        areas = []
+        for vol_id in self._volume_ids_for_material(material):
+            areas.extend(self.volumes[vol_id]['surface_areas'])
+        return areas
+
+    def bounding_box(self, material: str) -> tuple[list, list]:
+        """Combined (lower_left, upper_right) of the cells of a material tag."""
+        boxes = [
+            self.volumes[vol_id]['bounding_box']
+            for vol_id in self._volume_ids_for_material(material)
+            if self.volumes[vol_id]['bounding_box'] is not None
+        ]
+        if not boxes:
+            raise ValueError(f"No triangles found for material {material!r}")
+        lower_left = [min(b[0][i] for b in boxes) for i in range(3)]
+        upper_right = [max(b[1][i] for b in boxes) for i in range(3)]
+        return lower_left, upper_right
+
+
+def _read_volumes(f) -> dict:
+    """Material, volume, surface areas and bounding box of every DAGMC volume.
+
+    Reads the MOAB layout of an open h5m file: node coordinates, Tri3
+    connectivity, entity sets and their CATEGORY, GEOM_DIMENSION, NAME,
+    GLOBAL_ID and GEOM_SENSE_2 tags. Only volumes in a 'mat:' group are
+    returned, keyed by GLOBAL_ID.
+    """
+    nodes = f['tstt/nodes/coordinates']
+    coords = nodes[()]
+    node_start = int(nodes.attrs['start_id'])
+    tri = f['tstt/elements/Tri3/connectivity']
+    tri_nodes = tri[()] - node_start
+    tri_start = int(tri.attrs['start_id'])
+    tri_end = tri_start + len(tri_nodes) - 1
+
+    set_list = f['tstt/sets/list']
+    set_start = int(set_list.attrs['start_id'])
+    set_list = set_list[()]
+    n_sets = len(set_list)
+    contents = _set_lists(f, 'contents', set_list[:, 0], set_list[:, 3])
+    children = _set_lists(f, 'children', set_list[:, 1])
+
+    categories = _set_tag(f, 'CATEGORY', set_start, n_sets)
+    geom_dim = _set_tag(f, 'GEOM_DIMENSION', set_start, n_sets)
+    names = _set_tag(f, 'NAME', set_start, n_sets)
+    global_ids = _set_tag(f, 'GLOBAL_ID', set_start, n_sets)
+    senses = _set_tag(f, 'GEOM_SENSE_2', set_start, n_sets)
+
+    def handles_of(dim, category):
+        return {
+            h for h in range(set_start, set_start + n_sets)
+            if geom_dim.get(h) == dim or categories.get(h) == category}
+
+    surface_handles = handles_of(2, 'Surface')
+    volume_handles = handles_of(3, 'Volume')
+
+    surfaces = {}
+    for handle in surface_handles:
+        tris = contents[handle - set_start]
+        tris = tris[(tris >= tri_start) & (tris <= tri_end)] - tri_start
+        if tris.size == 0:
+            continue
+        v0, v1, v2 = (coords[tri_nodes[tris, i]] for i in range(3))
+        points = coords[np.unique(tri_nodes[tris])]
+        surfaces[handle] = {
+            'area': float(0.5 * np.linalg.norm(np.cross(v1 - v0, v2 - v0), axis=1).sum()),
+            'signed_volume': float(np.einsum('ij,ij->i', v0, np.cross(v1, v2)).sum() / 6),
+            'lower_left': points.min(axis=0),
+            'upper_right': points.max(axis=0),
+        }
+
+    materials = {}
+    for i in range(n_sets):
+        name = names.get(set_start + i, '')
+        if not name.startswith('mat:'):
+            continue
+        for handle in contents[i].tolist():
+            if handle in volume_handles and handle in global_ids:
+                materials[handle] = name[len('mat:'):]
+
+    volumes = {}
+    for handle, material in materials.items():
+        bounding = [
+            h for h in children[handle - set_start].tolist() if h in surface_handles]
+        if not bounding:
+            bounding = [
+                h for h in surface_handles
+                if h in senses and handle in senses[h]]
+        bounding = [h for h in bounding if h in surfaces]
+
+        signed_volume = 0.0
+        for h in bounding:
+            forward, reverse = senses.get(h, (handle, 0))
+            sign = -1 if handle == reverse and handle != forward else 1
+            signed_volume += sign * surfaces[h]['signed_volume']
+
+        bounding_box = None
+        if bounding:
+            bounding_box = [
+                [float(v) for v in np.min([surfaces[h]['lower_left'] for h in bounding], axis=0)],
+                [float(v) for v in np.max([surfaces[h]['upper_right'] for h in bounding], axis=0)],
+            ]
+        volumes[int(global_ids[handle])] = {
+            'material': material,
+            'volume': abs(signed_volume),
+            'surface_areas': [surfaces[h]['area'] for h in bounding],
+            'bounding_box': bounding_box,
+        }
+    return dict(sorted(volumes.items()))
+
+
+def _set_lists(f, name: str, ends: np.ndarray, flags: np.ndarray | None = None) -> list:
+    """Split tstt/sets/<name> into one handle array per set.
+
+    ends holds the index of the last entry of each set, range compressed
+    contents are expanded.
+    """
+    if f'tstt/sets/{name}' not in f:
+        return [np.empty(0, dtype=np.int64)] * len(ends)
+    data = f[f'tstt/sets/{name}'][()].astype(np.int64)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lists = []
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        handles = data[start:end + 1]
+        if flags is not None and flags[i] & _RANGE_COMPRESSED:
+            handles = np.concatenate(
+                [np.arange(first, first + count) for first, count in handles.reshape(-1, 2)]
+                or [np.empty(0, dtype=np.int64)])
+        lists.append(handles)
+    return lists
+
+
+def _set_tag(f, name: str, set_start: int, n_sets: int) -> dict:
+    """Values of a tag by entity handle, from its sparse and dense tables.
+
+    Strings are decoded, integers converted and other values (e.g. the
+    handle pairs of GEOM_SENSE_2) returned as tuples.
+    """
+    def decode(value):
+        if isinstance(value, (bytes, np.void, np.bytes_)):
+            return bytes(value).split(b'\0', 1)[0].decode('ascii', 'replace')
+        if np.ndim(value) == 0:
+            return int(value)
+        return tuple(int(v) for v in value)
+
+    values = {}
+    sparse = f.get(f'tstt/tags/{name}')
+    if sparse is not None and 'id_list' in sparse and 'values' in sparse:
+        for handle, value in zip(sparse['id_list'][()], sparse['values'][()]):
+            values[int(handle)] = decode(value)
+    dense = f.get(f'tstt/sets/tags/{name}')
+    if dense is not None:
+        for i, value in enumerate(dense[()][:n_sets]):
+            values[set_start + i] = decode(value)
+    return values
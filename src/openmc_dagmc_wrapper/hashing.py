@@ -0,0 +1,37 @@
+from pathlib import Path
+import hashlib
+import json
+
+
+def file_sha256(filename: str | Path, chunk_size: int = 16 * 1024 * 1024) -> str:
+    """Return the hex SHA-256 digest of a file, read in fixed-size chunks.
+
+    Args:
+        filename: Path to the file to hash.
+        chunk_size: Number of bytes read per chunk, keeps memory flat for
+            multi-GB h5m files.
+
+    Returns:
+        The hex digest string.
+    """
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_inputs(inputs: dict) -> str:
+    """Return the hex SHA-256 digest of a JSON-serialisable dict of inputs.
+
+    Keys are sorted and tuples serialise as lists, so equal inputs always
+    give the same digest regardless of insertion order.
+
+    Args:
+        inputs: Mapping of input names to JSON-serialisable values.
+
+    Returns:
+        The hex digest string.
+    """
+    text = json.dumps(inputs, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
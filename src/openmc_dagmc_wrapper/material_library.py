@@ -0,0 +1,104 @@
+from functools import lru_cache
+from pathlib import Path
+import hashlib
+import os
+import re
+import warnings
+import xml.etree.ElementTree as ET
+
+import openmc
+from openmc.mixin import IDWarning
+
+
+@lru_cache(maxsize=None)
+def nmm_version() -> str:
+    """Return the installed neutronics_material_maker version string."""
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version('neutronics_material_maker')
+    except PackageNotFoundError:
+        return 'unknown'
+
+
+class MaterialLibrary:
+    """Memoised lookup of neutronics_material_maker materials.
+
+    Each nmm library key is built with neutronics_material_maker once per
+    nmm version and kept in memory. Every lookup returns a fresh clone (with
+    its own id) so callers can rename or mix it freely. When cache_dir is
+    given, compositions are also stored on disk so later sessions skip
+    neutronics_material_maker entirely.
+
+    Args:
+        cache_dir: Optional directory for the on-disk store. Entries are
+            kept in a 'nmm-<version>' subdirectory so an nmm upgrade never
+            reuses stale compositions.
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._materials: dict[tuple[str, str], openmc.Material] = {}
+
+    def get(self, nmm_key: str) -> openmc.Material:
+        """Return a clone of the material for an nmm library key.
+
+        Args:
+            nmm_key: neutronics_material_maker library key.
+
+        Returns:
+            A new openmc.Material with the library composition and density.
+
+        Raises:
+            KeyError: If nmm_key is not in the neutronics_material_maker
+                library.
+        """
+        key = (nmm_key, nmm_version())
+        mat = self._materials.get(key)
+        if mat is None:
+            mat = self._read(*key)
+            if mat is None:
+                from neutronics_material_maker import Material
+                mat = Material.from_library(nmm_key).openmc_material
+                self._write(mat, *key)
+            self._materials[key] = mat
+        return mat.clone()
+
+    def clear(self):
+        """Forget the in-memory materials (the on-disk store is kept)."""
+        self._materials.clear()
+
+    def _path(self, nmm_key: str, version: str) -> Path:
+        safe_key = re.sub(r'[^\w.-]', '_', nmm_key)
+        key_hash = hashlib.sha256(nmm_key.encode()).hexdigest()[:8]
+        return self.cache_dir / f'nmm-{version}' / f'{safe_key}-{key_hash}.xml'
+
+    def _read(self, nmm_key: str, version: str) -> openmc.Material | None:
+        if self.cache_dir is None:
+            return None
+        path = self._path(nmm_key, version)
+        if not path.is_file():
+            return None
+        try:
+            elem = ET.parse(path).getroot()
+        except (OSError, ET.ParseError):
+            return None
+        # the stored id may be taken in this session, it is never exported
+        # as get only hands out clones
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', IDWarning)
+            return openmc.Material.from_xml_element(elem)
+
+    def _write(self, mat: openmc.Material, nmm_key: str, version: str):
+        if self.cache_dir is None:
+            return
+        path = self._path(nmm_key, version)
+        # the XML of model.xml, so every Material attribute round-trips
+        elem = mat.to_xml_element()
+        tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            ET.ElementTree(elem).write(tmp_path, encoding='unicode')
+            os.replace(tmp_path, path)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            print(f'WARNING: could not cache material {nmm_key} to {path}: {e}')
@@ -0,0 +1,177 @@
+from pathlib import Path
+import copy
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+
+import openmc
+
+from openmc_dagmc_wrapper.hashing import hash_inputs
+
+
+class MgxsCache:
+    """On-disk store of multigroup cross sections, one file per material.
+
+    Each material's macroscopic cross sections are stored under a hash of
+    its composition (the material XML without id, name, volume and
+    depletable) together with the group structure, generation method,
+    particle count, source, cross section library and OpenMC version.
+    build_library only generates the materials that are missing from the
+    store, so changing one material regenerates only that material, and
+    materials with the same composition (e.g. the per-volume clones made by
+    build_materials) are generated once.
+
+    The 'stochastic_slab' method weights each material with the spectrum of
+    a slab of the materials generated in the same run, i.e. the missing
+    ones. The other materials of the model are not part of the key, so the
+    slab spectrum of a cached material is an approximation of the one of
+    the current model. This is accurate enough for the weight windows the
+    cross sections are used for, use 'material_wise' where the cross
+    sections must not depend on the other materials at all.
+
+    Args:
+        cache_dir: Directory of the store, created if needed.
+    """
+
+    def __init__(self, cache_dir: str | Path):
+        self.cache_dir = Path(cache_dir)
+
+    def material_key(
+            self,
+            material: openmc.Material,
+            groups: str,
+            method: str,
+            nparticles: int,
+            source_xml: str) -> str:
+        """Return the store key of one material's cross sections.
+
+        Args:
+            material: The material.
+            groups: Group structure name.
+            method: Model.convert_to_multigroup generation method.
+            nparticles: Particles per generation run.
+            source_xml: XML of the sources of the generation run.
+        """
+        return hash_inputs({
+            'composition': material_composition(material),
+            'groups': groups,
+            'method': method,
+            'nparticles': nparticles,
+            'source': source_xml,
+            'cross_sections': openmc.config.get('cross_sections'),
+            'openmc_version': openmc.__version__,
+        })
+
+    def build_library(
+            self,
+            model: openmc.Model,
+            mgxs_path: str | Path,
+            groups: str = 'CASMO-2',
+            method: str = 'stochastic_slab',
+            nparticles: int = 2000) -> Path:
+        """Write the MGXS library of a model's materials, generating only missing ones.
+
+        The missing materials are converted with Model.convert_to_multigroup,
+        one material per distinct composition. With the 'stochastic_slab'
+        method the slab holds the missing materials only (see the class
+        docstring).
+
+        Args:
+            model: Continuous-energy model with uniquely named materials.
+                The model is not changed.
+            mgxs_path: Path of the library to write.
+            groups: Group structure name.
+            method: Model.convert_to_multigroup generation method.
+            nparticles: Particles per generation run.
+
+        Returns:
+            The library path.
+        """
+        source_xml = ''.join(
+            ET.tostring(s.to_xml_element(), encoding='unicode')
+            for s in model.settings.source)
+        keys = {
+            mat.name: self.material_key(mat, groups, method, nparticles, source_xml)
+            for mat in model.materials
+        }
+        # one material per distinct composition
+        distinct = {}
+        for mat in model.materials:
+            distinct.setdefault(keys[mat.name], mat)
+        missing = {
+            key: mat for key, mat in distinct.items()
+            if not self._path(key).is_file()}
+
+        if missing:
+            print(
+                f"Generating multigroup cross sections for {len(missing)} of "
+                f"{len(distinct)} distinct materials ...")
+            self._generate(model, missing, groups, method, nparticles)
+        else:
+            print(f"Reusing cached multigroup cross sections for {len(keys)} materials")
+
+        library = None
+        stored = {}
+        for mat in model.materials:
+            key = keys[mat.name]
+            if key not in stored:
+                stored[key] = openmc.MGXSLibrary.from_hdf5(str(self._path(key)))
+            if library is None:
+                library = openmc.MGXSLibrary(
+                    stored[key].energy_groups, stored[key].num_delayed_groups)
+            xsdata = copy.deepcopy(stored[key].xsdatas[0])
+            xsdata.name = mat.name
+            library.add_xsdata(xsdata)
+
+        mgxs_path = Path(mgxs_path)
+        mgxs_path.parent.mkdir(parents=True, exist_ok=True)
+        library.export_to_hdf5(str(mgxs_path))
+        return mgxs_path
+
+    def _generate(self, model, missing: dict, groups, method, nparticles):
+        # convert_to_multigroup changes the settings and materials it is given
+        settings = openmc.Settings()
+        settings.run_mode = 'fixed source'
+        settings.source = model.settings.source
+        settings.batches = 2
+        settings.particles = 1
+        gen_model = openmc.Model(
+            geometry=model.geometry,
+            materials=openmc.Materials([mat.clone() for mat in missing.values()]),
+            settings=settings,
+        )
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=self.cache_dir) as tmp:
+            library_path = Path(tmp) / 'mgxs.h5'
+            gen_model.convert_to_multigroup(
+                method=method,
+                groups=groups,
+                nparticles=nparticles,
+                overwrite_mgxs_library=True,
+                mgxs_path=str(library_path),
+            )
+            generated = openmc.MGXSLibrary.from_hdf5(str(library_path))
+            for key, mat in missing.items():
+                single = openmc.MGXSLibrary(
+                    generated.energy_groups, generated.num_delayed_groups)
+                single.add_xsdata(generated.get_by_name(mat.name))
+                path = self._path(key)
+                tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+                single.export_to_hdf5(str(tmp_path))
+                os.replace(tmp_path, path)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}.h5'
+
+
+def material_composition(material: openmc.Material) -> str:
+    """Material XML without the attributes that do not change cross sections.
+
+    Holds the nuclides, elements, S(a,b) tables, density and temperature, so
+    materials that differ only in id, name, volume or depletable give the
+    same text.
+    """
+    elem = material.to_xml_element()
+    for attribute in ('id', 'name', 'volume', 'depletable'):
+        elem.attrib.pop(attribute, None)
+    return ET.tostring(elem, encoding='unicode')
@@ -0,0 +1,322 @@
+from dataclasses import dataclass
+import math
+
+import numpy as np
+import openmc
+
+# OpenMC keeps value, sum and sum_sq for every tally bin while running and
+# writes sum and sum_sq to the statepoint, all as float64.
+BYTES_PER_BIN_IN_MEMORY = 3 * 8
+BYTES_PER_BIN_ON_DISK = 2 * 8
+
+# default RAM budget of correct_tallies_native for its result chunks
+DEFAULT_POSTPROCESS_MEMORY_GB = 4.0
+
+# tally bins per voxel for each tally family, before nuclide and born bins
+TALLY_TYPES = {
+    'flux': 1,
+    'heating': 1,
+    'dose': 1,
+    'instant_dose': 2,  # neutron and photon dose tallies
+    'd1s': 1,
+}
+
+
+def format_bytes(n_bytes: float) -> str:
+    """Format a byte count as a human-readable string, e.g. '1.50 GB'."""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(n_bytes) < 1024:
+            return f"{n_bytes:.2f} {unit}"
+        n_bytes /= 1024
+    return f"{n_bytes:.2f} TB"
+
+
+@dataclass
+class MeshPlan:
+    """Mesh dimensions and memory estimates returned by plan_mesh.
+
+    Attributes:
+        dimension: Number of voxels along x, y and z.
+        n_voxels: Total number of voxels in the scoring mesh.
+        n_bins: Total number of tally bins (voxels times nuclide, born mesh,
+            particle and score bins).
+        tally_bytes: Memory held by the tally while running (value, sum and
+            sum_sq per bin).
+        statepoint_bytes: Size of the tally results in the statepoint file
+            (sum and sum_sq per bin).
+        postprocess_bytes: Estimated peak RAM to read the statepoint and
+            post-process the tally (e.g. correct_tallies_native for D1S).
+        coarsened: True if the mesh was coarsened to fit the memory budget.
+    """
+    dimension: tuple[int, int, int]
+    n_voxels: int
+    n_bins: int
+    tally_bytes: int
+    statepoint_bytes: int
+    postprocess_bytes: int
+    coarsened: bool = False
+
+    def __str__(self):
+        return (
+            f"mesh {self.dimension} ({self.n_voxels:,} voxels, "
+            f"{self.n_bins:,} tally bins): "
+            f"tally {format_bytes(self.tally_bytes)}, "
+            f"statepoint {format_bytes(self.statepoint_bytes)}, "
+            f"post-processing {format_bytes(self.postprocess_bytes)}"
+            + (" (coarsened to fit budget)" if self.coarsened else "")
+        )
+
+
+def tally_bins(tally: openmc.Tally) -> int:
+    """Return the number of result bins of a tally (filters x nuclides x scores)."""
+    n_bins = 1
+    for tally_filter in tally.filters:
+        n_bins *= tally_filter.num_bins
+    return n_bins * max(1, len(tally.nuclides)) * max(1, len(tally.scores))
+
+
+def tally_memory_bytes(tallies) -> int:
+    """Return the memory OpenMC holds for a set of tallies while running."""
+    return sum(tally_bins(t) for t in tallies) * BYTES_PER_BIN_IN_MEMORY
+
+
+def mesh_dimension(bounding_box: openmc.BoundingBox, n_voxels: int) -> tuple[int, int, int]:
+    """Split a bounding box into approximately n_voxels roughly cubic voxels.
+
+    Args:
+        bounding_box: Box to cover.
+        n_voxels: Target total number of voxels.
+
+    Returns:
+        Number of voxels along x, y and z (each at least 1).
+    """
+    width = np.asarray(bounding_box.width, dtype=float)
+    edge = (float(np.prod(width)) / max(1, n_voxels)) ** (1 / 3)
+    return tuple(max(1, int(round(w / edge))) for w in width)
+
+
+def coarsen_dimension(dimension, factor: float) -> tuple:
+    """Reduce a mesh dimension so the voxel count shrinks by about factor.
+
+    Args:
+        dimension: Current mesh dimension.
+        factor: Target ratio of new to old voxel count (0 < factor < 1).
+
+    Returns:
+        The coarsened dimension, only axes with more than one voxel are
+        reduced and none drops below one voxel.
+    """
+    n_axes = sum(1 for d in dimension if d > 1) or 1
+    scale = factor ** (1 / n_axes)
+    return tuple(
+        max(1, int(math.floor(d * scale))) if d > 1 else d
+        for d in dimension
+    )
+
+
+def coarsen_mesh(mesh, factor: float) -> bool:
+    """Coarsen a RegularMesh or CylindricalMesh in place.
+
+    A CylindricalMesh is regridded uniformly between its first and last
+    r, phi and z grid values.
+
+    Args:
+        mesh: Mesh to coarsen.
+        factor: Target ratio of new to old voxel count (0 < factor < 1).
+
+    Returns:
+        False if the mesh could not be coarsened any further.
+    """
+    dimension = tuple(mesh.dimension)
+    new_dimension = coarsen_dimension(dimension, factor)
+    if new_dimension == dimension:
+        return False
+    if isinstance(mesh, openmc.CylindricalMesh):
+        n_r, n_phi, n_z = new_dimension
+        mesh.r_grid = np.linspace(mesh.r_grid[0], mesh.r_grid[-1], n_r + 1)
+        mesh.phi_grid = np.linspace(mesh.phi_grid[0], mesh.phi_grid[-1], n_phi + 1)
+        mesh.z_grid = np.linspace(mesh.z_grid[0], mesh.z_grid[-1], n_z + 1)
+    else:
+        mesh.dimension = new_dimension
+    return True
+
+
+def plan_mesh(
+    bounding_box: openmc.BoundingBox,
+    memory_budget_gb: float,
+    tally_type: str = 'dose',
+    n_nuclides: int = 1,
+    born_mesh: openmc.RegularMesh | None = None,
+    cube_volume: float | None = None,
+    n_fuels: int = 1,
+    max_memory_gb: float = DEFAULT_POSTPROCESS_MEMORY_GB,
+) -> MeshPlan:
+    """Choose a scoring mesh that fits a RAM budget for a given tally type.
+
+    The cost of each voxel includes the ParentNuclideFilter bins
+    (n_nuclides) of a D1S tally and the bins of an optional MeshBornFilter.
+
+    Args:
+        bounding_box: Region the scoring mesh covers.
+        memory_budget_gb: RAM budget in GB for the tally while running.
+        tally_type: One of 'flux', 'heating', 'dose', 'instant_dose' or 'd1s'.
+        n_nuclides: Number of ParentNuclideFilter bins (D1S only).
+        born_mesh: Optional mesh used in a MeshBornFilter.
+        cube_volume: Requested volume per voxel in cm^3. The mesh is
+            coarsened if this does not fit the budget. If None the finest
+            mesh that fits is returned.
+        n_fuels: Number of D1S statepoints (DD and/or DT) combined in
+            post-processing, each adds one nuclide-by-voxel matrix.
+        max_memory_gb: max_memory_gb passed to correct_tallies_native.
+
+    Returns:
+        A MeshPlan with the dimension and memory estimates.
+    """
+    if tally_type not in TALLY_TYPES:
+        raise ValueError(
+            f"tally_type must be one of {sorted(TALLY_TYPES)}, got '{tally_type}'")
+
+    bins_per_voxel = TALLY_TYPES[tally_type]
+    if tally_type == 'd1s':
+        bins_per_voxel *= n_nuclides
+    if born_mesh is not None:
+        bins_per_voxel *= int(np.prod(born_mesh.dimension))
+
+    budget_bytes = memory_budget_gb * 1024 ** 3
+    max_voxels = int(budget_bytes // (bins_per_voxel * BYTES_PER_BIN_IN_MEMORY))
+    if max_voxels < 1:
+        raise ValueError(
+            f"A single voxel needs {format_bytes(bins_per_voxel * BYTES_PER_BIN_IN_MEMORY)}, "
+            f"more than the {memory_budget_gb} GB budget")
+
+    coarsened = False
+    if cube_volume is None:
+        n_voxels = max_voxels
+    else:
+        n_voxels = max(1, int(bounding_box.volume // cube_volume))
+        if n_voxels > max_voxels:
+            n_voxels = max_voxels
+            coarsened = True
+
+    dimension = mesh_dimension(bounding_box, n_voxels)
+    # rounding can overshoot the budget, shrink until it fits
+    while int(np.prod(dimension)) > max_voxels:
+        dimension = coarsen_dimension(dimension, max_voxels / np.prod(dimension))
+        coarsened = cube_volume is not None
+
+    n_voxels = int(np.prod(dimension))
+    n_bins = n_voxels * bins_per_voxel
+
+    return MeshPlan(
+        dimension=dimension,
+        n_voxels=n_voxels,
+        n_bins=n_bins,
+        tally_bytes=n_bins * BYTES_PER_BIN_IN_MEMORY,
+        statepoint_bytes=n_bins * BYTES_PER_BIN_ON_DISK,
+        postprocess_bytes=postprocess_bytes(
+            n_bins, tally_type == 'd1s', n_fuels, max_memory_gb),
+        coarsened=coarsened,
+    )
+
+
+def postprocess_bytes(
+        n_bins: int,
+        d1s: bool = False,
+        n_fuels: int = 1,
+        max_memory_gb: float = DEFAULT_POSTPROCESS_MEMORY_GB) -> int:
+    """Estimate the peak RAM to read and post-process tally results.
+
+    correct_tallies_native reads the statepoints one at a time into an
+    (n_nuclides, n_voxels) mean matrix per fuel, then multiplies them by
+    the time factors in timestep chunks of about max_memory_gb. The peak
+    is the larger of reading the last statepoint (the sum and sum_sq
+    results next to the matrices already built) and the chunked multiply
+    (all matrices, the result chunk and one temporary of its size).
+
+    Args:
+        n_bins: Number of tally bins.
+        d1s: True for D1S tallies, post-processed by correct_tallies_native
+            or plot_dose_born_from_maps.
+        n_fuels: Number of D1S statepoints combined in post-processing.
+        max_memory_gb: max_memory_gb passed to correct_tallies_native.
+
+    Returns:
+        Estimated bytes.
+    """
+    statepoint_bytes = n_bins * BYTES_PER_BIN_ON_DISK
+    if d1s:
+        matrix_bytes = n_bins * 8
+        reading = statepoint_bytes + n_fuels * matrix_bytes
+        multiplying = n_fuels * matrix_bytes + 2 * int(max_memory_gb * 1024 ** 3)
+        return max(reading, multiplying)
+    # mean and std_dev arrays
+    return statepoint_bytes + n_bins * BYTES_PER_BIN_ON_DISK
+
+
+def mpi_ranks(mpi_args: list[str] | None) -> int:
+    """Return the number of MPI ranks in launcher arguments, 1 if unknown."""
+    if not mpi_args:
+        return 1
+    for i, arg in enumerate(mpi_args[:-1]):
+        if arg in ('-n', '-np', '--np', '--ntasks'):
+            return int(mpi_args[i + 1])
+    for arg in mpi_args:
+        if arg.startswith('--ntasks='):
+            return int(arg.split('=', 1)[1])
+    return 1
+
+
+@dataclass
+class RunPlan:
+    """Resource estimate for one simulation, see OpenmcDagmcWrapper.plan.
+
+    Every MPI rank holds a full copy of the tallies (value, sum and
+    sum_sq per bin), OpenMP threads share one copy. The master rank also
+    needs a reduction buffer of the statepoint size.
+
+    Attributes:
+        output: Statepoint path of the run.
+        n_bins: Total number of tally bins.
+        n_ranks: Number of MPI ranks.
+        tally_bytes: Tally memory of one rank.
+        peak_ram_bytes: Tally memory of all ranks plus the master's
+            reduction buffer.
+        statepoint_bytes: Size of the tally results in the statepoint.
+        postprocess_bytes: Estimated peak RAM to post-process the results
+            (correct_tallies_native and plot_dose_born_from_maps for D1S).
+        particles: Total number of particles (particles x batches, or x the
+            trigger batch cap).
+        particles_per_second: Transport rate from a calibration run, if any.
+        init_seconds: Initialisation time from a calibration run, if any.
+    """
+    output: str
+    n_bins: int
+    n_ranks: int
+    tally_bytes: int
+    peak_ram_bytes: int
+    statepoint_bytes: int
+    postprocess_bytes: int
+    particles: int
+    particles_per_second: float | None = None
+    init_seconds: float | None = None
+
+    @property
+    def runtime_seconds(self) -> float | None:
+        """Estimated wall time, None without a calibration run."""
+        if self.particles_per_second is None:
+            return None
+        return (self.init_seconds or 0.0) + self.particles / self.particles_per_second
+
+    def __str__(self):
+        text = (
+            f"{self.output}: {self.n_bins:,} tally bins, "
+            f"tally {format_bytes(self.tally_bytes)} per rank, "
+            f"peak {format_bytes(self.peak_ram_bytes)} over {self.n_ranks} rank(s), "
+            f"statepoint {format_bytes(self.statepoint_bytes)}, "
+            f"post-processing {format_bytes(self.postprocess_bytes)}"
+        )
+        if self.runtime_seconds is not None:
+            text += (
+                f", {self.particles_per_second:,.0f} particles/s, "
+                f"about {self.runtime_seconds / 3600:.2f} h")
+        return text
@@ -0,0 +1,302 @@
+from datetime import datetime, timezone
+from contextlib import contextmanager
+from pathlib import Path
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import openmc
+
+from openmc_dagmc_wrapper.hashing import file_sha256, hash_inputs
+
+MANIFEST_NAME = 'manifest.json'
+LOCK_NAME = 'manifest.lock'
+
+
+def canonical_model_xml(model: openmc.Model) -> str:
+    """Return model.xml of a model with its object ids renumbered from 1.
+
+    OpenMC gives every material, cell, surface, universe, mesh, filter,
+    tally and weight window a process-wide auto-incremented id, so the same
+    model built twice in one session exports different XML. The ids are
+    renumbered in the order the objects appear, including the meshes only
+    referenced from settings (weight window generators, random ray source
+    region meshes, mesh sources and entropy/UFS meshes), so equal models
+    give equal text. The original ids are restored before returning.
+
+    Args:
+        model: The model to export.
+
+    Returns:
+        The XML text.
+    """
+    original_ids = []
+
+    def renumber(objects):
+        seen = {}
+        for obj in objects:
+            if obj is not None and id(obj) not in seen:
+                seen[id(obj)] = obj
+        # set directly, the id setters would register the ids globally
+        for i, obj in enumerate(seen.values(), start=1):
+            original_ids.append((obj, obj._id))
+            obj._id = i
+
+    settings = model.settings
+    tallies = list(model.tallies or [])
+    filters = [f for t in tallies for f in t.filters]
+    weight_windows = list(settings.weight_windows or [])
+    meshes = [getattr(f, 'mesh', None) for f in filters]
+    meshes += [ww.mesh for ww in weight_windows]
+    meshes += [wwg.mesh for wwg in settings.weight_window_generators or []]
+    random_ray = settings.random_ray or {}
+    meshes += [mesh for mesh, _ in random_ray.get('source_region_meshes', [])]
+    sources = settings.source or []
+    if not isinstance(sources, list):
+        sources = [sources]
+    for source in sources:
+        meshes.append(getattr(source, 'mesh', None))
+        meshes.append(getattr(getattr(source, 'space', None), 'mesh', None))
+    meshes += [settings.entropy_mesh, settings.ufs_mesh]
+
+    try:
+        if model.materials is not None:
+            renumber(model.materials)
+        if model.geometry is not None:
+            renumber(model.geometry.get_all_universes().values())
+            renumber(model.geometry.get_all_cells().values())
+            renumber(model.geometry.get_all_surfaces().values())
+        renumber(tallies)
+        renumber(filters)
+        renumber(meshes)
+        renumber(weight_windows)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'model.xml'
+            model.export_to_model_xml(path)
+            return path.read_text()
+    finally:
+        for obj, original_id in original_ids:
+            obj._id = original_id
+
+
+class ResultCache:
+    """Content-addressed store of simulation results.
+
+    Results are stored under a key hashing the model (canonical model.xml,
+    which holds geometry, materials, source, settings, tallies and weight
+    windows), the DAGMC h5m file hash, the cross section library path and
+    the OpenMC version. manifest.json lists every entry with the inputs
+    that produced it, and the model.xml of each entry is kept beside it.
+    The least recently used entries are removed when the cache grows past
+    max_size_gb.
+
+    Args:
+        cache_dir: Directory of the cache, created if needed.
+        max_size_gb: Optional size limit in GB for the stored files.
+    """
+
+    def __init__(self, cache_dir: str | Path, max_size_gb: float | None = None):
+        self.cache_dir = Path(cache_dir)
+        self.max_size_gb = max_size_gb
+
+    def key(
+            self,
+            model: openmc.Model,
+            dagmc_sha256: str,
+            result: str = 'statepoint',
+            extra: dict | None = None) -> tuple[str, dict]:
+        """Return the cache key of a run and the inputs it was computed from.
+
+        Args:
+            model: The model to run.
+            dagmc_sha256: SHA-256 of the DAGMC h5m file used by the model.
+            result: The result file of the run ('statepoint' or a file name
+                such as 'weight_windows.h5').
+            extra: Optional JSON-serialisable inputs that are not part of
+                the model, e.g. weight window generator settings.
+
+        Returns:
+            (key, inputs) where inputs holds the hashed values and the
+            canonical model XML under 'model_xml'.
+        """
+        model_xml = canonical_model_xml(model)
+        inputs = {
+            'model_xml_sha256': hashlib.sha256(model_xml.encode()).hexdigest(),
+            'dagmc_sha256': dagmc_sha256,
+            'cross_sections': openmc.config.get('cross_sections'),
+            'openmc_version': openmc.__version__,
+            'result': result,
+        }
+        # weight windows read by OpenMC from a file are only a path in the XML
+        ww_file = model.settings.weight_windows_file
+        if ww_file is not None:
+            inputs['weight_windows_sha256'] = file_sha256(ww_file)
+        if extra is not None:
+            inputs['extra'] = extra
+        key = hash_inputs(inputs)
+        return key, {**inputs, 'model_xml': model_xml}
+
+    def fetch(self, key: str, output: str | Path) -> bool:
+        """Copy a cached result to output.
+
+        Args:
+            key: Cache key from ResultCache.key.
+            output: Path to copy the result to.
+
+        Returns:
+            False if the key is not in the cache.
+        """
+        entry = self._read_manifest().get(key)
+        if entry is None or not (self.cache_dir / entry['file']).is_file():
+            return False
+
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output.with_name(f'.{output.name}.{os.getpid()}.tmp')
+        try:
+            shutil.copyfile(self.cache_dir / entry['file'], tmp_path)
+            os.replace(tmp_path, output)
+        except FileNotFoundError:
+            # evicted by another process since the manifest was read
+            tmp_path.unlink(missing_ok=True)
+            return False
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        with self._locked() as manifest:
+            if key in manifest:
+                manifest[key]['last_used'] = time.time()
+        print(f'Reused cached result {key[:16]} for {output}')
+        return True
+
+    def store(self, key: str, path: str | Path, inputs: dict):
+        """Copy a result into the cache and evict old entries if needed.
+
+        Args:
+            key: Cache key from ResultCache.key.
+            path: The result file to store.
+            inputs: Inputs returned by ResultCache.key with the key.
+        """
+        path = Path(path)
+        inputs = dict(inputs)
+        model_xml = inputs.pop('model_xml', None)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        filename = f'{key}.h5'
+        tmp_path = self.cache_dir / f'.{filename}.{os.getpid()}.tmp'
+        try:
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, self.cache_dir / filename)
+            if model_xml is not None:
+                (self.cache_dir / f'{key}.model.xml').write_text(model_xml)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            print(f'WARNING: could not cache {path} in {self.cache_dir}: {e}')
+            return
+
+        entry = {
+            'file': filename,
+            'model_xml': f'{key}.model.xml' if model_xml is not None else None,
+            'size': (self.cache_dir / filename).stat().st_size,
+            'created': datetime.now(timezone.utc).isoformat(),
+            'last_used': time.time(),
+            'output': path.name,
+            'inputs': inputs,
+        }
+        with self._locked() as manifest:
+            manifest[key] = entry
+            self._evict(manifest)
+        print(f'Stored {path} in result cache as {key[:16]}')
+
+    def size_bytes(self) -> int:
+        """Total size of the stored results."""
+        return sum(entry['size'] for entry in self._read_manifest().values())
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._locked() as manifest:
+            for key in list(manifest):
+                self._remove(manifest, key)
+
+    def _evict(self, manifest: dict):
+        if self.max_size_gb is None:
+            return
+        budget = self.max_size_gb * 1024 ** 3
+        total = sum(entry['size'] for entry in manifest.values())
+        # least recently used first, the newest entry is always kept
+        for key in sorted(manifest, key=lambda k: manifest[k]['last_used'])[:-1]:
+            if total <= budget:
+                break
+            total -= manifest[key]['size']
+            print(f'Evicting cached result {key[:16]} ({manifest[key]["output"]})')
+            self._remove(manifest, key)
+
+    def _remove(self, manifest: dict, key: str):
+        entry = manifest.pop(key)
+        (self.cache_dir / entry['file']).unlink(missing_ok=True)
+        if entry.get('model_xml'):
+            (self.cache_dir / entry['model_xml']).unlink(missing_ok=True)
+
+    @contextmanager
+    def _locked(self):
+        """Read the manifest under an exclusive lock and write it back on exit.
+
+        Campaign workers share a cache, so every read-modify-write of the
+        manifest holds a lock on manifest.lock for its whole duration.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_dir / LOCK_NAME, 'a') as lock_file:
+            _lock(lock_file)
+            try:
+                manifest = self._read_manifest()
+                yield manifest
+                self._write_manifest(manifest)
+            finally:
+                _unlock(lock_file)
+
+    def _read_manifest(self) -> dict:
+        path = self.cache_dir / MANIFEST_NAME
+        if not path.is_file():
+            return {}
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest: dict):
+        path = self.cache_dir / MANIFEST_NAME
+        tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(manifest, indent=2))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            print(f'WARNING: could not write result cache manifest {path}: {e}')
+
+
+def _lock(lock_file):
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+    else:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+
+def _unlock(lock_file):
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
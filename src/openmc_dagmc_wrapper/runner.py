@@ -0,0 +1,317 @@
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+import os
+import shutil
+import tempfile
+
+import openmc
+
+from openmc_dagmc_wrapper.planning import RunPlan, format_bytes
+
+# simulate_* methods that can be scheduled in a campaign
+CAMPAIGN_METHODS = ('instant_dose', 'on_mesh', 'd1s')
+# simulate_* methods that OpenmcDagmcWrapper.plan can estimate
+PLAN_METHODS = ('instant_dose', 'on_mesh', 'fused', 'd1s')
+
+# particles in the one-batch run used to measure the transport rate
+DEFAULT_CALIBRATION_PARTICLES = 1000
+
+
+@dataclass
+class RunConfig:
+    """How the simulate_* runners launch OpenMC.
+
+    Set once on the wrapper (OpenmcDagmcWrapper.run_config) and override
+    per call with the runners' threads and mpi_args arguments.
+
+    Attributes:
+        threads: OpenMP threads per MPI rank. If None OpenMC uses its
+            default (all cores, or OMP_NUM_THREADS).
+        mpi_args: MPI launcher arguments, e.g. ['-n', '4'] or
+            ['-n', '256', '--map-by', 'ppr:2:node']. If None OpenMC is run
+            without an MPI launcher.
+        mpi_exec: MPI launcher command, used when mpi_args is set, e.g.
+            'mpiexec', 'mpirun' or 'srun'.
+        openmc_exec: OpenMC executable.
+        ram_budget_gb: Optional limit in GB on the peak tally memory of all
+            MPI ranks. Runs estimated above it are refused.
+        disk_budget_gb: Optional limit in GB on the statepoint size.
+        walltime_budget_hours: Optional limit on the estimated run time.
+            Setting it makes every run start with a short calibration run.
+    """
+    threads: int | None = None
+    mpi_args: list[str] | None = None
+    mpi_exec: str = 'mpiexec'
+    openmc_exec: str = 'openmc'
+    ram_budget_gb: float | None = None
+    disk_budget_gb: float | None = None
+    walltime_budget_hours: float | None = None
+
+    def with_overrides(self, **overrides) -> 'RunConfig':
+        """Return a copy with the overrides that are not None applied."""
+        return replace(self, **{k: v for k, v in overrides.items() if v is not None})
+
+    def run_kwargs(self) -> dict:
+        """Keyword arguments for openmc.run."""
+        mpi_args = None
+        if self.mpi_args is not None:
+            mpi_args = [self.mpi_exec, *self.mpi_args]
+        return {
+            'threads': self.threads,
+            'mpi_args': mpi_args,
+            'openmc_exec': self.openmc_exec,
+        }
+
+    def check_budgets(self, plan: RunPlan):
+        """Raise ValueError if a run plan exceeds any of the budgets."""
+        problems = []
+        gb = 1024 ** 3
+        if self.ram_budget_gb is not None and plan.peak_ram_bytes > self.ram_budget_gb * gb:
+            problems.append(
+                f"peak tally memory {format_bytes(plan.peak_ram_bytes)} exceeds "
+                f"ram_budget_gb={self.ram_budget_gb}")
+        if self.disk_budget_gb is not None and plan.statepoint_bytes > self.disk_budget_gb * gb:
+            problems.append(
+                f"statepoint size {format_bytes(plan.statepoint_bytes)} exceeds "
+                f"disk_budget_gb={self.disk_budget_gb}")
+        runtime = plan.runtime_seconds
+        if (self.walltime_budget_hours is not None and runtime is not None
+                and runtime > self.walltime_budget_hours * 3600):
+            problems.append(
+                f"estimated run time {runtime / 3600:.2f} h exceeds "
+                f"walltime_budget_hours={self.walltime_budget_hours}")
+        if problems:
+            raise ValueError(
+                f"Refusing to run {plan.output}: " + "; ".join(problems))
+
+
+@dataclass
+class SimulationSpec:
+    """One job of a campaign, see OpenmcDagmcWrapper.run_campaign.
+
+    Attributes:
+        method: 'instant_dose', 'on_mesh' or 'd1s', selecting the
+            simulate_<method> runner.
+        kwargs: Keyword arguments for the runner (fuel, meshes, output, ...).
+        threads: OpenMP threads for this job. If None the campaign default
+            is used.
+    """
+    method: str
+    kwargs: dict = field(default_factory=dict)
+    threads: int | None = None
+
+
+@dataclass
+class QueuedRun:
+    """A run prepared by a simulate_* runner inside run_campaign.
+
+    Attributes:
+        sandbox: Directory holding model.xml, None if the result was
+            already taken from the result cache.
+        output: Path the result is moved to.
+        result: 'statepoint' or the name of another file OpenMC writes.
+        run_config: Threads, MPI launcher and executable for the run.
+        restart_file: Optional statepoint to restart from.
+        persistent: True if the sandbox is a checkpoint directory that is
+            kept when the run fails.
+        cache_key: Result cache key to store the result under, if any.
+        cache_inputs: Inputs the cache key was computed from.
+    """
+    sandbox: Path | None
+    output: Path
+    result: str = 'statepoint'
+    run_config: RunConfig = field(default_factory=RunConfig)
+    restart_file: Path | None = None
+    persistent: bool = False
+    cache_key: str | None = None
+    cache_inputs: dict | None = None
+
+    def discard(self):
+        """Remove the sandbox unless it keeps checkpoints."""
+        if self.sandbox is not None and not self.persistent:
+            shutil.rmtree(self.sandbox, ignore_errors=True)
+
+
+def latest_statepoint(directory: str | Path) -> Path | None:
+    """Return the statepoint.<batch>.h5 file with the highest batch, if any."""
+    statepoints = sorted(
+        Path(directory).glob('statepoint.*.h5'),
+        key=lambda p: int(p.stem.split('.')[1]))
+    return statepoints[-1] if statepoints else None
+
+
+def prepare_sandbox(
+        model: openmc.Model,
+        output: str | Path,
+        run_dir: str | Path | None = None) -> Path:
+    """Export a model to model.xml in a new private directory next to output.
+
+    Args:
+        model: The model to run.
+        output: Path the result will be moved to.
+        run_dir: Fixed directory to use instead of a new temporary one, e.g.
+            to keep checkpoints of a run. It is created if needed and never
+            removed here.
+
+    Returns:
+        The sandbox directory.
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if run_dir is not None:
+        sandbox = Path(run_dir)
+        sandbox.mkdir(parents=True, exist_ok=True)
+        model.export_to_model_xml(sandbox / 'model.xml')
+        return sandbox
+
+    sandbox = Path(tempfile.mkdtemp(prefix='.openmc_run_', dir=output.parent))
+    try:
+        model.export_to_model_xml(sandbox / 'model.xml')
+    except BaseException:
+        shutil.rmtree(sandbox, ignore_errors=True)
+        raise
+    return sandbox
+
+
+def seeded_sandbox(model_xml: str | Path, output: str | Path, seed: int) -> Path:
+    """Copy a model.xml into a new sandbox next to output with another seed.
+
+    Args:
+        model_xml: The model.xml to copy, e.g. from prepare_sandbox.
+        output: Path the result of the sandbox will be moved to.
+        seed: Random number seed written to the settings.
+
+    Returns:
+        The sandbox directory.
+    """
+    import xml.etree.ElementTree as ET
+
+    tree = ET.parse(model_xml)
+    settings = tree.getroot().find('settings')
+    seed_element = settings.find('seed')
+    if seed_element is None:
+        seed_element = ET.SubElement(settings, 'seed')
+    seed_element.text = str(seed)
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    sandbox = Path(tempfile.mkdtemp(prefix='.openmc_run_', dir=output.parent))
+    try:
+        tree.write(sandbox / 'model.xml')
+    except BaseException:
+        shutil.rmtree(sandbox, ignore_errors=True)
+        raise
+    return sandbox
+
+
+def checkpoint_dir(output: str | Path) -> Path:
+    """Return the run directory that keeps the checkpoints of output's run."""
+    output = Path(output)
+    return output.with_name(output.name + '.run')
+
+
+def link_or_copy(source: str | Path, destination: str | Path) -> Path:
+    """Hard link source to destination, copying if linking is not possible.
+
+    The link shares the disk blocks of source, so a multi-GB statepoint is
+    not stored twice. Filesystems without hard links, or a destination on
+    another device, fall back to a copy. An existing destination is
+    replaced atomically.
+
+    Returns:
+        The destination path.
+    """
+    source, destination = Path(source), Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = destination.with_name(f'.{destination.name}.{os.getpid()}.tmp')
+    tmp_path.unlink(missing_ok=True)
+    try:
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, destination)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return destination
+
+
+def resolve_restart_file(resume_from: str | Path) -> Path:
+    """Return the statepoint to restart from.
+
+    Args:
+        resume_from: A statepoint file, or a run directory (see
+            checkpoint_dir) whose latest statepoint is used.
+
+    Returns:
+        Absolute path to the statepoint.
+    """
+    resume_from = Path(resume_from)
+    if resume_from.is_dir():
+        statepoint = latest_statepoint(resume_from)
+        if statepoint is None:
+            raise FileNotFoundError(f'No statepoint to resume from in {resume_from}')
+        resume_from = statepoint
+    elif not resume_from.is_file():
+        raise FileNotFoundError(f'Statepoint to resume from not found: {resume_from}')
+    return resume_from.resolve()
+
+
+def run_in_sandbox(
+        sandbox: str | Path,
+        output: str | Path,
+        result: str = 'statepoint',
+        run_config: RunConfig | None = None,
+        restart_file: str | Path | None = None,
+        keep_on_failure: bool = False) -> Path:
+    """Run OpenMC in a sandbox, move one result to output and remove the sandbox.
+
+    OpenMC runs as a subprocess with the sandbox as its working directory,
+    so the working directory of this process is never changed.
+
+    Args:
+        sandbox: Directory holding model.xml, from prepare_sandbox.
+        output: Path the result is moved to.
+        result: 'statepoint' for the final statepoint file, or the name of
+            another file OpenMC writes (e.g. 'weight_windows.h5').
+        run_config: Threads, MPI launcher and executable to use. Defaults
+            to RunConfig().
+        restart_file: Optional statepoint to restart the run from.
+        keep_on_failure: Keep the sandbox, and the checkpoints in it, if
+            the run fails.
+
+    Returns:
+        The output path.
+    """
+    sandbox = Path(sandbox)
+    output = Path(output)
+    succeeded = False
+    try:
+        run_config = run_config or RunConfig()
+        if restart_file is not None:
+            print(f'Resuming from {restart_file}')
+        openmc.run(
+            cwd=sandbox, restart_file=restart_file, **run_config.run_kwargs())
+
+        if result == 'statepoint':
+            produced = latest_statepoint(sandbox)
+        else:
+            produced = sandbox / result
+        if produced is None or not produced.is_file():
+            raise FileNotFoundError(
+                f'OpenMC did not write {result} in {sandbox}')
+        # same filesystem as output, so the rename is atomic
+        os.replace(produced, output)
+        succeeded = True
+    finally:
+        if succeeded or not keep_on_failure:
+            shutil.rmtree(sandbox, ignore_errors=True)
+        else:
+            print(f'Run failed, checkpoints kept in {sandbox}')
+
+    if result == 'statepoint':
+        print(f'Statepoint saved to {output}')
+    else:
+        print(f'Saved {output}')
+    return output
@@ -0,0 +1,216 @@
+from pathlib import Path
+import os
+import shutil
+import tempfile
+
+import openmc
+
+from openmc_dagmc_wrapper.runner import latest_statepoint
+
+
+class OpenmcSession:
+    """Successive OpenMC runs in this process through openmc.lib.
+
+    openmc.lib.init is called once, so cross sections are read and the
+    DAGMC geometry is built once for all runs of the session. Between runs
+    the particle count, batch count, seed, the set of active tallies and
+    the bounds and dimension of the RegularMeshes the tallies score on
+    (set_mesh) can change. Every tally that will be used must be part of
+    the model when the session is opened. Tallies that are not requested
+    for a run are switched off rather than scored.
+
+    The source and the other settings are fixed at initialisation, as
+    openmc.lib cannot replace source distributions, so use one session
+    per fuel. Only one session can be open per process, as openmc.lib
+    holds global state.
+
+    Args:
+        model: Model holding the geometry, materials, settings (including
+            the source) and every tally of the session.
+        directory: Working directory for the session files. If None a
+            temporary directory is created in output_dir and removed on
+            close.
+        threads: OpenMP threads. If None OpenMC uses its default.
+        output_dir: Directory the run outputs go to, so statepoints are
+            moved within one filesystem. Defaults to the current directory.
+    """
+
+    def __init__(
+            self,
+            model: openmc.Model,
+            directory: str | Path | None = None,
+            threads: int | None = None,
+            output_dir: str | Path | None = None):
+        self.model = model
+        self.threads = threads
+        self._owns_directory = directory is None
+        if directory is None:
+            output_dir = Path(output_dir if output_dir is not None else '.')
+            output_dir.mkdir(parents=True, exist_ok=True)
+            directory = tempfile.mkdtemp(prefix='.openmc_session_', dir=output_dir)
+        self.directory = Path(directory).resolve()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._tally_ids = {t.name: t.id for t in model.tallies}
+        # mesh name -> (mesh id, ids of the filters and tallies using it)
+        self._meshes: dict[str, tuple[int, set, set]] = {}
+        for tally in model.tallies:
+            for tally_filter in tally.filters:
+                mesh = getattr(tally_filter, 'mesh', None)
+                if mesh is None:
+                    continue
+                mesh_id, filter_ids, tally_ids = self._meshes.setdefault(
+                    mesh.name, (mesh.id, set(), set()))
+                if mesh_id != mesh.id:
+                    raise ValueError(
+                        f"Two meshes of the session are named '{mesh.name}'")
+                filter_ids.add(tally_filter.id)
+                tally_ids.add(tally.id)
+        self._open = False
+
+    def __enter__(self) -> 'OpenmcSession':
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def tally_names(self) -> list[str]:
+        """Names of the tallies that can be activated in run."""
+        return list(self._tally_ids)
+
+    @property
+    def mesh_names(self) -> list[str]:
+        """Names of the meshes that can be changed with set_mesh."""
+        return list(self._meshes)
+
+    def set_mesh(self, name: str, mesh: openmc.RegularMesh):
+        """Give a session mesh the bounds and dimension of another mesh.
+
+        The change applies to every tally scoring on the mesh from the
+        next run on, e.g. to sweep the mesh resolution without
+        reinitialising OpenMC.
+
+        Args:
+            name: Name of the session mesh (see mesh_names), which must be
+                a RegularMesh.
+            mesh: RegularMesh with the new lower_left, upper_right and
+                dimension.
+        """
+        import openmc.lib
+
+        if name not in self._meshes:
+            raise ValueError(
+                f"Mesh '{name}' is not in the session, available meshes: "
+                f"{self.mesh_names}")
+        if not isinstance(mesh, openmc.RegularMesh):
+            raise ValueError(
+                f"set_mesh needs a RegularMesh, got {type(mesh).__name__}")
+        self.open()
+        mesh_id, filter_ids, tally_ids = self._meshes[name]
+        lib_mesh = openmc.lib.meshes[mesh_id]
+        if not isinstance(lib_mesh, openmc.lib.RegularMesh):
+            raise ValueError(f"Session mesh '{name}' is not a RegularMesh")
+
+        lib_mesh.dimension = tuple(mesh.dimension)
+        lib_mesh.set_parameters(
+            lower_left=mesh.lower_left, upper_right=mesh.upper_right)
+        # filters and tallies size their bins when the mesh and filters are
+        # set, results are reallocated at the start of the next run
+        for filter_id in filter_ids:
+            openmc.lib.filters[filter_id].mesh = lib_mesh
+        for tally_id in tally_ids:
+            lib_tally = openmc.lib.tallies[tally_id]
+            lib_tally.filters = lib_tally.filters
+
+    def open(self):
+        """Export the model and initialise OpenMC in this process."""
+        import openmc.lib
+
+        if self._open:
+            return
+        if openmc.lib.is_initialized:
+            raise RuntimeError(
+                "OpenMC is already initialised in this process, close the "
+                "other session first")
+
+        # statepoints are written to the session directory
+        output = dict(self.model.settings.output or {})
+        output['path'] = str(self.directory)
+        self.model.settings.output = output
+        self.model.export_to_model_xml(self.directory / 'model.xml')
+
+        args = [str(self.directory / 'model.xml')]
+        if self.threads is not None:
+            args = ['-s', str(self.threads)] + args
+        print('Initialising OpenMC session (geometry and cross sections) ...')
+        openmc.lib.init(args=args)
+        self._open = True
+
+    def run(
+            self,
+            output: str | Path,
+            particles: int | None = None,
+            batches: int | None = None,
+            tallies: list[str] | None = None,
+            seed: int | None = None) -> Path:
+        """Run one simulation and move its statepoint to output.
+
+        Args:
+            output: Path the statepoint is moved to.
+            particles: Particles per batch, unchanged if None.
+            batches: Number of batches, unchanged if None.
+            tallies: Names of the tallies to score. If None every tally of
+                the session is scored.
+            seed: Random number seed, unchanged if None.
+
+        Returns:
+            The output path.
+        """
+        import openmc.lib
+
+        self.open()
+        if tallies is not None:
+            unknown = set(tallies) - set(self._tally_ids)
+            if unknown:
+                raise ValueError(
+                    f"Tallies {sorted(unknown)} are not in the session, "
+                    f"available tallies: {self.tally_names}")
+
+        if particles is not None:
+            openmc.lib.settings.particles = particles
+        if batches is not None:
+            openmc.lib.settings.set_batches(batches)
+        if seed is not None:
+            openmc.lib.settings.seed = seed
+        for name, tally_id in self._tally_ids.items():
+            openmc.lib.tallies[tally_id].active = tallies is None or name in tallies
+
+        for old in self.directory.glob('statepoint.*.h5'):
+            old.unlink()
+        openmc.lib.reset()
+        openmc.lib.run()
+
+        statepoint = latest_statepoint(self.directory)
+        if statepoint is None:
+            raise FileNotFoundError(
+                f"OpenMC did not write a statepoint in {self.directory}")
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        # os.replace is atomic within a filesystem, copy across filesystems
+        try:
+            os.replace(statepoint, output)
+        except OSError:
+            shutil.move(statepoint, output)
+        print(f'Statepoint saved to {output}')
+        return output
+
+    def close(self):
+        """Finalise OpenMC and remove the session directory if it was created."""
+        import openmc.lib
+
+        if self._open:
+            openmc.lib.finalize()
+            self._open = False
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
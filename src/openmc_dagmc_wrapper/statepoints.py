@@ -0,0 +1,95 @@
+from pathlib import Path
+import os
+import shutil
+
+# tally result rows summed per read, keeps RAM flat for multi-GB D1S tallies
+_MERGE_CHUNK_BYTES = 256 * 1024 ** 2
+
+
+def merge_statepoints(statepoints: list[str | Path], output: str | Path) -> Path:
+    """Merge statepoints of independent runs of the same model.
+
+    The runs must differ only in their seed. Tally sum and sum_sq arrays,
+    global tallies and realization counts are added, so means and standard
+    deviations of the merged file are those of one run with all the
+    batches. Runtimes are added too, so they hold the total compute time
+    of the runs and figures of merit of the merged file compare with
+    those of a single run. Everything else (meshes, filters, source) is
+    taken from the first statepoint. The result is an ordinary statepoint, read
+    by openmc.StatePoint and by the post-processing methods of
+    OpenmcDagmcWrapper.
+
+    Args:
+        statepoints: Statepoint files to merge.
+        output: Path of the merged statepoint.
+
+    Returns:
+        The output path.
+    """
+    import h5py
+
+    statepoints = [Path(p) for p in statepoints]
+    if not statepoints:
+        raise ValueError("No statepoints to merge")
+    output = Path(output)
+    if output.resolve() in {p.resolve() for p in statepoints}:
+        raise ValueError(f"output {output} is one of the statepoints to merge")
+
+    tmp_path = output.with_name(f'.{output.name}.{os.getpid()}.tmp')
+    shutil.copyfile(statepoints[0], tmp_path)
+    try:
+        with h5py.File(tmp_path, 'r+') as merged:
+            # internal tallies are written without results
+            tally_names = [
+                name for name in merged['tallies']
+                if name.startswith('tally ') and 'results' in merged['tallies'][name]]
+            for other_path in statepoints[1:]:
+                with h5py.File(other_path, 'r') as other:
+                    _check_compatible(merged, other, tally_names, other_path)
+                    for name in tally_names:
+                        group = merged[f'tallies/{name}']
+                        other_group = other[f'tallies/{name}']
+                        _add_chunked(group['results'], other_group['results'])
+                        group['n_realizations'][()] += other_group['n_realizations'][()]
+                    merged['global_tallies'][...] += other['global_tallies'][...]
+                    merged['n_realizations'][()] += other['n_realizations'][()]
+                    for name in merged.get('runtime', {}):
+                        if name in other['runtime']:
+                            merged['runtime'][name][()] += other['runtime'][name][()]
+            # batches are realizations in fixed-source runs
+            n_realizations = merged['n_realizations'][()]
+            merged['n_batches'][()] = n_realizations
+            merged['current_batch'][()] = n_realizations
+        os.replace(tmp_path, output)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    print(f"Merged {len(statepoints)} statepoints into {output}")
+    return output
+
+
+def _check_compatible(merged, other, tally_names, other_path):
+    other_names = [
+        name for name in other['tallies']
+        if name.startswith('tally ') and 'results' in other['tallies'][name]]
+    if sorted(other_names) != sorted(tally_names):
+        raise ValueError(f"{other_path} holds different tallies")
+    for name in tally_names:
+        shape = merged[f'tallies/{name}/results'].shape
+        other_shape = other[f'tallies/{name}/results'].shape
+        if shape != other_shape:
+            raise ValueError(
+                f"{name} has shape {other_shape} in {other_path}, expected {shape}")
+
+
+def _add_chunked(dataset, other_dataset):
+    """Add other_dataset to dataset in place, a block of rows at a time."""
+    n_rows = dataset.shape[0]
+    if n_rows == 0:
+        return
+    row_bytes = max(1, dataset.dtype.itemsize * dataset.size // n_rows)
+    step = max(1, _MERGE_CHUNK_BYTES // row_bytes)
+    for start in range(0, n_rows, step):
+        stop = min(start + step, n_rows)
+        dataset[start:stop] = dataset[start:stop] + other_dataset[start:stop]
@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.fixture
+def wrapper(tmp_path):
+    pytest.importorskip("openmc")
+    from openmc_dagmc_wrapper import OpenmcDagmcWrapper
+
+    cross_sections = tmp_path / "cross_sections.xml"
+    cross_sections.write_text("<cross_sections/>")
+    chain_file = tmp_path / "chain.xml"
+    chain_file.write_text("<depletion_chain/>")
+    return OpenmcDagmcWrapper(cross_sections=cross_sections, chain_file=chain_file)
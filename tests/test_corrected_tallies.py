@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+zarr = pytest.importorskip("zarr")
+pytest.importorskip("openmc")
+
+from openmc_dagmc_wrapper.corrected_tallies import (  # noqa: E402
+    CHUNK_VOXELS, CorrectedTallies, voxel_chunks)
+
+MESH_SHAPE = (4, 5, 6)
+
+
+def timesteps():
+    data = np.arange(3 * 120, dtype=np.float64).reshape(3, *MESH_SHAPE)
+    data[:, :2] = 0.0
+    return data
+
+
+def write_dense(path, data):
+    store = zarr.open(
+        str(path), mode="w", shape=data.shape,
+        chunks=(1, *voxel_chunks(MESH_SHAPE)), dtype="float64")
+    store[:] = data
+
+
+def write_sparse(path, data):
+    flat = data.reshape(len(data), -1)
+    index = np.flatnonzero(flat.any(axis=0))
+    root = zarr.open_group(str(path), mode="w")
+    values = root.zeros(name="values", shape=(len(data), len(index)), dtype="float64")
+    values[:] = flat[:, index]
+    stored_index = root.zeros(name="index", shape=(len(index),), dtype="int64")
+    stored_index[:] = index
+    root.attrs["shape"] = list(data.shape)
+
+
+@pytest.mark.parametrize("write", [write_dense, write_sparse])
+def test_timestep_reads_only_the_requested_voxels(tmp_path, write):
+    data = timesteps()
+    path = tmp_path / "corrected.zarr"
+    write(path, data)
+    tallies = CorrectedTallies(path)
+
+    # an xz slice at y index 1, with one pixel outside the mesh
+    voxels = np.take(np.arange(120).reshape(MESH_SHAPE), 1, axis=1)
+    voxels[0, 0] = -1
+    values = tallies.timestep(2, voxels)
+
+    expected = data[2, :, 1, :].copy()
+    expected[0, 0] = np.nan
+    np.testing.assert_array_equal(values, expected)
+    np.testing.assert_array_equal(tallies.timestep(1), data[1])
+
+
+def test_voxel_chunks_stay_within_budget():
+    for shape in [(10, 10, 10), (200, 300, 400), (3, 2000, 2000)]:
+        chunks = voxel_chunks(shape)
+        assert np.prod(chunks) <= max(CHUNK_VOXELS, shape[-1])
+        assert all(c <= s for c, s in zip(chunks, shape))
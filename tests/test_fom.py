@@ -0,0 +1,132 @@
+from types import SimpleNamespace
+import json
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+h5py = pytest.importorskip("h5py")
+pytest.importorskip("openmc")
+
+from openmc_dagmc_wrapper.fom import (  # noqa: E402
+    compare_runs, load_run_statistics, run_statistics, statistics_path,
+    write_run_statistics)
+
+N = 10
+MEANS = np.array([1.0, 2.0, 4.0, 0.0])
+REL_ERRS = np.array([0.05, 0.2, 0.1, 0.0])
+
+
+def write_statepoint(path, transport_seconds, rel_errs=REL_ERRS):
+    """Write the parts of a fixed source statepoint run_statistics reads.
+
+    One 'dose' tally of four bins with N realizations, the last bin not
+    scoring, and an internal tally without results.
+    """
+    std_dev = rel_errs * MEANS
+    sum_ = MEANS * N
+    sum_sq = N * (std_dev ** 2 * (N - 1) + MEANS ** 2)
+    with h5py.File(path, "w") as f:
+        f["n_realizations"] = N
+        runtime = f.create_group("runtime")
+        runtime["transport"] = transport_seconds
+        runtime["total"] = transport_seconds + 1.0
+        tally = f.create_group("tallies/tally 1")
+        tally["name"] = b"dose"
+        tally["n_realizations"] = N
+        tally["results"] = np.stack([sum_, sum_sq], axis=-1)[:, np.newaxis, :]
+        f.create_group("tallies/tally 2")
+
+
+def test_run_statistics(tmp_path):
+    statepoint = tmp_path / "statepoint.h5"
+    write_statepoint(statepoint, transport_seconds=20.0)
+
+    stats = run_statistics(statepoint, threshold=0.15)
+
+    assert stats["transport_seconds"] == 20.0
+    assert stats["total_seconds"] == 21.0
+    assert stats["n_realizations"] == N
+    assert list(stats["tallies"]) == ["dose"]
+    dose = stats["tallies"]["dose"]
+    assert dose["n_bins"] == 4
+    assert dose["n_scored"] == 3
+    assert dose["median_rel_err"] == pytest.approx(0.1)
+    assert dose["p95_rel_err"] == pytest.approx(np.percentile([0.05, 0.1, 0.2], 95))
+    # the bin that did not score counts as above the threshold
+    assert dose["fraction_below"] == pytest.approx(0.5)
+    assert dose["fom"] == pytest.approx(1 / (0.1 ** 2 * 20.0))
+
+
+def test_compare_runs_reports_fom_ratio(tmp_path):
+    baseline, candidate = tmp_path / "analog.h5", tmp_path / "ww.h5"
+    write_statepoint(baseline, transport_seconds=20.0)
+    write_statepoint(candidate, transport_seconds=10.0)
+
+    report = compare_runs(baseline, candidate, threshold=0.15)
+
+    dose_line = next(line for line in report.splitlines() if line.startswith("dose"))
+    assert "0.1000 -> 0.1000" in dose_line
+    assert dose_line.split()[-1] == "2.00"
+
+
+def test_stale_statistics_are_recomputed(tmp_path):
+    statepoint = tmp_path / "statepoint.h5"
+    write_statepoint(statepoint, transport_seconds=20.0)
+    write_run_statistics(statepoint)
+    assert load_run_statistics(statepoint)["transport_seconds"] == 20.0
+
+    # a later run writes to the same path, leaving the earlier statistics
+    mtime_ns = statepoint.stat().st_mtime_ns
+    write_statepoint(statepoint, transport_seconds=5.0)
+    os.utime(statepoint, ns=(mtime_ns + 10 ** 9, mtime_ns + 10 ** 9))
+
+    assert load_run_statistics(statepoint)["transport_seconds"] == 5.0
+    assert load_run_statistics(statistics_path(statepoint))["transport_seconds"] == 5.0
+
+
+def test_compare_runs_ignores_statistics_of_other_runs(tmp_path):
+    baseline, candidate = tmp_path / "analog.h5", tmp_path / "ww.h5"
+    write_statepoint(baseline, transport_seconds=20.0)
+    write_statepoint(candidate, transport_seconds=10.0)
+    for path in (baseline, candidate):
+        stale = run_statistics(path)
+        stale["statepoint_stamp"] = {"size": 0, "mtime_ns": 0}
+        stale["transport_seconds"] = 1000.0
+        statistics_path(path).write_text(json.dumps(stale))
+
+    report = compare_runs(baseline, candidate)
+
+    assert "1000.0" not in report
+    assert "20.0 s transport" in report
+    assert "10.0 s transport" in report
+
+
+def test_statistics_without_statepoint_are_used(tmp_path):
+    statepoint = tmp_path / "statepoint.h5"
+    write_statepoint(statepoint, transport_seconds=20.0)
+    path = write_run_statistics(statepoint)
+    statepoint.unlink()
+
+    assert load_run_statistics(path)["transport_seconds"] == 20.0
+
+
+def test_cache_hit_refreshes_statistics(wrapper, tmp_path, monkeypatch):
+    cached = tmp_path / "cached.h5"
+    write_statepoint(cached, transport_seconds=5.0)
+    output = tmp_path / "statepoint.h5"
+    # an earlier, different run left its statistics next to output
+    write_statepoint(output, transport_seconds=20.0)
+    write_run_statistics(output)
+
+    monkeypatch.setattr(
+        type(wrapper), "dagmc_index", property(lambda self: SimpleNamespace(sha256="h5m")))
+    wrapper.result_cache = SimpleNamespace(
+        key=lambda model, h5m_sha256, result: ("key", {}),
+        fetch=lambda key, destination: shutil.copyfile(cached, destination) and True)
+
+    wrapper._run_model(SimpleNamespace(), output)
+
+    stats = json.loads(statistics_path(output).read_text())
+    assert stats["transport_seconds"] == 5.0
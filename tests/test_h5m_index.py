@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+h5py = pytest.importorskip("h5py")
+pytest.importorskip("openmc")
+
+from openmc_dagmc_wrapper.h5m_index import DagmcIndex  # noqa: E402
+
+# unit right tetrahedron, triangles wound outwards
+NODES = [(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1)]
+TRIANGLES = [(0, 2, 1), (0, 1, 3), (0, 3, 2), (1, 2, 3)]
+
+
+def write_tetrahedron_h5m(path, material="steel"):
+    """Write a minimal MOAB h5m file of one tetrahedral DAGMC volume.
+
+    Handles: nodes 1-4, triangles 5-8, surface sets 9-12, volume set 13
+    and the material group set 14.
+    """
+    surfaces, volume, group = [9, 10, 11, 12], 13, 14
+    with h5py.File(path, "w") as f:
+        nodes = f.create_dataset("tstt/nodes/coordinates", data=np.array(NODES, float))
+        nodes.attrs["start_id"] = 1
+        tri = f.create_dataset(
+            "tstt/elements/Tri3/connectivity", data=np.array(TRIANGLES) + 1)
+        tri.attrs["start_id"] = 5
+
+        # the first surface stores its triangle as a (start, count) range
+        contents = [[5, 1], [6], [7], [8], [], [volume]]
+        children = [[], [], [], [], surfaces, []]
+        flags = [0x8 | 0x2, 0x2, 0x2, 0x2, 0x2, 0x2]
+        ends = np.cumsum([len(c) for c in contents]) - 1
+        child_ends = np.cumsum([len(c) for c in children]) - 1
+        set_list = np.column_stack([ends, child_ends, np.full(6, -1), flags])
+        sets = f.create_dataset("tstt/sets/list", data=set_list)
+        sets.attrs["start_id"] = 9
+        f["tstt/sets/contents"] = np.concatenate([c for c in contents if c])
+        f["tstt/sets/children"] = np.concatenate([c for c in children if c])
+        f["tstt/sets/parents"] = np.empty(0, dtype=int)
+        f["tstt/sets/tags/GLOBAL_ID"] = np.array([1, 2, 3, 4, 1, 1])
+
+        def opaque(strings):
+            return np.array([s.encode().ljust(32, b"\0") for s in strings], "V32")
+
+        f["tstt/tags/CATEGORY/id_list"] = np.array(surfaces + [volume, group])
+        f["tstt/tags/CATEGORY/values"] = opaque(["Surface"] * 4 + ["Volume", "Group"])
+        f["tstt/tags/GEOM_DIMENSION/id_list"] = np.array(surfaces + [volume])
+        f["tstt/tags/GEOM_DIMENSION/values"] = np.array([2, 2, 2, 2, 3])
+        f["tstt/tags/NAME/id_list"] = np.array([group])
+        f["tstt/tags/NAME/values"] = opaque([f"mat:{material}"])
+        f["tstt/tags/GEOM_SENSE_2/id_list"] = np.array(surfaces)
+        f["tstt/tags/GEOM_SENSE_2/values"] = np.array([[volume, 0]] * 4)
+
+
+def test_index_reads_every_quantity_from_the_h5m(tmp_path):
+    path = tmp_path / "dagmc.h5m"
+    write_tetrahedron_h5m(path)
+
+    index = DagmcIndex.from_h5m(path)
+
+    assert index.material_names == ["steel"]
+    assert index.volumes_by_material_name()["steel"] == pytest.approx(1 / 6)
+    areas = sorted(index.surface_areas_by_material_name("steel"))
+    assert areas == pytest.approx([0.5, 0.5, 0.5, np.sqrt(3) / 2])
+    assert index.bounding_box("steel") == ([0, 0, 0], [1, 1, 1])
+
+
+def test_index_opens_the_h5m_once(tmp_path, monkeypatch):
+    path = tmp_path / "dagmc.h5m"
+    write_tetrahedron_h5m(path)
+    opened = []
+    original = h5py.File
+
+    def counting_file(name, *args, **kwargs):
+        opened.append(name)
+        return original(name, *args, **kwargs)
+
+    monkeypatch.setattr(h5py, "File", counting_file)
+    DagmcIndex.from_h5m(path)
+    assert opened == [path]
@@ -0,0 +1,58 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("openmc")
+
+# seconds that `import openmc_dagmc_wrapper` may add on top of `import openmc`
+IMPORT_BUDGET_SECONDS = 1.0
+
+# modules core only imports inside the methods that need them
+DEFERRED_MODULES = (
+    "matplotlib", "pandas", "zarr", "h5py", "neutronics_material_maker",
+    "openmc_source_plotter", "cadquery", "openmc.deplete")
+
+LOADED_SCRIPT = """
+import json, sys
+import {module}
+print(json.dumps(sorted(sys.modules)))
+"""
+
+TIMING_SCRIPT = """
+import json, time
+import openmc
+start = time.perf_counter()
+import openmc_dagmc_wrapper
+print(json.dumps(time.perf_counter() - start))
+"""
+
+
+def run_script(script):
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def deferred_loaded(module):
+    """DEFERRED_MODULES in sys.modules after importing module in a fresh interpreter."""
+    loaded = run_script(LOADED_SCRIPT.format(module=module))
+    return {
+        name for name in DEFERRED_MODULES
+        if any(m == name or m.startswith(name + ".") for m in loaded)}
+
+
+def test_import_does_not_load_deferred_modules():
+    # what openmc loads by itself cannot be deferred
+    baseline = deferred_loaded("openmc")
+    added = deferred_loaded("openmc_dagmc_wrapper") - baseline
+    assert not added, f"import openmc_dagmc_wrapper imports {sorted(added)}"
+
+
+def test_import_within_budget():
+    # best of three, the first import also warms the file system cache
+    seconds = min(run_script(TIMING_SCRIPT) for _ in range(3))
+    assert seconds < IMPORT_BUDGET_SECONDS, (
+        f"import openmc_dagmc_wrapper took {seconds:.2f} s, "
+        f"budget {IMPORT_BUDGET_SECONDS} s")
@@ -0,0 +1,91 @@
+from collections import Counter
+import sys
+import types
+
+import pytest
+
+openmc = pytest.importorskip("openmc")
+
+from openmc_dagmc_wrapper.material_library import MaterialLibrary  # noqa: E402
+
+
+def steel():
+    mat = openmc.Material(name="steel")
+    mat.add_nuclide("Fe56", 0.9, "wo")
+    mat.add_nuclide("Cr52", 0.1, "wo")
+    mat.add_s_alpha_beta("c_Fe56")
+    mat.set_density("g/cm3", 7.9)
+    mat.temperature = 600.0
+    mat.depletable = True
+    mat.volume = 12.5
+    return mat
+
+
+def xml_without_id(mat):
+    import xml.etree.ElementTree as ET
+
+    elem = mat.to_xml_element()
+    elem.attrib.pop("id")
+    return ET.tostring(elem, encoding="unicode")
+
+
+@pytest.fixture
+def fake_nmm(monkeypatch):
+    """neutronics_material_maker stand-in that counts material builds per key."""
+    module = types.ModuleType("neutronics_material_maker")
+    module.builds = Counter()
+
+    class Material:
+        @staticmethod
+        def from_library(key):
+            module.builds[key] += 1
+            return types.SimpleNamespace(openmc_material=steel())
+
+    module.Material = Material
+    monkeypatch.setitem(sys.modules, "neutronics_material_maker", module)
+    return module
+
+
+def test_disk_store_round_trips_every_material_attribute(tmp_path, fake_nmm):
+    MaterialLibrary(cache_dir=tmp_path).get("SS316")
+    assert fake_nmm.builds == {"SS316": 1}
+
+    loaded = MaterialLibrary(cache_dir=tmp_path).get("SS316")
+    assert fake_nmm.builds == {"SS316": 1}
+    assert xml_without_id(loaded) == xml_without_id(steel())
+    assert loaded.depletable and loaded.volume == 12.5
+
+
+def test_each_recipe_built_once_for_1000_volumes(fake_nmm):
+    """Materials of 1000 volumes sharing two nmm keys are built twice."""
+    keys = ["SS316" if i % 4 else "eurofer" for i in range(1000)]
+    library = MaterialLibrary()
+
+    materials = [library.get(key) for key in keys]
+
+    assert fake_nmm.builds == {"SS316": 1, "eurofer": 1}
+    assert len({id(m) for m in materials}) == len(keys)
+    assert len({m.id for m in materials}) == len(keys)
+    # a clone can be changed without touching the library or the others
+    materials[0].set_density("g/cm3", 1.0)
+    assert materials[1].density == 7.9
+    assert library.get("SS316").density == 7.9
+
+
+def test_materials_snapshot_gets_fresh_ids(wrapper, tmp_path, monkeypatch):
+    from openmc_dagmc_wrapper import core
+
+    monkeypatch.setattr(core, "nmm_version", lambda: "test")
+    monkeypatch.setattr(core, "hash_inputs", lambda inputs: "0" * 64)
+    monkeypatch.setattr(
+        type(wrapper), "dagmc_index",
+        property(lambda self: types.SimpleNamespace(sha256="h5m")))
+    snapshot = tmp_path / f"materials_{'0' * 16}.xml"
+    openmc.Materials([steel()]).export_to_xml(snapshot)
+    taken = {mat.id for mat in openmc.Materials.from_xml(snapshot)}
+
+    wrapper.build_materials({"steel": [("steel", 1.0)]}, snapshot_dir=tmp_path)
+
+    assert [m.name for m in wrapper.materials] == ["steel"]
+    assert wrapper.materials[0].volume == 12.5
+    assert not taken & {mat.id for mat in wrapper.materials}
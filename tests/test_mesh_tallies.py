@@ -0,0 +1,40 @@
+import pytest
+
+openmc = pytest.importorskip("openmc")
+
+
+def mesh(name):
+    mesh = openmc.RegularMesh(name=name)
+    mesh.lower_left = (-1, -1, -1)
+    mesh.upper_right = (1, 1, 1)
+    mesh.dimension = (2, 2, 2)
+    return mesh
+
+
+def scored_pairs(tallies):
+    pairs = set()
+    for tally in tallies:
+        particle_filter = next(
+            f for f in tally.filters if isinstance(f, openmc.ParticleFilter))
+        is_dose = any(isinstance(f, openmc.EnergyFunctionFilter) for f in tally.filters)
+        for particle in particle_filter.bins:
+            for score in tally.scores:
+                pairs.add(("dose" if is_dose else score, particle))
+    return pairs
+
+
+@pytest.mark.parametrize("requested", [
+    [("flux", "neutron"), ("heating", "neutron"), ("flux", "photon"), ("heating", "photon")],
+    [("flux", "neutron"), ("heating", "photon")],
+    [("flux", "neutron"), ("heating", "neutron"), ("heating", "photon"), ("dose", "photon")],
+])
+def test_consolidated_tallies_score_only_requested_pairs(wrapper, requested):
+    tallies = wrapper.make_mesh_tallies(mesh("full"), requested, consolidate=True)
+    assert scored_pairs(tallies) == set(requested)
+
+
+def test_full_product_uses_one_tally_per_mesh(wrapper):
+    requested = [(s, p) for s in ("flux", "heating") for p in ("neutron", "photon")]
+    tallies = wrapper.make_mesh_tallies(
+        [mesh("a"), mesh("b")], requested, consolidate=True)
+    assert [t.name for t in tallies] == ["mesh_scores_on_a", "mesh_scores_on_b"]
@@ -0,0 +1,80 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+openmc = pytest.importorskip("openmc")
+
+from openmc_dagmc_wrapper.mgxs_cache import MgxsCache, material_composition  # noqa: E402
+
+
+def water(name, density=1.0):
+    mat = openmc.Material(name=name)
+    mat.add_nuclide("H1", 2.0)
+    mat.add_nuclide("O16", 1.0)
+    mat.add_s_alpha_beta("c_H_in_H2O")
+    mat.set_density("g/cm3", density)
+    return mat
+
+
+def test_composition_ignores_identity_but_not_sab():
+    a, b = water("a"), water("b")
+    b.volume = 10.0
+    b.depletable = True
+    assert material_composition(a) == material_composition(b)
+
+    no_sab = openmc.Material(name="c")
+    no_sab.add_nuclide("H1", 2.0)
+    no_sab.add_nuclide("O16", 1.0)
+    no_sab.set_density("g/cm3", 1.0)
+    assert material_composition(a) != material_composition(no_sab)
+
+
+class FakeLibrary:
+    """Stands in for openmc.MGXSLibrary, one XSdata name per file."""
+
+    def __init__(self, energy_groups=None, num_delayed_groups=0):
+        self.energy_groups = energy_groups
+        self.num_delayed_groups = num_delayed_groups
+        self.xsdatas = []
+
+    @classmethod
+    def from_hdf5(cls, filename):
+        library = cls()
+        for name in Path(filename).read_text().split():
+            library.add_xsdata(SimpleNamespace(name=name))
+        return library
+
+    def add_xsdata(self, xsdata):
+        self.xsdatas.append(xsdata)
+
+    def export_to_hdf5(self, filename):
+        Path(filename).write_text(" ".join(x.name for x in self.xsdatas))
+
+
+def test_changing_one_material_regenerates_only_that_material(tmp_path, monkeypatch):
+    monkeypatch.setattr(openmc, "MGXSLibrary", FakeLibrary)
+    generated = []
+
+    def fake_generate(self, model, missing, groups, method, nparticles):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for key, mat in missing.items():
+            generated.append(mat.name)
+            self._path(key).write_text(mat.name)
+
+    monkeypatch.setattr(MgxsCache, "_generate", fake_generate)
+
+    settings = openmc.Settings()
+    settings.source = openmc.IndependentSource()
+    materials = [water("a", 1.0), water("b", 2.0), water("c", 3.0)]
+    model = openmc.Model(materials=openmc.Materials(materials), settings=settings)
+    cache = MgxsCache(tmp_path / "cache")
+
+    cache.build_library(model, tmp_path / "mgxs_1.h5")
+    assert sorted(generated) == ["a", "b", "c"]
+
+    generated.clear()
+    materials[1].set_density("g/cm3", 2.5)
+    cache.build_library(model, tmp_path / "mgxs_2.h5")
+    assert generated == ["b"]
+    assert (tmp_path / "mgxs_2.h5").read_text().split() == ["a", "b", "c"]
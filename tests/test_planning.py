@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("openmc")
+
+from openmc_dagmc_wrapper.planning import postprocess_bytes  # noqa: E402
+from openmc_dagmc_wrapper.runner import RunConfig  # noqa: E402
+
+GB = 1024 ** 3
+
+
+def test_d1s_postprocess_estimate_follows_fuels_and_chunk_budget():
+    n_bins = 10 ** 8
+    one_fuel = postprocess_bytes(n_bins, d1s=True, n_fuels=1, max_memory_gb=1)
+    two_fuels = postprocess_bytes(n_bins, d1s=True, n_fuels=2, max_memory_gb=1)
+    assert two_fuels - one_fuel == n_bins * 8
+    small_chunks = postprocess_bytes(n_bins, d1s=True, n_fuels=1, max_memory_gb=0.1)
+    big_chunks = postprocess_bytes(n_bins, d1s=True, n_fuels=1, max_memory_gb=16)
+    assert big_chunks > small_chunks
+    assert big_chunks >= 2 * 16 * GB
+
+
+def tally_model(n_bins):
+    tally = SimpleNamespace(
+        filters=[SimpleNamespace(num_bins=n_bins)], nuclides=[], scores=["flux"])
+    settings = SimpleNamespace(particles=100, batches=10, trigger_active=False)
+    return SimpleNamespace(settings=settings, tallies=[tally])
+
+
+def test_no_calibration_run_when_memory_budget_fails(wrapper, tmp_path, monkeypatch):
+    calibrations = []
+    monkeypatch.setattr(
+        wrapper, "_calibrate", lambda *args: calibrations.append(args) or (1.0, 0.0))
+    wrapper.run_config = RunConfig(ram_budget_gb=1, walltime_budget_hours=1)
+
+    with pytest.raises(ValueError, match="ram_budget_gb"):
+        wrapper._run_model(tally_model(10 ** 9), tmp_path / "statepoint.h5")
+    assert calibrations == []
+
+
+def test_calibration_run_once_memory_budget_passes(wrapper, tmp_path, monkeypatch):
+    monkeypatch.setattr(wrapper, "_calibrate", lambda *args: (1.0, 0.0))
+    wrapper.run_config = RunConfig(ram_budget_gb=1, walltime_budget_hours=0.1)
+
+    # 1000 particles at 1 particle/s is over the walltime budget
+    with pytest.raises(ValueError, match="walltime_budget_hours"):
+        wrapper._run_model(tally_model(10), tmp_path / "statepoint.h5")
+
+
+def test_calibration_run_next_to_output(wrapper, tmp_path, monkeypatch):
+    from openmc_dagmc_wrapper import core
+
+    outputs = []
+
+    def prepare_sandbox(model, output):
+        outputs.append(output)
+        raise RuntimeError("stop before running")
+
+    monkeypatch.setattr(core, "prepare_sandbox", prepare_sandbox)
+    model = tally_model(10)
+    model.settings.statepoint = {}
+    output = tmp_path / "runs" / "statepoint.h5"
+
+    with pytest.raises(RuntimeError):
+        wrapper._calibrate(model, output, RunConfig(), 100)
+    assert outputs[0].parent.parent == output.parent
+    # the calibration directory is removed afterwards
+    assert list(output.parent.iterdir()) == []
+
+
+def regular_mesh(n):
+    import openmc
+
+    mesh = openmc.RegularMesh()
+    mesh.lower_left = (-50, -50, -50)
+    mesh.upper_right = (50, 50, 50)
+    mesh.dimension = (n, n, n)
+    return mesh
+
+
+def test_roi_trigger_tallies_count_towards_memory_budget(wrapper):
+    import openmc
+
+    tally_mesh, roi_mesh = regular_mesh(10), regular_mesh(100)
+    tally = openmc.Tally(name="flux")
+    tally.filters = [openmc.MeshFilter(tally_mesh)]
+    tally.scores = ["flux"]
+    settings = SimpleNamespace(batches=10, trigger_active=False)
+    tallies = openmc.Tallies([tally])
+
+    wrapper._add_convergence_triggers(
+        tallies, settings, 0.05, roi_mesh=roi_mesh)
+    with pytest.raises(ValueError, match="budget"):
+        wrapper._enforce_memory_budget(tallies, [tally_mesh], 0.01, False)
+
+    wrapper._enforce_memory_budget(tallies, [tally_mesh], 0.01, True)
+    assert roi_mesh.dimension[0] < 100
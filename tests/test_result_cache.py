@@ -0,0 +1,51 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+pytest.importorskip("openmc")
+
+import openmc  # noqa: E402
+
+from openmc_dagmc_wrapper.result_cache import (  # noqa: E402
+    ResultCache, canonical_model_xml)
+
+
+def store_many(cache_dir, result, worker, n):
+    cache = ResultCache(cache_dir)
+    for i in range(n):
+        cache.store(f"{worker}-{i}", result, {"worker": worker})
+
+
+def test_concurrent_stores_keep_every_manifest_entry(tmp_path):
+    result = tmp_path / "statepoint.h5"
+    result.write_bytes(b"x" * 64)
+    cache_dir = tmp_path / "cache"
+    with ProcessPoolExecutor(4) as pool:
+        for future in [
+                pool.submit(store_many, cache_dir, result, w, 10)
+                for w in range(4)]:
+            future.result()
+
+    manifest = ResultCache(cache_dir)._read_manifest()
+    assert len(manifest) == 40
+
+
+def mesh_source_model():
+    mesh = openmc.RegularMesh()
+    mesh.lower_left = (-10, -10, -10)
+    mesh.upper_right = (10, 10, 10)
+    mesh.dimension = (2, 2, 2)
+    settings = openmc.Settings()
+    settings.source = openmc.IndependentSource(space=openmc.stats.MeshSpatial(mesh))
+    settings.weight_window_generators = openmc.WeightWindowGenerator(mesh)
+    return openmc.Model(settings=settings), mesh
+
+
+def test_settings_meshes_renumbered_and_restored():
+    model_a, mesh_a = mesh_source_model()
+    model_b, mesh_b = mesh_source_model()
+    assert mesh_a.id != mesh_b.id
+
+    assert canonical_model_xml(model_a) == canonical_model_xml(model_b)
+    assert mesh_a.id != mesh_b.id
+    assert model_a.settings.source[0].space.mesh is mesh_a
@@ -0,0 +1,183 @@
+from concurrent.futures import Future
+from types import SimpleNamespace
+import os
+
+import pytest
+
+pytest.importorskip("openmc")
+
+from openmc_dagmc_wrapper import core  # noqa: E402
+from openmc_dagmc_wrapper.runner import (  # noqa: E402
+    QueuedRun, RunConfig, SimulationSpec, checkpoint_dir, link_or_copy,
+    run_in_sandbox)
+
+
+def checkpoint_model():
+    settings = SimpleNamespace(batches=10, trigger_active=False, statepoint=None)
+    return SimpleNamespace(
+        settings=settings,
+        export_to_model_xml=lambda path: path.write_text("<model/>"))
+
+
+def test_new_run_refused_next_to_old_checkpoints(wrapper, tmp_path, monkeypatch):
+    output = tmp_path / "statepoint.h5"
+    run_dir = checkpoint_dir(output)
+    run_dir.mkdir()
+    (run_dir / "statepoint.20.h5").write_bytes(b"")
+    runs = []
+    monkeypatch.setattr(
+        core, "run_in_sandbox",
+        lambda sandbox, output, result, run_config, restart_file, keep_on_failure:
+            runs.append(restart_file))
+
+    with pytest.raises(ValueError, match="checkpoints of an earlier run"):
+        wrapper._run_model(checkpoint_model(), output, checkpoint_interval=5)
+    assert runs == []
+
+    wrapper._run_model(
+        checkpoint_model(), output, checkpoint_interval=5, resume_from=run_dir)
+    assert runs == [(run_dir / "statepoint.20.h5").resolve()]
+
+
+def write_stub(path, body):
+    path.write_text("#!/bin/sh\n" + body)
+    path.chmod(0o755)
+    return path
+
+
+@pytest.fixture
+def fake_launcher(tmp_path):
+    """Stub mpiexec and openmc executables that record their argv."""
+    log_dir = tmp_path / "argv"
+    log_dir.mkdir()
+    openmc_exec = write_stub(
+        tmp_path / "fake_openmc",
+        f'printf "%s\\n" "$@" > "{log_dir}/openmc"\n'
+        "touch statepoint.10.h5\n")
+    mpi_exec = write_stub(
+        tmp_path / "fake_mpiexec",
+        f'printf "%s\\n" "$@" > "{log_dir}/mpiexec"\n'
+        # drop the launcher options like a real mpiexec would
+        f'while [ "$1" != "{openmc_exec}" ]; do shift; done\n'
+        'exec "$@"\n')
+
+    def argv(name):
+        path = log_dir / name
+        return path.read_text().splitlines() if path.is_file() else None
+
+    return SimpleNamespace(openmc_exec=openmc_exec, mpi_exec=mpi_exec, argv=argv)
+
+
+def run_with(config, tmp_path):
+    sandbox = tmp_path / "sandbox"
+    sandbox.mkdir()
+    output = tmp_path / "statepoint.h5"
+    run_in_sandbox(sandbox, output, "statepoint", config)
+    assert output.is_file()
+
+
+def test_command_with_mpi_launcher(fake_launcher, tmp_path):
+    config = RunConfig(
+        threads=2, mpi_args=["-n", "4", "--map-by", "node"],
+        mpi_exec=str(fake_launcher.mpi_exec),
+        openmc_exec=str(fake_launcher.openmc_exec))
+    run_with(config, tmp_path)
+
+    launcher_argv = fake_launcher.argv("mpiexec")
+    assert launcher_argv[:5] == [
+        "-n", "4", "--map-by", "node", str(fake_launcher.openmc_exec)]
+    openmc_argv = fake_launcher.argv("openmc")
+    assert launcher_argv[5:] == openmc_argv
+    i = openmc_argv.index("-s")
+    assert openmc_argv[i + 1] == "2"
+
+
+def test_command_without_mpi(fake_launcher, tmp_path):
+    config = RunConfig(
+        mpi_exec=str(fake_launcher.mpi_exec),
+        openmc_exec=str(fake_launcher.openmc_exec))
+    run_with(config, tmp_path)
+
+    assert fake_launcher.argv("mpiexec") is None
+    assert "-s" not in fake_launcher.argv("openmc")
+
+
+def test_run_config_overrides_keep_unset_values():
+    config = RunConfig(threads=8, mpi_args=["-n", "2"], mpi_exec="srun")
+    override = config.with_overrides(threads=None, mpi_args=["-n", "16"])
+    assert override.threads == 8
+    assert override.run_kwargs()["mpi_args"] == ["srun", "-n", "16"]
+
+
+def test_link_or_copy_shares_the_file(tmp_path):
+    source = tmp_path / "statepoint.h5"
+    source.write_bytes(b"results")
+    linked = link_or_copy(source, tmp_path / "other" / "statepoint.h5")
+    assert linked.stat().st_ino == source.stat().st_ino
+
+
+def test_link_or_copy_falls_back_to_copy(tmp_path, monkeypatch):
+    def no_link(*args):
+        raise OSError("hard links not supported")
+
+    monkeypatch.setattr(os, "link", no_link)
+    source = tmp_path / "statepoint.h5"
+    source.write_bytes(b"results")
+    copied = link_or_copy(source, tmp_path / "copy.h5")
+    assert copied.read_bytes() == b"results"
+    assert copied.stat().st_ino != source.stat().st_ino
+
+
+class RecordingExecutor:
+    """Executor that records submitted runs and fails the first one."""
+
+    def __init__(self, fail_first=False):
+        self.fail_first = fail_first
+        self.configs = []
+
+    def submit(self, fn, sandbox, output, result, run_config, *args):
+        self.configs.append(run_config)
+        future = Future()
+        if self.fail_first and len(self.configs) == 1:
+            future.set_exception(RuntimeError("OpenMC failed"))
+        elif not self.fail_first:
+            future.set_result(output)
+        return future
+
+
+@pytest.fixture
+def queueing_wrapper(wrapper, tmp_path, monkeypatch):
+    """Wrapper whose simulate_on_mesh only queues a sandbox."""
+    def simulate_on_mesh(output, threads=None):
+        sandbox = tmp_path / f"{output}.sandbox"
+        sandbox.mkdir(exist_ok=True)
+        wrapper._queued_runs.append(QueuedRun(
+            sandbox=sandbox, output=tmp_path / output,
+            run_config=wrapper.run_config.with_overrides(threads=threads)))
+
+    monkeypatch.setattr(wrapper, "simulate_on_mesh", simulate_on_mesh)
+    return wrapper
+
+
+def test_campaign_threads_precedence(queueing_wrapper):
+    queueing_wrapper.run_config = RunConfig(threads=3)
+    specs = [
+        SimulationSpec("on_mesh", dict(output="a.h5"), threads=7),
+        SimulationSpec("on_mesh", dict(output="b.h5", threads=2)),
+        SimulationSpec("on_mesh", dict(output="c.h5")),
+    ]
+    executor = RecordingExecutor()
+    list(queueing_wrapper.run_campaign(specs, threads=5, executor=executor))
+    assert [c.threads for c in executor.configs] == [7, 2, 5]
+
+    executor = RecordingExecutor()
+    list(queueing_wrapper.run_campaign(specs[2:], executor=executor))
+    assert [c.threads for c in executor.configs] == [3]
+
+
+def test_campaign_failure_removes_unstarted_sandboxes(queueing_wrapper, tmp_path):
+    specs = [SimulationSpec("on_mesh", dict(output=f"{i}.h5")) for i in range(3)]
+    with pytest.raises(RuntimeError, match="OpenMC failed"):
+        list(queueing_wrapper.run_campaign(
+            specs, executor=RecordingExecutor(fail_first=True)))
+    assert not list(tmp_path.glob("[12].h5.sandbox"))
@@ -0,0 +1,68 @@
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+
+openmc = pytest.importorskip("openmc")
+
+from openmc_dagmc_wrapper.session import OpenmcSession  # noqa: E402
+
+
+class FakeLibMesh:
+    def __init__(self):
+        self.dimension = None
+        self.parameters = None
+
+    def set_parameters(self, lower_left=None, upper_right=None):
+        self.parameters = (tuple(lower_left), tuple(upper_right))
+
+
+@pytest.fixture
+def fake_lib(monkeypatch):
+    lib = types.ModuleType("openmc.lib")
+    lib.RegularMesh = FakeLibMesh
+    lib.is_initialized = False
+    lib.meshes = {7: FakeLibMesh()}
+    lib.filters = {3: SimpleNamespace(mesh=None)}
+    lib.tallies = {5: SimpleNamespace(filters=["mesh filter"])}
+    lib.init = lambda args: None
+    lib.finalize = lambda: None
+    monkeypatch.setitem(sys.modules, "openmc.lib", lib)
+    monkeypatch.setattr(openmc, "lib", lib, raising=False)
+    return lib
+
+
+def session_model():
+    mesh = SimpleNamespace(name="dose_mesh", id=7)
+    tally = SimpleNamespace(
+        name="dose", id=5, filters=[SimpleNamespace(id=3, mesh=mesh)])
+    return SimpleNamespace(
+        tallies=[tally],
+        settings=SimpleNamespace(output=None),
+        export_to_model_xml=lambda path: path.write_text("<model/>"))
+
+
+def regular_mesh(dimension):
+    mesh = openmc.RegularMesh()
+    mesh.lower_left = (0.0, 0.0, 0.0)
+    mesh.upper_right = (10.0, 20.0, 30.0)
+    mesh.dimension = dimension
+    return mesh
+
+
+def test_set_mesh_resizes_session_mesh_filters_and_tallies(fake_lib, tmp_path):
+    session = OpenmcSession(session_model(), output_dir=tmp_path)
+    assert session.directory.parent == tmp_path.resolve()
+    assert session.mesh_names == ["dose_mesh"]
+
+    session.set_mesh("dose_mesh", regular_mesh((2, 4, 6)))
+
+    lib_mesh = fake_lib.meshes[7]
+    assert lib_mesh.dimension == (2, 4, 6)
+    assert lib_mesh.parameters == ((0.0, 0.0, 0.0), (10.0, 20.0, 30.0))
+    assert fake_lib.filters[3].mesh is lib_mesh
+    with pytest.raises(ValueError, match="not in the session"):
+        session.set_mesh("other", regular_mesh((1, 1, 1)))
+    session.close()
+    assert not session.directory.exists()
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+h5py = pytest.importorskip("h5py")
+pytest.importorskip("openmc")
+
+from openmc_dagmc_wrapper.statepoints import merge_statepoints  # noqa: E402
+
+
+def write_statepoint(path, seed, n_realizations, transport_seconds, n_bins=(3, 3)):
+    """Write the parts of a fixed source statepoint merge_statepoints touches.
+
+    Two tallies with random sum and sum_sq results of the given number of
+    bins, an internal tally without results, global tallies and runtimes.
+    """
+    rng = np.random.default_rng(seed)
+    with h5py.File(path, "w") as f:
+        f["seed"] = seed
+        f["n_realizations"] = n_realizations
+        f["n_batches"] = n_realizations
+        f["current_batch"] = n_realizations
+        f["global_tallies"] = rng.random((3, 2))
+        runtime = f.create_group("runtime")
+        runtime["transport"] = transport_seconds
+        runtime["total"] = transport_seconds + 1.0
+        for tally_id, bins in enumerate(n_bins, start=1):
+            tally = f.create_group(f"tallies/tally {tally_id}")
+            tally["n_realizations"] = n_realizations
+            tally["results"] = rng.random((bins, 2, 2))
+        f.create_group("tallies/tally 99")
+
+
+def test_merge_adds_results_and_counts(tmp_path):
+    paths = [tmp_path / f"statepoint_{i}.h5" for i in range(3)]
+    for seed, path in enumerate(paths, start=1):
+        write_statepoint(path, seed, n_realizations=seed * 10, transport_seconds=seed * 2.0)
+
+    output = merge_statepoints(paths, tmp_path / "merged.h5")
+
+    inputs = [h5py.File(path, "r") for path in paths]
+    try:
+        with h5py.File(output, "r") as merged:
+            for name in ("tally 1", "tally 2"):
+                np.testing.assert_allclose(
+                    merged[f"tallies/{name}/results"][()],
+                    sum(f[f"tallies/{name}/results"][()] for f in inputs))
+                assert merged[f"tallies/{name}/n_realizations"][()] == 60
+            assert "results" not in merged["tallies/tally 99"]
+            np.testing.assert_allclose(
+                merged["global_tallies"][()],
+                sum(f["global_tallies"][()] for f in inputs))
+            assert merged["n_realizations"][()] == 60
+            assert merged["n_batches"][()] == 60
+            assert merged["current_batch"][()] == 60
+            assert merged["runtime/transport"][()] == pytest.approx(12.0)
+            assert merged["runtime/total"][()] == pytest.approx(15.0)
+            # everything else comes from the first statepoint
+            assert merged["seed"][()] == 1
+    finally:
+        for f in inputs:
+            f.close()
+
+
+def test_merge_refuses_different_tallies(tmp_path):
+    first, second = tmp_path / "a.h5", tmp_path / "b.h5"
+    write_statepoint(first, 1, 10, 1.0, n_bins=(3, 3))
+    write_statepoint(second, 2, 10, 1.0, n_bins=(3,))
+
+    with pytest.raises(ValueError, match="different tallies"):
+        merge_statepoints([first, second], tmp_path / "merged.h5")
+    # no merged or temporary file is left behind
+    assert sorted(tmp_path.iterdir()) == sorted([first, second])
+
+
+def test_merge_refuses_different_shapes(tmp_path):
+    first, second = tmp_path / "a.h5", tmp_path / "b.h5"
+    write_statepoint(first, 1, 10, 1.0, n_bins=(3, 3))
+    write_statepoint(second, 2, 10, 1.0, n_bins=(3, 4))
+
+    with pytest.raises(ValueError, match="tally 2 has shape"):
+        merge_statepoints([first, second], tmp_path / "merged.h5")
+    assert sorted(tmp_path.iterdir()) == sorted([first, second])
+
+
+def test_merge_refuses_to_overwrite_an_input(tmp_path):
+    first, second = tmp_path / "a.h5", tmp_path / "b.h5"
+    write_statepoint(first, 1, 10, 1.0)
+    write_statepoint(second, 2, 10, 1.0)
+
+    with pytest.raises(ValueError, match="is one of the statepoints"):
+        merge_statepoints([first, second], second)
+    with h5py.File(second, "r") as f:
+        assert f["n_realizations"][()] == 10
+
+
+def test_merge_refuses_no_statepoints(tmp_path):
+    with pytest.raises(ValueError, match="No statepoints"):
+        merge_statepoints([], tmp_path / "merged.h5")
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+openmc = pytest.importorskip("openmc")
+
+
+def fake_window(ww_id, particle_type, bounds):
+    return SimpleNamespace(
+        id=ww_id, particle_type=particle_type, mesh=None,
+        lower_ww_bounds=np.asarray(bounds, dtype=float).reshape(2, 1, 1, 1))
+
+
+def test_magic_iterations_refine_the_generated_window(wrapper, monkeypatch, tmp_path):
+    """Each iteration returns the window OpenMC generated, not the applied one."""
+    mesh = SimpleNamespace(dimension=(2, 1, 1))
+    settings = SimpleNamespace(batches=2, weight_windows=None)
+    model = SimpleNamespace(settings=settings)
+    wrapper.result_cache = object()
+    runs = []
+
+    def fake_run_model(model, output, result, threads, mpi_args):
+        assert wrapper.result_cache is None
+        runs.append([ww.id for ww in (model.settings.weight_windows or [])])
+
+    def fake_hdf5_to_wws(path):
+        iteration = len(runs)
+        # OpenMC writes the applied windows before the generated one
+        applied = [
+            fake_window(ww.id, ww.particle_type, ww.lower_ww_bounds)
+            for ww in (settings.weight_windows or [])]
+        return applied + [fake_window(1000 + iteration, "neutron", [iteration, 0])]
+
+    monkeypatch.setattr(openmc, "WeightWindowGenerator", lambda **kwargs: kwargs)
+    monkeypatch.setattr(openmc, "hdf5_to_wws", fake_hdf5_to_wws)
+    monkeypatch.setattr(wrapper, "_run_model", fake_run_model)
+
+    ww = wrapper._magic_weight_windows(
+        model, mesh, "neutron", tmp_path / "ww.h5", iterations=2,
+        fixed_weight_windows=[])
+
+    assert len(runs) == 2
+    assert runs[0] == []
+    assert len(runs[1]) == 1
+    # the window of the second run, not the first run's window applied to it
+    assert ww.lower_ww_bounds.ravel()[0] == 2
+    assert ww.mesh is mesh
+    assert wrapper.result_cache is not None
+
+
+def test_magic_stops_at_target_nonzero_fraction(wrapper, monkeypatch, tmp_path):
+    mesh = SimpleNamespace(dimension=(2, 1, 1))
+    model = SimpleNamespace(settings=SimpleNamespace(batches=2, weight_windows=None))
+    runs = []
+
+    monkeypatch.setattr(openmc, "WeightWindowGenerator", lambda **kwargs: kwargs)
+    monkeypatch.setattr(
+        openmc, "hdf5_to_wws",
+        lambda path: [fake_window(1000 + len(runs), "neutron", [1, len(runs) - 1])])
+    monkeypatch.setattr(wrapper, "_run_model", lambda *args, **kwargs: runs.append(1))
+
+    wrapper._magic_weight_windows(
+        model, mesh, "neutron", tmp_path / "ww.h5", iterations=5,
+        fixed_weight_windows=[], target_nonzero_fraction=1.0)
+
+    assert len(runs) == 2